@@ -1,11 +1,11 @@
 import json
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable
 from collections import defaultdict
 from langchain_core.documents import Document
 from pydantic import BaseModel, Field
 
-# app.services.llm_call_service에서 call_gpt를 가져오는 것은 그대로 유지합니다.
-from app.services.llm_call_service import call_gpt 
+# 청크 추출은 sentence_extraction, 통합/보고서 작성은 synthesis failover 정책을 사용합니다.
+from app.services.llm_call_service import call_llm
 
 # --- Pydantic 모델: 데이터 구조의 안정성과 명확성을 위해 사용 ---
 class NonFunctionalAspects(BaseModel):
@@ -110,9 +110,10 @@ Your final output must be the complete report in a single Markdown text.
 {consolidated_summaries}
 """
 
-def extract_asis_and_generate_report(chunks: List[Document]) -> str:
+def extract_asis_and_generate_report(chunks: List[Document], on_chunk_done: Optional[Callable[[int], None]] = None) -> str:
     """
     (오류 수정 최종본) RFP 청크로부터 AS-IS 분석 보고서를 생성하는 전체 파이프라인
+    on_chunk_done: 청크 하나의 정보 추출이 끝날 때마다 청크 인덱스로 호출됩니다. (진행 상황 알림용)
     """
     
     # --- 1단계: 안정적인 청크별 정보 추출 ---
@@ -133,10 +134,11 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
         {doc.page_content}
         --- 텍스트 청크 끝 ---
         """
-        extracted_dict = call_gpt(
+        extracted_dict = call_llm(
             system_prompt=EXTRACTION_SYSTEM_PROMPT,
             user_prompt=user_prompt,
-            is_json_output=True
+            is_json_output=True,
+            agent="sentence_extraction"
         )
         
         if extracted_dict:
@@ -144,6 +146,8 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
                 extracted_chunks.append(ExtractedAsIsChunk(**extracted_dict))
             except Exception as e:
                 print(f"  경고: 청크 {i+1} 처리 중 Pydantic 모델 변환 오류 발생. 건너뜁니다. 오류: {e}")
+        if on_chunk_done:
+            on_chunk_done(i)
 
     if not extracted_chunks:
         return "문서 전체에서 분석 가능한 AS-IS 정보를 찾을 수 없었습니다."
@@ -174,12 +178,13 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
         all_functions = {k: " ".join(v) for k, v in merged_data["dynamic_functional_areas"].items()}
         
         # [수정] 분리된 시스템/사용자 프롬프트를 사용하여 LLM 호출
-        function_clusters = call_gpt(
+        function_clusters = call_llm(
             system_prompt=FUNCTION_CLUSTERING_SYSTEM_PROMPT,
             user_prompt=FUNCTION_CLUSTERING_USER_PROMPT.format(
                 function_list_json=json.dumps(all_functions, indent=2, ensure_ascii=False)
             ),
-            is_json_output=True
+            is_json_output=True,
+            agent="synthesis"
         )
         
         if not function_clusters or not isinstance(function_clusters, dict):
@@ -196,7 +201,7 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
                 unique_snippets = sorted(list(set(snippets_for_category)), key=snippets_for_category.index)
                 synthesis_prompt = f"Topic: '{category}'\n\nPlease synthesize the following snippets into a comprehensive paragraph about this functional area:\n- " + "\n- ".join(unique_snippets)
                 
-                summary = call_gpt(system_prompt=THEMATIC_SYNTHESIS_PROMPT, user_prompt=synthesis_prompt)
+                summary = call_llm(system_prompt=THEMATIC_SYNTHESIS_PROMPT, user_prompt=synthesis_prompt, agent="synthesis")
                 clustered_functional_summaries[category] = summary
     print("--- 2.5단계 완료 ---")
 
@@ -212,7 +217,7 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
         unique_snippets = sorted(list(set(snippets)), key=snippets.index)
         synthesis_prompt = f"Topic: '{key}'\n\nPlease synthesize the following snippets:\n- " + "\n- ".join(unique_snippets)
         
-        summary = call_gpt(system_prompt=THEMATIC_SYNTHESIS_PROMPT, user_prompt=synthesis_prompt)
+        summary = call_llm(system_prompt=THEMATIC_SYNTHESIS_PROMPT, user_prompt=synthesis_prompt, agent="synthesis")
         final_summaries[key] = summary
 
     key_map = {
@@ -232,9 +237,10 @@ def extract_asis_and_generate_report(chunks: List[Document]) -> str:
     
     consolidated_summaries_text = "\n\n".join(summary_text_parts)
 
-    final_report = call_gpt(
+    final_report = call_llm(
         system_prompt=FINAL_REPORT_GENERATION_PROMPT,
-        user_prompt=FINAL_REPORT_GENERATION_PROMPT.format(consolidated_summaries=consolidated_summaries_text)
+        user_prompt=FINAL_REPORT_GENERATION_PROMPT.format(consolidated_summaries=consolidated_summaries_text),
+        agent="synthesis"
     )
     
     print("--- 3단계 완료. 보고서 생성 성공! ---")
@@ -1,15 +1,13 @@
 # app/services/report_generation_service.py
-from openai import OpenAI
 from typing import List, Dict, Any, Optional
-from app.core.config import OPENAI_API_KEY, LLM_MODEL
+from app.core.config import LLM_MODEL
 from app.schemas.asis import ExtractedAsIsChunk, TargetSection
 from app.services.file_processing_service import extract_text_for_pages_from_list # 순환참조 주의, 구조개선 필요할 수 있음
 from app.agents.asis.asis_extraction_agent import split_text_into_chunks, summarize_chunk_for_as_is_agent
-
-# client = OpenAI(api_key=OPENAI_API_KEY)
+from app.services.llm_call_service import client as openai_client # 공용 OpenAI 클라이언트 (첫 호출 시 생성)
 
 def _consolidate_section_content_logic(section_title: str, all_extracted_texts: List[Any], is_dynamic_functional: bool = False) -> str:
-    client_instance = OpenAI(api_key=OPENAI_API_KEY)
+    client_instance = openai_client
     # as_is_module.ipynb의 consolidate_section_content 함수 내용
     # ... (LLM 호출 및 텍스트 통합 로직) ...
     # 아래는 간략화된 예시, 실제 로직은 노트북에서 가져와야 함
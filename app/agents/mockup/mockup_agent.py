@@ -1,35 +1,61 @@
 # app/agents/mockup_agent.py
 import os
 import json
-from typing import List, Dict, Any, Tuple
-from openai import OpenAI
-import anthropic
+import asyncio
+import inspect
+from typing import List, Dict, Any, Tuple, Callable, Optional, Awaitable, Union
 
 from app.agents.mockup.mockup_analyzer_agent import RequirementsAnalyzer
 from app.agents.mockup.mockup_planner_agent import MockupPlanner
 from app.agents.mockup.mockup_generator_agent import HtmlGenerator
 from app.services.file_processing_service import sanitize_filename
-from typing import List, Dict
+from app.agents.mockup.mockup_templates import render_mockup_page, DEFAULT_THEME_CSS
+from app.services.mockup_cache_service import fingerprint
+from app.services.mockup_revision_service import requirement_keys, requirement_fingerprint, diff_requirements
+from app.core.config import MOCKUP_PAGE_CONCURRENCY, MOCKUP_RENDER_MODE, MOCKUP_INCREMENTAL_MAX_CHANGE_RATIO
+from app.core.lazy import lazy_import
+
+# SDK는 첫 목업 생성(또는 워밍업) 시 import
+openai = lazy_import("openai")
+anthropic = lazy_import("anthropic")
 
 class UiMockupAgent:
     """
     요구사항 분석, 페이지 기획, HTML 생성을 총괄하여
     상호 연결된 UI 목업 결과물을 생성하는 메인 에이전트 클래스입니다.
     """
-    def __init__(self, requirements_data: List[Dict[str, Any]], openai_api_key: str, anthropic_api_key: str):
+    def __init__(
+        self,
+        requirements_data: List[Dict[str, Any]],
+        openai_api_key: str,
+        anthropic_api_key: str,
+        previous_revision: Optional[Dict[str, Any]] = None
+    ):
+        """
+        previous_revision(같은 프로젝트의 마지막 목업 revision)이 주어지면 요구사항 변경분만 반영하는 증분 모드로 동작합니다.
+        변경된 요구사항이 속한 페이지만 다시 기획/생성하고, 나머지 페이지는 이전 결과물을 그대로 사용합니다.
+        """
         if not requirements_data:
             raise ValueError("요구사항 데이터가 없습니다.")
         if not openai_api_key or not anthropic_api_key:
             raise ValueError("API 키가 설정되지 않았습니다.")
 
         self.requirements_data = requirements_data
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        self.anthropic_api_key = anthropic_api_key
+        self.openai_client = openai.OpenAI(api_key=openai_api_key)
         self.anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
         
         self.system_overview = "N/A"
         self.feature_specs = []
         self.main_page_plan = {}
         self.defined_pages = []
+
+        self.previous_revision = previous_revision
+        self.incremental = False
+        self.changed_files: set = set() # 증분 모드에서 다시 생성해야 하는 파일
+        self.main_page_keys: List[str] = []
+        self.theme_css: Optional[str] = None
+        self.page_contents: Dict[str, str] = {} # 파일명 → shell 모드는 콘텐츠 조각, full 모드는 HTML
         
         self._initialize_components_and_plan()
 
@@ -39,6 +65,10 @@ class UiMockupAgent:
         
         # 1. 요구사항 분석
         analyzer = RequirementsAnalyzer(self.requirements_data, self.openai_client)
+        if self.previous_revision and self._plan_incrementally(analyzer):
+            print("✅ 에이전트 초기화 및 증분 기획 완료.")
+            return
+
         self.system_overview = analyzer.get_system_overview()
         # [추가] get_system_overview가 실패했는지(예: Fallback 메시지 포함) 확인할 수 있습니다.
         if not self.system_overview or "Fallback" in self.system_overview:
@@ -54,6 +84,7 @@ class UiMockupAgent:
         planner = MockupPlanner(self.feature_specs, self.system_overview, self.openai_client)
         self.main_page_plan = planner.plan_user_main_page()
         self.defined_pages = planner.define_pages_and_allocate_features()
+        self.main_page_keys = [spec["requirement_key"] for spec in planner.main_page_context_specs()]
         
         # [수정] 페이지 기획 실패는 치명적이므로 예외를 발생시킵니다.
         if not self.main_page_plan or not self.defined_pages:
@@ -61,55 +92,250 @@ class UiMockupAgent:
             
         print("✅ 에이전트 초기화 및 사전 기획 완료.")
 
-    def _create_navigation_html(self) -> str:
-        """모든 페이지 정보를 바탕으로 공통 내비게이션 HTML 메뉴를 생성합니다."""
+    def _plan_incrementally(self, analyzer: RequirementsAnalyzer) -> bool:
+        """
+        이전 revision과 요구사항을 비교해 변경된 요구사항이 포함된 페이지만 다시 기획합니다.
+        변경 비율이 MOCKUP_INCREMENTAL_MAX_CHANGE_RATIO 를 넘거나 기획에 실패하면 False를 반환합니다. (전체 기획으로 진행)
+        """
+        previous = self.previous_revision
+        diff = diff_requirements(previous.get("requirements", {}), self.requirements_data)
+        print(
+            f"[증분 목업] 요구사항 변경: 추가 {len(diff['added'])}, 삭제 {len(diff['removed'])}, "
+            f"수정 {len(diff['modified'])}, 유지 {diff['unchanged']} (변경 비율 {diff['change_ratio']:.0%})"
+        )
+        if diff["change_ratio"] > MOCKUP_INCREMENTAL_MAX_CHANGE_RATIO:
+            print("[증분 목업] 변경 비율이 커서 전체 목업을 다시 생성합니다.")
+            return False
+
+        feature_specs = analyzer.get_feature_specifications()
+        if not feature_specs:
+            return False
+        changed_keys = set(diff["modified"]) | set(diff["removed"])
+        id_by_key = {spec["requirement_key"]: spec["id"] for spec in feature_specs}
+
+        # 이전 기획의 요구사항 키를 이번 revision의 기능 ID로 다시 연결하고, 변경된 요구사항이 포함된 페이지를 찾음
+        defined_pages, affected_pages, unchanged_titles, assigned = [], [], [], set()
+        for previous_page in previous.get("defined_pages", []):
+            keys = previous_page.get("included_requirement_keys", [])
+            page = {k: v for k, v in previous_page.items() if k != "included_requirement_keys"}
+            page["included_feature_ids"] = [id_by_key[k] for k in keys if k in id_by_key]
+            assigned.update(k for k in keys if k in id_by_key)
+            if changed_keys & set(keys):
+                affected_pages.append(page)
+            else:
+                defined_pages.append(page)
+                unchanged_titles.append(page.get("page_title_ko", page.get("page_name", "")))
+        unassigned_specs = [spec for spec in feature_specs if spec["requirement_key"] not in assigned]
+
+        self.feature_specs = feature_specs
+        self.system_overview = previous.get("system_overview") or "N/A"
+        planner = MockupPlanner(self.feature_specs, self.system_overview, self.openai_client)
+
+        if affected_pages or unassigned_specs:
+            revised_pages = planner.revise_pages(affected_pages, unassigned_specs, unchanged_titles)
+            if revised_pages is None:
+                print("[증분 목업] 변경 페이지 기획에 실패해 전체 목업을 다시 생성합니다.")
+                return False
+            valid_ids = set(id_by_key.values())
+            for page in revised_pages:
+                page["included_feature_ids"] = [fid for fid in page.get("included_feature_ids", []) if fid in valid_ids]
+            # 기존 페이지 순서를 유지하면서 변경된 페이지를 제자리에 넣고, 새 페이지는 뒤에 추가
+            revised_by_name = {page["page_name"]: page for page in revised_pages}
+            ordered = []
+            for previous_page in previous.get("defined_pages", []):
+                name = previous_page.get("page_name")
+                unchanged = next((page for page in defined_pages if page.get("page_name") == name), None)
+                if unchanged is not None:
+                    ordered.append(unchanged)
+                elif name in revised_by_name:
+                    ordered.append(revised_by_name.pop(name))
+            ordered.extend(revised_by_name.values())
+            self.changed_files.update(
+                self._page_filename(page) for page in ordered if page not in defined_pages
+            )
+            defined_pages = ordered
+
+        # 메인 페이지는 기획에 사용된 주요 기능이 바뀐 경우에만 다시 기획
+        self.main_page_keys = [spec["requirement_key"] for spec in planner.main_page_context_specs()]
+        previous_main = previous.get("main_page_plan") or {}
+        if changed_keys & set(previous_main.get("included_requirement_keys", [])) or self.main_page_keys != previous_main.get("included_requirement_keys"):
+            self.main_page_plan = planner.plan_user_main_page()
+            self.changed_files.add("index.html")
+        else:
+            self.main_page_plan = {k: v for k, v in previous_main.items() if k != "included_requirement_keys"}
+
+        if not self.main_page_plan or not defined_pages:
+            return False
+        self.defined_pages = defined_pages
+        self.incremental = True
+        print(f"[증분 목업] 다시 생성할 페이지: {sorted(self.changed_files) or '없음'}")
+        return True
+
+    def _can_reuse_outputs(self, project_name: str, render_mode: str) -> bool:
+        previous = self.previous_revision
+        return self.incremental and previous.get("render_mode") == render_mode and previous.get("project_name") == project_name
+
+    def _reusable_contents(self, project_name: str, render_mode: str, navigation_html: str) -> Dict[str, str]:
+        """증분 모드에서 이전 revision의 결과물을 그대로 쓸 수 있는 페이지(파일명 → 콘텐츠)를 반환합니다."""
+        previous = self.previous_revision
+        if not self._can_reuse_outputs(project_name, render_mode):
+            return {}
+        # full 모드 HTML에는 내비게이션이 들어 있으므로 페이지 구성이 바뀌면 재사용할 수 없음
+        if render_mode == "full" and previous.get("navigation") != fingerprint(navigation_html):
+            return {}
+        return {
+            filename: content
+            for filename, content in (previous.get("page_contents") or {}).items()
+            if filename not in self.changed_files
+        }
+
+    def build_revision(self, project_name: str, render_mode: str) -> Dict[str, Any]:
+        """다음 revision과 비교할 수 있도록 이번 목업의 요구사항/기획/결과물을 정리합니다."""
+        key_by_id = {spec["id"]: spec["requirement_key"] for spec in self.feature_specs}
+        return {
+            "project_name": project_name,
+            "render_mode": render_mode,
+            "requirements": dict(zip(requirement_keys(self.requirements_data), (requirement_fingerprint(r) for r in self.requirements_data))),
+            "system_overview": self.system_overview,
+            "main_page_plan": {**self.main_page_plan, "included_requirement_keys": self.main_page_keys},
+            "defined_pages": [
+                {**page, "included_requirement_keys": [key_by_id[fid] for fid in page.get("included_feature_ids", []) if fid in key_by_id]}
+                for page in self.defined_pages
+            ],
+            "navigation": fingerprint(self._create_navigation_html()),
+            "theme_css": self.theme_css,
+            "page_contents": self.page_contents,
+        }
+
+    def _navigation_items(self) -> List[Dict[str, str]]:
+        """내비게이션 메뉴 항목(파일명, 제목) 목록을 만듭니다."""
         main_page_title = self.main_page_plan.get("page_title_ko", "홈")
-        nav_html = '<ul>\n'
-        nav_html += f'    <li><a href="index.html" class="nav-link">{main_page_title} (Home)</a></li>\n'
+        items = [{"file_name": "index.html", "title": f"{main_page_title} (Home)"}]
         for page in self.defined_pages:
             page_name = page.get("page_name")
             if not page_name:
                 continue
-            
-            file_name = f"{sanitize_filename(page_name)}.html"
-            title = page.get('page_title_ko', page_name)
-            nav_html += f'    <li><a href="{file_name}" class="nav-link">{title}</a></li>\n'
+            items.append({"file_name": f"{sanitize_filename(page_name)}.html", "title": page.get('page_title_ko', page_name)})
+        return items
+
+    def _create_navigation_html(self) -> str:
+        """모든 페이지 정보를 바탕으로 공통 내비게이션 HTML 메뉴를 생성합니다."""
+        nav_html = '<ul>\n'
+        for item in self._navigation_items():
+            nav_html += f'    <li><a href="{item["file_name"]}" class="nav-link">{item["title"]}</a></li>\n'
         nav_html += '</ul>'
         return nav_html
 
-    def run(self, project_name: str) -> List[Tuple[str, str]]:
+    def _page_filename(self, page_plan: Dict[str, Any]) -> str:
+        if page_plan.get('is_main_page'):
+            return "index.html"
+        return f"{sanitize_filename(page_plan.get('page_name'))}.html"
+
+    async def arun(
+        self,
+        project_name: str,
+        on_file: Optional[Callable[[str, str], Union[None, Awaitable[None]]]] = None,
+        render_mode: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
         """
-        초기화 시 기획된 내용을 바탕으로, 연결된 목업 페이지들을 생성하고
-        (파일명, 파일 내용) 튜플 리스트를 반환합니다.
+        run()의 비동기 버전입니다. 각 페이지는 자신의 기획 내용과 공통 내비게이션에만 의존하므로
+        최대 MOCKUP_PAGE_CONCURRENCY 개씩 동시에 생성합니다. 실패한 페이지는 재시도 후 제외되고 나머지는 계속 진행됩니다.
+        on_file(파일명, 내용)은 기획 순서대로, 앞선 페이지가 모두 끝나는 즉시 호출되므로
+        ZIP 등에 바로 기록해도 결과물의 파일 순서가 항상 같습니다. on_file이 awaitable을 반환하면 기록이 끝날 때까지 기다립니다.
+        render_mode(기본 MOCKUP_RENDER_MODE)가 "shell"이면 테마 CSS를 한 번만 생성하고, 페이지별로는
+        메인 콘텐츠 조각만 생성해 공통 레이아웃 템플릿으로 조립합니다. "full"이면 페이지마다 전체 HTML을 생성합니다.
         """
+        render_mode = render_mode or MOCKUP_RENDER_MODE
         print(f"\n🚀 '{project_name}' 프로젝트 목업 생성 실행 시작...")
-        
-        generator = HtmlGenerator(self.anthropic_client)
+
+        async_client = anthropic.AsyncAnthropic(api_key=self.anthropic_api_key)
+        generator = HtmlGenerator(self.anthropic_client, async_client)
         navigation_html = self._create_navigation_html()
-        generated_files = []
-        
         all_pages_to_generate = [self.main_page_plan] + self.defined_pages
-        
-        print(f"--- 총 {len(all_pages_to_generate)}개 페이지 순차 생성 시작 ---")
+        semaphore = asyncio.Semaphore(max(1, MOCKUP_PAGE_CONCURRENCY))
 
-        for page_plan in all_pages_to_generate:
-            page_html = generator.generate_html_page(
-                page_details=page_plan,
-                navigation_html=navigation_html,
-                project_name=project_name
+        nav_items = self._navigation_items()
+        reusable = self._reusable_contents(project_name, render_mode, navigation_html)
+        if self.incremental:
+            print(f"[증분 목업] 이전 revision에서 재사용하는 페이지: {len(reusable)}개")
+        theme_css_task = None
+        if render_mode == "shell":
+            previous_theme_css = self.previous_revision.get("theme_css") if self._can_reuse_outputs(project_name, render_mode) else None
+            theme_css_task = asyncio.create_task(
+                self._resolved(previous_theme_css) if previous_theme_css
+                else generator.agenerate_theme_css(project_name, self.system_overview)
             )
-            
-            if page_html and "Error" not in page_html:
-                if page_plan.get('is_main_page'):
-                    filename = "index.html"
-                else:
-                    filename = f"{sanitize_filename(page_plan.get('page_name'))}.html"
-                
-                generated_files.append((filename, page_html))
-                print(f"👍 '{filename}' 생성 성공")
-            else:
-                page_title = page_plan.get('page_title_ko', '알 수 없는 페이지')
-                print(f"⚠️ '{page_title}' 페이지 생성 실패.")
-        
+
+        print(f"--- 총 {len(all_pages_to_generate)}개 페이지 동시 생성 시작 (동시 {MOCKUP_PAGE_CONCURRENCY}개, {render_mode} 모드) ---")
+
+        async def generate(index: int, page_plan: Dict[str, Any]):
+            filename = self._page_filename(page_plan)
+            content = reusable.get(filename)
+            if content is None:
+                async with semaphore:
+                    if theme_css_task is None:
+                        content = await generator.agenerate_html_page(
+                            page_details=page_plan,
+                            navigation_html=navigation_html,
+                            project_name=project_name
+                        )
+                    else:
+                        content = await generator.agenerate_page_fragment(page_plan, project_name)
+            if not content:
+                return index, None
+            self.page_contents[filename] = content
+            if theme_css_task is None:
+                return index, content
+            theme_css = await theme_css_task
+            self.theme_css = theme_css
+            return index, render_mockup_page(
+                project_name=project_name,
+                page_title=page_plan.get('page_title_ko', '페이지'),
+                current_file=filename,
+                nav_items=nav_items,
+                content=content,
+                theme_css=theme_css or DEFAULT_THEME_CSS,
+            )
+
+        results: Dict[int, Optional[str]] = {}
+        generated_files = []
+        next_index = 0
+        tasks = [asyncio.create_task(generate(i, plan)) for i, plan in enumerate(all_pages_to_generate)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, page_html = await finished
+                results[index] = page_html
+                # 앞선 페이지가 모두 끝난 구간까지 순서대로 내보냄
+                while next_index in results:
+                    page_plan = all_pages_to_generate[next_index]
+                    page_html = results.pop(next_index)
+                    next_index += 1
+                    if not page_html:
+                        print(f"⚠️ '{page_plan.get('page_title_ko', '알 수 없는 페이지')}' 페이지 생성 실패.")
+                        continue
+                    filename = self._page_filename(page_plan)
+                    generated_files.append((filename, page_html))
+                    if on_file:
+                        written = on_file(filename, page_html)
+                        if inspect.isawaitable(written):
+                            await written
+                    print(f"👍 '{filename}' 생성 성공")
+        finally:
+            for task in tasks + ([theme_css_task] if theme_css_task else []):
+                task.cancel()
+            await async_client.close()
+
         print(f"\n🎉 모든 작업 완료! 총 {len(generated_files)}개의 파일이 생성되었습니다.")
         return generated_files
+
+    @staticmethod
+    async def _resolved(value):
+        return value
+
+    def run(self, project_name: str) -> List[Tuple[str, str]]:
+        """
+        초기화 시 기획된 내용을 바탕으로, 연결된 목업 페이지들을 생성하고
+        (파일명, 파일 내용) 튜플 리스트를 반환합니다.
+        페이지는 arun()으로 동시에 생성되므로, 이벤트 루프 안에서는 arun()을 직접 await 해야 합니다.
+        """
+        return asyncio.run(self.arun(project_name))
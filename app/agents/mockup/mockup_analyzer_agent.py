@@ -1,14 +1,18 @@
 # app/agents/mockup_analyzer_agent.py
 import json
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict, Any
+from app.services.mockup_cache_service import mockup_cache, fingerprint
+from app.services.mockup_revision_service import requirement_keys
+
+if TYPE_CHECKING:
+    from openai import OpenAI # 타입 힌트 전용 (SDK는 mockup_agent에서 지연 import)
 
 class RequirementsAnalyzer:
     """
     요구사항 데이터를 분석하여 시스템 개요를 파악하고,
     핵심 기능 명세를 추출하는 역할을 담당하는 클래스입니다.
     """
-    def __init__(self, requirements_data: List[Dict[str, Any]], openai_client: OpenAI):
+    def __init__(self, requirements_data: List[Dict[str, Any]], openai_client: "OpenAI"):
         self.requirements = requirements_data
         self.client = openai_client
         self.model = "gpt-4o"
@@ -21,6 +25,11 @@ class RequirementsAnalyzer:
             return None
         if cache_key in self.analysis_cache:
             return self.analysis_cache[cache_key]
+        persistent_key = fingerprint(self.model, system_message, prompt_text, is_json)
+        cached = mockup_cache.get("gpt", persistent_key)
+        if cached:
+            self.analysis_cache[cache_key] = cached
+            return cached
 
         try:
             response = self.client.chat.completions.create(
@@ -36,6 +45,7 @@ class RequirementsAnalyzer:
             result = response.choices[0].message.content.strip() if response.choices and response.choices[0].message.content else None
             if result:
                 self.analysis_cache[cache_key] = result
+                mockup_cache.put("gpt", persistent_key, result)
                 return result
             else:
                 print(f"⚠️ GPT 응답이 비어 있음. 키: {cache_key}")
@@ -86,10 +96,11 @@ class RequirementsAnalyzer:
             print("오류: 분석할 요구사항 데이터가 없습니다.")
             return feature_specs
 
-        target_reqs = [req for req in self.requirements if req.get("type") == "기능"]
+        keys = requirement_keys(self.requirements)
+        target_reqs = [(req, key) for req, key in zip(self.requirements, keys) if req.get("type") == "기능"]
         print(f"분석 대상 기능적 요구사항 수: {len(target_reqs)}")
 
-        for i, req in enumerate(target_reqs):
+        for i, (req, key) in enumerate(target_reqs):
             req_id = f"FUNC-{i+1:03}"
             description = req.get("description_name", "제목 없음")
             detail = f"{req.get('description_content', '')}\n\n{req.get('processing_detail', '')}".strip()
@@ -103,6 +114,7 @@ class RequirementsAnalyzer:
                 "actor_suggestion": req.get("target_task", "사용자"), # target_task를 액터 추정에 사용
                 "module": req.get("category_medium", "미분류"), # category_medium을 모듈로 사용
                 "priority": req.get("importance", "중"),
+                "requirement_key": key, # revision 간 요구사항 비교용
             })
 
         print(f"{len(feature_specs)}개의 주요 기능 명세 추출 완료.")
@@ -2,12 +2,56 @@
 import re
 import os
 import json # 추가
+import asyncio
+from typing import Optional
 from app.services.file_processing_service import sanitize_filename
+from app.core.config import MOCKUP_PAGE_MAX_RETRIES, MOCKUP_PAGE_RETRY_BASE_DELAY
+from app.agents.mockup.mockup_templates import SHELL_CLASS_GUIDE
+from app.services.mockup_cache_service import mockup_cache, fingerprint
+
+HTML_MODEL = "claude-4-sonnet-20250514"  # 모델명은 필요에 따라 변경 가능
+HTML_MAX_TOKENS = 4096
+HTML_SYSTEM_MESSAGE = "You are a world-class front-end developer and UI designer. Create a complete, single-file HTML page based on the user's request, including sophisticated CSS within a <style> tag. Respond ONLY with the raw HTML code itself, without any surrounding text or explanations."
+
+FRAGMENT_MAX_TOKENS = 3072
+THEME_CSS_MAX_TOKENS = 2048
+FRAGMENT_SYSTEM_MESSAGE = "You are a world-class front-end developer and UI designer. Write only the inner HTML of the page's main content area using the provided CSS classes. Respond ONLY with the raw HTML fragment, without <html>, <head>, <body>, <style> tags or any explanations."
+THEME_CSS_SYSTEM_MESSAGE = "You are a world-class UI designer. Write a cohesive, modern CSS theme for an admin-style web application using exactly the class names provided. Respond ONLY with raw CSS, without any surrounding text or explanations."
+
+def extract_html_code(result: str) -> str:
+    """Claude 응답에서 HTML 코드만 추출합니다."""
+    # HTML 코드 블록을 추출하는 로직은 그대로 유지
+    match = re.search(r'```(html)?\s*([\s\S]*?)\s*```', result, re.IGNORECASE)
+    if match:
+        return match.group(2).strip()
+    # Claude는 종종 코드만 반환하므로, 코드 블록이 없는 경우를 대비
+    return result.strip() # 만약 다른 설명이 붙었다면 제거
+
+def extract_html_fragment(result: str) -> str:
+    """조각 응답에서 문서 껍데기(<html>/<head>/<body>)와 <style> 블록을 제거하고 본문 조각만 남깁니다."""
+    html_code = extract_html_code(result)
+    body = re.search(r'<main[^>]*>([\s\S]*?)</main>', html_code, re.IGNORECASE) or re.search(r'<body[^>]*>([\s\S]*?)</body>', html_code, re.IGNORECASE)
+    if body:
+        html_code = body.group(1)
+    html_code = re.sub(r'<style[\s\S]*?</style>', '', html_code, flags=re.IGNORECASE)
+    html_code = re.sub(r'</?(!DOCTYPE|html|head|body)[^>]*>', '', html_code, flags=re.IGNORECASE)
+    return html_code.strip()
+
+def extract_css_code(result: str) -> str:
+    """테마 CSS 응답에서 CSS만 추출합니다. (<style> 태그가 조기 종료되지 않도록 닫는 태그 제거)"""
+    match = re.search(r'```(css)?\s*([\s\S]*?)\s*```', result, re.IGNORECASE)
+    css = match.group(2) if match else result
+    css = re.sub(r'</?style[^>]*>', '', css, flags=re.IGNORECASE)
+    return css.strip()
 
 class HtmlGenerator:
-    def __init__(self, anthropic_client):
-        """클라이언트를 Anthropic 클라이언트로 변경합니다."""
+    def __init__(self, anthropic_client, async_anthropic_client=None):
+        """
+        클라이언트를 Anthropic 클라이언트로 변경합니다.
+        async_anthropic_client(AsyncAnthropic)가 주어지면 agenerate_html_page로 여러 페이지를 동시에 생성할 수 있습니다.
+        """
         self.client = anthropic_client
+        self.async_client = async_anthropic_client
         self.analysis_cache = {}
 
     def _call_claude(self, prompt_text, cache_key, system_message="You are a helpful AI assistant.", temperature=0.1):
@@ -20,13 +64,19 @@ class HtmlGenerator:
         if cache_key in self.analysis_cache:
             print(f"캐시에서 HTML 로드 중 (키: {cache_key})...")
             return self.analysis_cache[cache_key]
+        persistent_key = fingerprint(HTML_MODEL, system_message, cache_key)
+        cached = mockup_cache.get("claude", persistent_key)
+        if cached:
+            html_code = extract_html_code(cached)
+            self.analysis_cache[cache_key] = html_code
+            return html_code
         
         try:
             print(f"Claude HTML 생성 요청 중 (키: {cache_key})...")
             # Anthropic API 호출 방식으로 변경
             response = self.client.messages.create(
-                model="claude-4-sonnet-20250514",  # 모델명은 필요에 따라 변경 가능
-                max_tokens=4096, # Claude API는 max_tokens가 필수입니다.
+                model=HTML_MODEL,
+                max_tokens=HTML_MAX_TOKENS, # Claude API는 max_tokens가 필수입니다.
                 system=system_message, # System prompt를 별도 파라미터로 전달
                 messages=[
                     {"role": "user", "content": prompt_text}
@@ -35,42 +85,27 @@ class HtmlGenerator:
             )
             # Claude 응답 구조에 맞게 결과 추출
             result = response.content[0].text
-            
-            # HTML 코드 블록을 추출하는 로직은 그대로 유지
-            match = re.search(r'```(html)?\s*([\s\S]*?)\s*```', result, re.IGNORECASE)
-            if match:
-                html_code = match.group(2).strip()
-            # Claude는 종종 코드만 반환하므로, 코드 블록이 없는 경우를 대비
-            elif result.strip().startswith('<!DOCTYPE html>'):
-                html_code = result.strip()
-            else:
-                html_code = result.strip() # 만약 다른 설명이 붙었다면 제거
+            html_code = extract_html_code(result)
 
             self.analysis_cache[cache_key] = html_code
+            mockup_cache.put("claude", persistent_key, result)
             return html_code
         except Exception as e:
             print(f"❌ Claude HTML 생성 API 호출 중 오류 발생 ({cache_key}): {e}")
             return f"\n<!DOCTYPE html>\n<html><head><title>오류</title></head><body><h1>HTML 생성 중 오류 발생</h1><p>키: {cache_key}</p><p>오류 내용: {e}</p></body></html>"
 
-    def generate_html_page(self, page_details, navigation_html, project_name):
-        """[연결 기능 추가] 메인/상세 페이지를 구분하고 공통 내비게이션을 주입하는 통합 함수"""
+    def _build_content_prompt(self, page_details):
+        """메인/상세 페이지에 맞는 메인 콘텐츠 구성 지시문을 만듭니다."""
         page_title = page_details.get('page_title_ko', '페이지')
-        print(f"📄 '{page_title}' 페이지 생성 요청...")
-
         if page_details.get('is_main_page'): # 메인 페이지인 경우
-            content_prompt = f"이 페이지는 메인 홈 페이지입니다. 환영 메시지('{page_details.get('welcome_message', '')}')와 아래 위젯 아이디어를 바탕으로 대시보드 형태의 콘텐츠를 구성해주세요:\n{json.dumps(page_details.get('widgets', []), ensure_ascii=False, indent=2)}"
-        else: # 상세 페이지인 경우
-            content_prompt = f"이 페이지는 '{page_title}' 상세 페이지입니다. 다음 핵심 UI 요소 제안에 따라 구체적인 목업 콘텐츠를 구성해주세요:\n{page_details.get('key_ui_elements_suggestion', '')}"
-        
-    def generate_html_page(self, page_details, navigation_html, project_name):
-        """[연결 기능 추가] 메인/상세 페이지를 구분하고 공통 내비게이션을 주입하는 통합 함수"""
-        page_title = page_details.get('page_title_ko', '페이지')
-        print(f"📄 '{page_title}' 페이지 생성 요청...")
+            return f"이 페이지는 메인 홈 페이지입니다. 환영 메시지('{page_details.get('welcome_message', '')}')와 아래 위젯 아이디어를 바탕으로 대시보드 형태의 콘텐츠를 구성해주세요:\n{json.dumps(page_details.get('widgets', []), ensure_ascii=False, indent=2)}"
+        # 상세 페이지인 경우
+        return f"이 페이지는 '{page_title}' 상세 페이지입니다. 다음 핵심 UI 요소 제안에 따라 구체적인 목업 콘텐츠를 구성해주세요:\n{page_details.get('key_ui_elements_suggestion', '')}"
 
-        if page_details.get('is_main_page'): # 메인 페이지인 경우
-            content_prompt = f"이 페이지는 메인 홈 페이지입니다. 환영 메시지('{page_details.get('welcome_message', '')}')와 아래 위젯 아이디어를 바탕으로 대시보드 형태의 콘텐츠를 구성해주세요:\n{json.dumps(page_details.get('widgets', []), ensure_ascii=False, indent=2)}"
-        else: # 상세 페이지인 경우
-            content_prompt = f"이 페이지는 '{page_title}' 상세 페이지입니다. 다음 핵심 UI 요소 제안에 따라 구체적인 목업 콘텐츠를 구성해주세요:\n{page_details.get('key_ui_elements_suggestion', '')}"
+    def _build_page_prompt(self, page_details, navigation_html, project_name):
+        """메인/상세 페이지를 구분하고 공통 내비게이션을 주입한 프롬프트와 캐시 키를 만듭니다."""
+        page_title = page_details.get('page_title_ko', '페이지')
+        content_prompt = self._build_content_prompt(page_details)
         
         prompt = f"""
         **지시:** 다음 정보를 바탕으로, 완전한 단일 HTML 페이지를 생성해줘.
@@ -93,15 +128,113 @@ class HtmlGenerator:
         **최종 결과물:** 다른 설명 없이, 완성된 HTML 코드만 응답해줘.
         """
 
-        cache_key = f"html_gen_unified_v3_{page_details.get('page_title_ko')}_{hash(prompt)}"
+        cache_key = f"html_gen_unified_v3_{fingerprint(prompt)}"
+        return prompt, cache_key
+
+    def generate_html_page(self, page_details, navigation_html, project_name):
+        """[연결 기능 추가] 메인/상세 페이지를 구분하고 공통 내비게이션을 주입하는 통합 함수"""
+        print(f"📄 '{page_details.get('page_title_ko', '페이지')}' 페이지 생성 요청...")
+        prompt, cache_key = self._build_page_prompt(page_details, navigation_html, project_name)
         html_code = self._call_claude(
             prompt,
             cache_key,
-            system_message="You are a world-class front-end developer and UI designer. Create a complete, single-file HTML page based on the user's request, including sophisticated CSS within a <style> tag. Respond ONLY with the raw HTML code itself, without any surrounding text or explanations.",
+            system_message=HTML_SYSTEM_MESSAGE,
             temperature=0.1
         )
         return html_code
 
+    async def _acall_claude(self, prompt_text, cache_key, system_message, label, max_tokens=HTML_MAX_TOKENS) -> Optional[str]:
+        """
+        AsyncAnthropic으로 Claude를 호출합니다. 실패 시 지수 백오프로 MOCKUP_PAGE_MAX_RETRIES 번까지 재시도하고,
+        끝내 실패하면 예외 대신 None을 반환해 다른 페이지 생성에 영향을 주지 않습니다.
+        """
+        if cache_key in self.analysis_cache:
+            print(f"캐시에서 HTML 로드 중 (키: {cache_key})...")
+            return self.analysis_cache[cache_key]
+        persistent_key = fingerprint(HTML_MODEL, system_message, cache_key)
+        cached = await asyncio.to_thread(mockup_cache.get, "claude", persistent_key)
+        if cached:
+            self.analysis_cache[cache_key] = cached
+            return cached
+
+        for attempt in range(MOCKUP_PAGE_MAX_RETRIES + 1):
+            try:
+                print(f"📄 '{label}' 생성 요청... (시도 {attempt + 1})")
+                response = await self.async_client.messages.create(
+                    model=HTML_MODEL,
+                    max_tokens=max_tokens,
+                    system=system_message,
+                    messages=[{"role": "user", "content": prompt_text}],
+                    temperature=0.1
+                )
+                result = response.content[0].text
+                if not result or not result.strip():
+                    raise ValueError("빈 응답")
+                self.analysis_cache[cache_key] = result
+                await asyncio.to_thread(mockup_cache.put, "claude", persistent_key, result)
+                return result
+            except Exception as e:
+                print(f"❌ '{label}' 생성 실패 (시도 {attempt + 1}/{MOCKUP_PAGE_MAX_RETRIES + 1}): {e}")
+                if attempt < MOCKUP_PAGE_MAX_RETRIES:
+                    await asyncio.sleep(MOCKUP_PAGE_RETRY_BASE_DELAY * (2 ** attempt))
+        return None
+
+    async def agenerate_html_page(self, page_details, navigation_html, project_name) -> Optional[str]:
+        """generate_html_page의 비동기 버전입니다. (재시도 후에도 실패하면 None)"""
+        if not self.async_client:
+            return await asyncio.to_thread(self.generate_html_page, page_details, navigation_html, project_name)
+        prompt, cache_key = self._build_page_prompt(page_details, navigation_html, project_name)
+        result = await self._acall_claude(prompt, cache_key, HTML_SYSTEM_MESSAGE, page_details.get('page_title_ko', '페이지'))
+        return extract_html_code(result) if result else None
+
+    async def agenerate_theme_css(self, project_name, system_overview) -> Optional[str]:
+        """[shell 모드] 목업 전체가 함께 쓰는 테마 CSS를 한 번만 생성합니다."""
+        prompt = f"""
+        **지시:** '{project_name}' 시스템의 관리자형 웹 UI 목업에 쓸 테마 CSS를 작성해줘.
+        시스템 개요: {system_overview}
+
+        **레이아웃 구조 (이미 존재함):**
+        - body > .layout > aside.sidebar(.sidebar-title, nav ul li a.nav-link, 현재 페이지는 .nav-link.active) + main.content(.page-header h1, 이후 페이지 콘텐츠)
+        - 사이드바 너비, flex 배치, 반응형 격자 열 수는 이미 정의되어 있으니 색상, 타이포그래피, 여백, 테두리, 그림자, 상태 표현을 중심으로 작성해줘.
+
+        **반드시 스타일을 정의할 클래스:**
+        {SHELL_CLASS_GUIDE}
+        ---
+        **최종 결과물:** 다른 설명 없이 CSS 코드만 응답해줘.
+        """
+        if not self.async_client:
+            return None
+        # 시스템 개요는 매번 조금씩 달라지므로 키에서 제외 (같은 프로젝트의 revision 간 테마 유지)
+        cache_key = f"theme_css_v1_{fingerprint(project_name, SHELL_CLASS_GUIDE)}"
+        result = await self._acall_claude(prompt, cache_key, THEME_CSS_SYSTEM_MESSAGE, "테마 CSS", THEME_CSS_MAX_TOKENS)
+        css = extract_css_code(result) if result else ""
+        return css or None
+
+    async def agenerate_page_fragment(self, page_details, project_name) -> Optional[str]:
+        """[shell 모드] 페이지의 메인 콘텐츠 영역 HTML 조각만 생성합니다. (사이드바/내비게이션/CSS는 로컬 템플릿이 담당)"""
+        page_title = page_details.get('page_title_ko', '페이지')
+        prompt = f"""
+        **지시:** '{project_name}' 시스템의 '{page_title}' 페이지에서 메인 콘텐츠 영역(<main> 내부, 페이지 제목 h1 아래)에 들어갈 HTML 조각만 작성해줘.
+
+        **규칙:**
+        - <!DOCTYPE>, <html>, <head>, <body>, <style> 태그, 사이드바, 내비게이션, 페이지 제목(h1)은 작성하지 마.
+        - 스타일은 아래 클래스만 사용하고 인라인 style 속성은 최소화해줘.
+        {SHELL_CLASS_GUIDE}
+        - 실제 서비스처럼 보이도록 현실적인 한국어 예시 데이터를 채워줘.
+
+        **메인 콘텐츠:**
+        {self._build_content_prompt(page_details)}
+        ---
+        **최종 결과물:** 다른 설명 없이 HTML 조각만 응답해줘.
+        """
+        if not self.async_client:
+            return None
+        # 조각 프롬프트는 페이지 기획과 프로젝트 이름에만 의존하므로, 기획이 같은 페이지는 revision이 바뀌어도 재사용됨
+        cache_key = f"html_fragment_v1_{fingerprint(prompt)}"
+        result = await self._acall_claude(prompt, cache_key, FRAGMENT_SYSTEM_MESSAGE, page_title, FRAGMENT_MAX_TOKENS)
+        fragment = extract_html_fragment(result) if result else ""
+        return fragment or None
+
     def save_html_to_file(self, page_name, html_content, output_dir="mockups_output_v3"):
         # 이 메서드는 외부 라이브러리에 의존하지 않으므로 변경할 필요가 없습니다.
         if not os.path.exists(output_dir):
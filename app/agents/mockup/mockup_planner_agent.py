@@ -1,15 +1,18 @@
 # app/agents/mockup_planner_agent.py
 import json
 import re
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict, Any
+from app.services.mockup_cache_service import mockup_cache, fingerprint
+
+if TYPE_CHECKING:
+    from openai import OpenAI # 타입 힌트 전용 (SDK는 mockup_agent에서 지연 import)
 
 class MockupPlanner:
     """
     기능 명세와 시스템 개요를 바탕으로 웹 페이지 구조를 기획하고,
     메인 페이지 및 상세 페이지의 콘텐츠를 정의하는 클래스입니다.
     """
-    def __init__(self, feature_specs: List[Dict[str, Any]], system_overview: str, openai_client: OpenAI):
+    def __init__(self, feature_specs: List[Dict[str, Any]], system_overview: str, openai_client: "OpenAI"):
         self.feature_specs = feature_specs
         self.system_overview = system_overview
         self.client = openai_client
@@ -22,6 +25,11 @@ class MockupPlanner:
             return None
         if cache_key in self.analysis_cache:
             return self.analysis_cache[cache_key]
+        persistent_key = fingerprint("gpt-4o", system_message, prompt_text, is_json)
+        cached = mockup_cache.get("gpt", persistent_key)
+        if cached:
+            self.analysis_cache[cache_key] = cached
+            return cached
         
         try:
             print(f"GPT 계획 요청 중 (키: {cache_key})...")
@@ -37,6 +45,7 @@ class MockupPlanner:
             result = response.choices[0].message.content.strip() if response.choices and response.choices[0].message.content else None
             if result:
                 self.analysis_cache[cache_key] = result
+                mockup_cache.put("gpt", persistent_key, result)
                 return result
             return None
         except Exception as e:
@@ -91,16 +100,76 @@ class MockupPlanner:
             print(f"페이지 계획 파싱 오류: {e}. 대체 계획을 사용합니다.")
             return self._get_fallback_page_plan()
 
-    def plan_user_main_page(self) -> Dict[str, Any]:
-        """사용자 관점에서 메인 페이지에 들어갈 콘텐츠를 기획합니다."""
-        print("사용자 중심 메인 페이지 콘텐츠 기획 중...")
-
+    def main_page_context_specs(self) -> List[Dict[str, Any]]:
+        """메인 페이지 기획에 사용하는 기능 명세 (우선순위가 높은 기능 최대 15개)"""
         high_priority_specs = [
             spec for spec in self.feature_specs
             if spec.get('priority') in ['필수', '높음', '상']
         ]
         context_specs = high_priority_specs if high_priority_specs else self.feature_specs
-        features_list_str = "\n".join([f"- {spec['description']}" for spec in context_specs[:15]])
+        return context_specs[:15]
+
+    def revise_pages(
+        self,
+        affected_pages: List[Dict[str, Any]],
+        unassigned_specs: List[Dict[str, Any]],
+        unchanged_page_titles: List[str]
+    ) -> List[Dict[str, Any]] | None:
+        """
+        [증분 목업] 요구사항이 바뀐 페이지들의 기획만 다시 세우고, 새로 추가된 기능을 기존/신규 페이지에 할당합니다.
+        affected_pages의 included_feature_ids는 현재 revision의 기능 ID로 갱신되어 있어야 합니다.
+        실패하면 None을 반환하며, 호출 측은 전체 기획으로 되돌아갑니다.
+        """
+        specs_by_id = {spec['id']: spec for spec in self.feature_specs}
+        pages_text = "\n".join(
+            f"- page_name: {page.get('page_name')}, page_title_ko: {page.get('page_title_ko')}, 설명: {page.get('page_description', '')}\n"
+            + "\n".join(
+                f"    - ID: {fid}, 기능 설명: {specs_by_id[fid]['description']}"
+                for fid in page.get('included_feature_ids', []) if fid in specs_by_id
+            )
+            for page in affected_pages
+        ) or "(없음)"
+        new_features_text = "\n".join(
+            f"- ID: {spec['id']}, 기능 설명: {spec['description']}, 우선순위: {spec.get('priority', 'N/A')}"
+            for spec in unassigned_specs
+        ) or "(없음)"
+        other_pages_text = ", ".join(unchanged_page_titles) or "(없음)"
+
+        prompt = f"""
+        시스템 개요: {self.system_overview}
+        변경 없이 유지되는 다른 페이지: {other_pages_text}
+        ---
+        요구사항이 변경된 페이지와 현재 포함된 기능:
+        {pages_text}
+
+        아직 어느 페이지에도 할당되지 않은 새 기능:
+        {new_features_text}
+        ---
+        **지시:** 위의 '요구사항이 변경된 페이지'들의 기획을 현재 기능 목록에 맞게 다시 작성하고, 새 기능은 알맞은 변경 대상 페이지에 추가하거나
+        필요하면 새 페이지를 만들어 할당해주십시오. 기존 페이지는 page_name을 그대로 유지하고, 포함된 기능이 하나도 없는 페이지는 결과에서 제외하십시오.
+        유지되는 다른 페이지와 중복되는 페이지는 만들지 마십시오.
+        최상위 키가 "pages"인 JSON 객체로만 응답하며, 각 페이지 객체는 `page_name`, `page_title_ko`, `page_description`, `target_actors`,
+        `included_feature_ids`, `key_ui_elements_suggestion` 키를 가져야 합니다.
+        """
+        system_message = "You are an expert UI/UX designer and information architect. You must respond ONLY in a valid JSON object with a 'pages' key."
+        revised_str = self._call_gpt(prompt, f"revise_pages_v1_{len(affected_pages)}_{len(unassigned_specs)}", system_message, is_json=True)
+        if not revised_str:
+            return None
+        try:
+            pages_list = json.loads(revised_str).get("pages")
+            if not isinstance(pages_list, list):
+                raise ValueError("JSON 'pages' 키가 리스트가 아닙니다.")
+            print(f"GPT로부터 변경된 페이지 {len(pages_list)}개의 기획을 받았습니다.")
+            return [page for page in pages_list if isinstance(page, dict) and page.get("page_name")]
+        except (json.JSONDecodeError, ValueError, AttributeError) as e:
+            print(f"변경 페이지 기획 파싱 오류: {e}")
+            return None
+
+    def plan_user_main_page(self) -> Dict[str, Any]:
+        """사용자 관점에서 메인 페이지에 들어갈 콘텐츠를 기획합니다."""
+        print("사용자 중심 메인 페이지 콘텐츠 기획 중...")
+
+        features_list_str = "\n".join([f"- {spec['description']}" for spec in self.main_page_context_specs()])
 
         prompt = f"""
         시스템 개요: {self.system_overview}
@@ -0,0 +1,136 @@
+# app/agents/mockup/mockup_templates.py
+"""
+shell 렌더링 모드에서 사용하는 목업 공통 레이아웃(Jinja2 템플릿)과 기본 스타일입니다.
+
+사이드바/내비게이션/레이아웃 CSS는 여기서 로컬로 조립하고, Claude에는 페이지별 메인 콘텐츠 조각과
+목업 전체가 함께 쓰는 테마 CSS(1회)만 요청합니다. 조각은 SHELL_CLASS_GUIDE 의 클래스만 사용하도록 안내합니다.
+"""
+from typing import Any, Dict, List
+
+from jinja2 import Environment, DictLoader, select_autoescape
+
+# 조각/테마 CSS가 함께 사용하는 클래스 목록 (프롬프트에 그대로 전달)
+SHELL_CLASS_GUIDE = """
+- 구획: .section(흰 배경 카드형 구역), .section-title, .grid-2, .grid-3, .grid-4(반응형 격자), .toolbar(검색/버튼 가로 배치)
+- 카드/지표: .card, .card-title, .stat(숫자 지표), .stat-label, .stat-value
+- 표: table.table, .table thead th, .table td, .badge, .badge-success, .badge-warning, .badge-danger, .badge-info
+- 폼: .form, .form-group, .form-group label, .form-control(input/select/textarea), .form-actions
+- 버튼: .btn, .btn-primary, .btn-secondary, .btn-danger, .btn-sm
+- 기타: .tabs, .tab, .tab.active, .list, .list-item, .muted, .empty-state, .modal-preview
+"""
+
+# 레이아웃이 항상 깨지지 않도록 테마 CSS보다 먼저 들어가는 구조용 CSS
+BASE_LAYOUT_CSS = """
+* { box-sizing: border-box; }
+body { margin: 0; font-family: 'Pretendard', 'Noto Sans KR', 'Malgun Gothic', sans-serif; }
+.layout { display: flex; min-height: 100vh; }
+.sidebar { width: 240px; flex-shrink: 0; padding: 24px 16px; }
+.sidebar ul { list-style: none; margin: 0; padding: 0; }
+.sidebar .nav-link { display: block; padding: 10px 12px; text-decoration: none; }
+.content { flex: 1; min-width: 0; padding: 32px; }
+.grid-2, .grid-3, .grid-4 { display: grid; gap: 16px; }
+.grid-2 { grid-template-columns: repeat(2, minmax(0, 1fr)); }
+.grid-3 { grid-template-columns: repeat(3, minmax(0, 1fr)); }
+.grid-4 { grid-template-columns: repeat(4, minmax(0, 1fr)); }
+.table { width: 100%; border-collapse: collapse; }
+@media (max-width: 900px) {
+  .layout { flex-direction: column; }
+  .sidebar { width: 100%; }
+  .grid-2, .grid-3, .grid-4 { grid-template-columns: 1fr; }
+}
+"""
+
+# 테마 CSS 생성에 실패했을 때 사용하는 기본 테마
+DEFAULT_THEME_CSS = """
+body { background: #f4f6fa; color: #1f2937; }
+.sidebar { background: #1e293b; color: #e2e8f0; }
+.sidebar-title { font-size: 18px; font-weight: 700; margin-bottom: 24px; color: #fff; }
+.sidebar .nav-link { color: #cbd5e1; border-radius: 8px; margin-bottom: 4px; }
+.sidebar .nav-link:hover, .sidebar .nav-link.active { background: #334155; color: #fff; }
+.page-header h1 { font-size: 24px; margin: 0 0 24px; }
+.section, .card { background: #fff; border-radius: 12px; padding: 20px; margin-bottom: 20px; box-shadow: 0 1px 3px rgba(15, 23, 42, 0.08); }
+.section-title, .card-title { font-size: 16px; font-weight: 700; margin: 0 0 12px; }
+.toolbar { display: flex; gap: 8px; align-items: center; margin-bottom: 16px; flex-wrap: wrap; }
+.stat-label { color: #64748b; font-size: 13px; }
+.stat-value { font-size: 26px; font-weight: 700; }
+.table th, .table td { padding: 10px 12px; border-bottom: 1px solid #e5e7eb; text-align: left; font-size: 14px; }
+.table thead th { background: #f8fafc; color: #475569; }
+.badge { display: inline-block; padding: 2px 8px; border-radius: 999px; font-size: 12px; background: #e2e8f0; }
+.badge-success { background: #dcfce7; color: #166534; }
+.badge-warning { background: #fef3c7; color: #92400e; }
+.badge-danger { background: #fee2e2; color: #991b1b; }
+.badge-info { background: #dbeafe; color: #1e40af; }
+.form-group { display: flex; flex-direction: column; gap: 6px; margin-bottom: 14px; }
+.form-control { padding: 9px 12px; border: 1px solid #cbd5e1; border-radius: 8px; font-size: 14px; }
+.form-actions { display: flex; gap: 8px; justify-content: flex-end; }
+.btn { padding: 8px 16px; border-radius: 8px; border: 1px solid #cbd5e1; background: #fff; cursor: pointer; font-size: 14px; }
+.btn-primary { background: #2563eb; border-color: #2563eb; color: #fff; }
+.btn-secondary { background: #f1f5f9; }
+.btn-danger { background: #dc2626; border-color: #dc2626; color: #fff; }
+.btn-sm { padding: 4px 10px; font-size: 12px; }
+.tabs { display: flex; gap: 4px; border-bottom: 1px solid #e5e7eb; margin-bottom: 16px; }
+.tab { padding: 8px 14px; cursor: pointer; }
+.tab.active { border-bottom: 2px solid #2563eb; color: #2563eb; font-weight: 600; }
+.list-item { padding: 12px 0; border-bottom: 1px solid #f1f5f9; }
+.muted { color: #64748b; }
+.empty-state { text-align: center; padding: 40px; color: #94a3b8; }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{{ page_title }} | {{ project_name }}</title>
+<style>
+{{ base_css | safe }}
+{{ theme_css | safe }}
+</style>
+</head>
+<body>
+<div class="layout">
+  <aside class="sidebar">
+    <div class="sidebar-title">{{ project_name }}</div>
+    <nav>
+      <ul>
+      {% for item in nav_items %}
+        <li><a href="{{ item.file_name }}" class="nav-link{% if item.file_name == current_file %} active{% endif %}">{{ item.title }}</a></li>
+      {% endfor %}
+      </ul>
+    </nav>
+  </aside>
+  <main class="content">
+    <header class="page-header"><h1>{{ page_title }}</h1></header>
+    {{ content | safe }}
+  </main>
+</div>
+</body>
+</html>
+"""
+
+_environment = Environment(
+    loader=DictLoader({"page.html": PAGE_TEMPLATE}),
+    autoescape=select_autoescape(default=True, default_for_string=True),
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+
+def render_mockup_page(
+    project_name: str,
+    page_title: str,
+    current_file: str,
+    nav_items: List[Dict[str, Any]],
+    content: str,
+    theme_css: str,
+) -> str:
+    """공통 레이아웃에 페이지별 메인 콘텐츠 조각과 테마 CSS를 넣어 완전한 HTML 문서를 만듭니다."""
+    return _environment.get_template("page.html").render(
+        project_name=project_name,
+        page_title=page_title,
+        current_file=current_file,
+        nav_items=nav_items,
+        content=content,
+        base_css=BASE_LAYOUT_CSS,
+        theme_css=theme_css,
+    )
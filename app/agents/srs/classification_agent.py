@@ -1,10 +1,7 @@
-import json
-from openai import OpenAI
 from typing import Dict
-from app.core.config import OPENAI_API_KEY, LLM_MODEL
 
-# 모듈 레벨에서 클라이언트 인스턴스 생성
-client = OpenAI(api_key=OPENAI_API_KEY)
+# 제공자 failover (assessment 정책)
+from app.services.llm_call_service import call_llm, LLMUnavailableError
 
 
 def generate_classification_only_prompt(description_name: str, description_content: str, target_task: str) -> str:
@@ -64,17 +61,15 @@ def classify_requirement_agent(description_name: str, description_content: str,
     classification_prompt = generate_classification_only_prompt(description_name, description_content, target_task)
     
     try:
-        response = client.chat.completions.create(
-            model=LLM_MODEL,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "You are a highly structured system analyst. Your output must be a single, valid JSON object as specified."},
-                {"role": "user", "content": classification_prompt}
-            ],
-            temperature=0.2
+        classification_result = call_llm(
+            "You are a highly structured system analyst. Your output must be a single, valid JSON object as specified.",
+            classification_prompt,
+            is_json_output=True,
+            agent="assessment",
+            temperature=0.2,
         )
-        
-        classification_result = json.loads(response.choices[0].message.content or "{}")
+        if not isinstance(classification_result, dict):
+            classification_result = {}
         
         # 최종 결과 조합
         final_result = {
@@ -84,6 +79,9 @@ def classify_requirement_agent(description_name: str, description_content: str,
         }
         return final_result
 
+    except LLMUnavailableError:
+        # 모든 제공자 장애는 작업을 실패시켜 재개할 수 있도록 그대로 전달 ("Error" 값이 체크포인트에 남지 않도록)
+        raise
     except Exception as e:
         print(f"classify_requirement_agent에서 오류 발생: {e}")
         # 오류 발생 시, ID 관련 키 없이 분류 필드만 에러로 반환
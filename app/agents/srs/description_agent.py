@@ -1,10 +1,7 @@
 # app/agents/description_agent_service.py
-from openai import OpenAI
 from typing import Optional
-from app.core.config import OPENAI_API_KEY, LLM_MODEL # LLM_MODEL_FOR_DESCRIPTION 등으로 구분 가능
-
-# client는 필요에 따라 함수 내에서 생성하거나, 의존성 주입을 통해 관리할 수 있습니다.
-# 여기서는 각 함수 호출 시 생성하는 것으로 가정합니다.
+from app.core.config import LLM_MODEL # LLM_MODEL_FOR_DESCRIPTION 등으로 구분 가능
+from app.services.llm_call_service import client as openai_client # 공용 OpenAI 클라이언트 (첫 호출 시 생성)
 
 def generate_detailed_prompt_text(description: str, snippet: Optional[str], module: Optional[str]) -> str:
     """
@@ -57,7 +54,7 @@ def get_detailed_description_agent(description: str, snippet: Optional[str], mod
     OpenAI API를 호출하여 상세 설명을 생성합니다.
     description_agent.ipynb의 get_detailed_description 함수 내용을 기반으로 합니다.
     """
-    client_instance = OpenAI(api_key=OPENAI_API_KEY)
+    client_instance = openai_client
     prompt_text = generate_detailed_prompt_text(description, snippet, module)
     try:
         response = client_instance.chat.completions.create(
@@ -1,8 +1,5 @@
 # app/services/importance_service.py
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY, LLM_MODEL
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+from app.services.llm_call_service import call_llm, LLMUnavailableError # 제공자 failover (assessment 정책)
 
 def generate_importance_prompt_text(description_name: str, description_content: str, target_task: str) -> str:
     # 청크 내용 넣기 생각해야함
@@ -51,17 +48,12 @@ def generate_importance_prompt_text(description_name: str, description_content:
 def get_importance_agent(description_name: str, description_content: str, target_task: str) -> str:
     prompt = generate_importance_prompt_text(description_name, description_content, target_task)
     try:
-        response = client.chat.completions.create(
-            model=LLM_MODEL,
-            messages=[
-                {"role": "system", "content": "당신은 소프트웨어 분석 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.4
-        )
-        content = response.choices[0].message.content or ""
+        content = call_llm("당신은 소프트웨어 분석 전문가입니다.", prompt, agent="assessment", temperature=0.4) or ""
         importance = next((line.split(":")[1].strip() for line in content.splitlines() if "중요도" in line), "중")
         return importance
+    except LLMUnavailableError:
+        # 모든 제공자 장애는 작업을 실패시켜 재개할 수 있도록 그대로 전달 ("Error" 값이 체크포인트에 남지 않도록)
+        raise
     except Exception as e:
         print(f"Error in get_importance_agent: {e}")
         return "Error"
\ No newline at end of file
@@ -0,0 +1,153 @@
+import json
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from app.core.config import SINGLE_PASS_MAX_TOKENS, SINGLE_PASS_MIN_SPLIT_CHARS
+from app.services.llm_call_service import call_llm
+
+# === 에이전트 1+2 통합: 청크 하나에서 7개 필드가 채워진 요구사항 목록을 한 번에 생성 ===
+# 문장 식별(에이전트 1) 후 문장마다 청크 전체를 다시 보내는 상세화(에이전트 2) 대신,
+# 청크당 한 번의 호출로 요구사항 배열을 받고 형식이 잘못된 항목만 개별 보정 호출합니다.
+
+
+class StructuredRequirement(BaseModel):
+    요구사항명: str = Field(min_length=1)
+    type: Literal["기능", "비기능"]
+    요구사항_상세설명: str = Field(alias="요구사항 상세설명", min_length=1)
+    대상업무: str = Field(min_length=1)
+    요건처리_상세: str = Field(alias="요건처리 상세", min_length=1)
+    RFP: int
+    출처_문장: str = Field(alias="출처 문장", min_length=1)
+
+    @field_validator("RFP", mode="before")
+    @classmethod
+    def parse_page(cls, value):
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value.strip())
+        return value
+
+    def to_output(self) -> Dict[str, Any]:
+        return self.model_dump(by_alias=True)
+
+
+CHUNK_SYSTEM_PROMPT = """
+당신은 RFP 문서를 분석하는 시스템 분석 전문가입니다. 주어진 '텍스트 청크'에서 시스템 구축과 관련된 요구사항(구체적인 행위, 기능, 제약조건 등)을 모두 찾아,
+각 요구사항마다 다음 7개 필드를 채운 JSON 객체를 만들고 {"requirements": [...]} 형태로만 응답합니다.
+
+1. "요구사항명": 핵심 내용을 명사 형태의 간결한 제목으로 표현합니다. (예: "사용자 인증 기능")
+2. "type": "기능"(시스템이 제공해야 하는 동작/서비스) 또는 "비기능"(성능, 보안, 운영 환경, 제약 조건 등 품질 속성) 중 하나.
+3. "요구사항 상세설명": 요구사항의 구체적인 내용, 목적, 범위를 2-4개의 완전한 문장으로 기술합니다.
+4. "대상업무": 요구사항이 반영될 주요 업무, 화면 또는 시스템 모듈을 명사형 문장 1개로 기술합니다. 정보가 부족하면 가장 가능성이 높은 대상 업무를 추론합니다.
+5. "요건처리 상세": 주요 구현 방안, 기술적 고려사항, 데이터 처리 흐름 또는 관리 포인트를 청크 내용과 일반적인 모범 사례를 바탕으로 2~3가지 구체적으로 기술합니다. "정보 없음" 같은 답변은 사용하지 않습니다.
+6. "RFP": 제공된 '페이지 번호'를 숫자로 기입합니다.
+7. "출처 문장": 요구사항이 나온 원문 문장을 청크에서 그대로 복사합니다. (요약/수정 금지)
+
+- 한 문장에 두 가지 요구사항이 있으면 나누어 작성합니다.
+- 설명, 배경, 일반적인 내용은 요구사항으로 만들지 않습니다.
+- 요구사항이 없으면 {"requirements": []}로 응답합니다.
+- 전체적으로 일관된 입도와 상세 수준을 유지하십시오.
+"""
+
+REPAIR_SYSTEM_PROMPT = """
+당신은 요구사항 JSON 데이터를 교정하는 도우미입니다. 주어진 요구사항 객체와 검증 오류를 보고,
+다음 7개 필드를 모두 올바르게 포함하는 단일 JSON 객체로만 응답합니다.
+"요구사항명"(문자열), "type"("기능" 또는 "비기능"), "요구사항 상세설명"(문자열), "대상업무"(문자열),
+"요건처리 상세"(문자열), "RFP"(정수), "출처 문장"(문자열, 원문 그대로).
+비어 있는 설명 필드는 '출처 문장'의 내용을 바탕으로 채웁니다.
+"""
+
+
+def _validation_summary(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+def repair_requirement_item(item: Dict[str, Any], error: ValidationError, page_number: int) -> Optional[Dict[str, Any]]:
+    """검증에 실패한 항목 하나만 다시 요청해 보정합니다. (청크 원문은 보내지 않음)"""
+    user_prompt = f"""
+    요구사항 객체: {json.dumps(item, ensure_ascii=False)}
+    검증 오류: {_validation_summary(error)}
+    페이지 번호: {page_number}
+    """
+    repaired = call_llm(REPAIR_SYSTEM_PROMPT, user_prompt, is_json_output=True, agent="requirement_refine")
+    if not isinstance(repaired, dict):
+        return None
+    try:
+        return StructuredRequirement.model_validate(repaired).to_output()
+    except ValidationError as e:
+        print(f"경고: 요구사항 보정 후에도 형식 오류가 남아 제외합니다: {_validation_summary(e)}")
+        return None
+
+
+def _split_chunk_text(text_chunk: str) -> List[str]:
+    """청크를 가운데에서 가장 가까운 문단/줄 경계(없으면 공백)로 나눕니다."""
+    middle = len(text_chunk) // 2
+    for separator in ("\n\n", "\n", " "):
+        before = text_chunk.rfind(separator, 0, middle)
+        after = text_chunk.find(separator, middle)
+        candidates = [i for i in (before, after) if i > 0]
+        if candidates:
+            cut = min(candidates, key=lambda i: abs(i - middle))
+            return [text_chunk[:cut], text_chunk[cut:]]
+    return [text_chunk[:middle], text_chunk[middle:]]
+
+
+def _request_chunk_requirements(text_chunk: str, page_number: int) -> Optional[List[Any]]:
+    """
+    청크의 요구사항 배열을 요청합니다. 응답이 max_tokens에서 잘리면 JSON 파싱에 실패하므로(None),
+    형식이 잘못된 응답과 함께 청크를 반으로 나눠 다시 요청합니다. 더 나눌 수 없으면 None을 반환합니다.
+    """
+    user_prompt = f"""
+    다음 텍스트 청크에서 요구사항을 모두 찾아 위 가이드라인에 따라 {{"requirements": [...]}} 형식으로 응답해주십시오.
+    페이지 번호: {page_number}
+
+    --- 텍스트 시작 ---
+    {text_chunk}
+    --- 텍스트 끝 ---
+    """
+    result_json = call_llm(
+        CHUNK_SYSTEM_PROMPT, user_prompt, is_json_output=True, agent="sentence_extraction", max_tokens=SINGLE_PASS_MAX_TOKENS
+    )
+    if isinstance(result_json, dict) and isinstance(result_json.get("requirements"), list):
+        return result_json["requirements"]
+
+    print(f"경고: 청크 요구사항 결과를 올바른 JSON 형식으로 받지 못했습니다. (응답 잘림 가능) 결과: {str(result_json)[:300]}")
+    if len(text_chunk) < SINGLE_PASS_MIN_SPLIT_CHARS * 2:
+        return None
+    items = []
+    for part in _split_chunk_text(text_chunk):
+        print(f"  청크를 나눠 다시 요청합니다. ({len(part)}자)")
+        part_items = _request_chunk_requirements(part, page_number)
+        if part_items is None:
+            return None
+        items.extend(part_items)
+    return items
+
+
+def extract_structured_requirements_agent(text_chunk: str, page_number: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    청크 하나를 한 번의 호출로 분석해 name_classify_describe_requirements_agent와 같은 7개 필드 형식의 요구사항 목록을 반환합니다.
+    응답이 잘리면 청크를 나눠 다시 요청하고, 그래도 결과를 받지 못하면 None을 반환합니다. (호출한 쪽에서 two_pass로 처리)
+    """
+    items = _request_chunk_requirements(text_chunk, page_number)
+    if items is None:
+        return None
+
+    requirements = []
+    repaired_count = 0
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            requirements.append(StructuredRequirement.model_validate(item).to_output())
+        except ValidationError as e:
+            if not str(item.get("출처 문장", "")).strip():
+                print(f"경고: 출처 문장이 없는 요구사항 항목을 제외합니다: {str(item)[:100]}")
+                continue
+            repaired = repair_requirement_item(item, e, page_number)
+            if repaired:
+                requirements.append(repaired)
+                repaired_count += 1
+    if repaired_count:
+        print(f"  형식 오류로 보정한 요구사항: {repaired_count}개")
+    return requirements
@@ -1,16 +1,13 @@
 # app/agents/meeting_analyzer_agent.py
 import json
 from typing import List, Dict, Any, Optional
-from openai import OpenAI # 또는 app.services.llm_call_service 사용
-from app.core.config import OPENAI_API_KEY, LLM_MODEL
+from app.core.config import LLM_MODEL
 from app.schemas.request import MeetingActionItem
-
-# client = OpenAI(api_key=OPENAI_API_KEY) # 모듈 레벨 또는 함수 내에서 생성
+from app.services.llm_call_service import client as openai_client
 
 def extract_actions_from_meeting_text(full_text: str) -> List[MeetingActionItem]:
     # 이전 답변에서 제안된 `extract_actions_from_meeting_agent` 함수 로직과 유사
-    # OpenAI 클라이언트 인스턴스를 외부에서 주입받거나 여기서 생성
-    client_instance = OpenAI(api_key=OPENAI_API_KEY) # 예시로 여기서 생성
+    client_instance = openai_client # 공용 클라이언트 (첫 호출 시 생성)
 
     prompt = f"""
 당신은 회의록을 분석하여 시스템 요구사항의 변경, 추가, 삭제와 관련된 논의 사항을 식별하는 전문가입니다.
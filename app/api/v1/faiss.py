@@ -1,17 +1,24 @@
 # app/api/v1/faiss_router.py
 import os
 import uuid
+from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Form, UploadFile, File
+from fastapi import APIRouter, HTTPException, Form, UploadFile, File
 from app.schemas.faiss import CreateFaissIndexRequest, FaissIndexCreationResponse
 from app.services.background_faiss_service import create_faiss_index_background_task
 from app.core.config import OUTPUT_JSON_DIR, FAISS_INDEX_DIR, METADATA_STORAGE_DIR
+from app.api.v2.jobs import job_store
+from app.services.job_scheduler_service import dispatch_job, job_handler, JobQueueFullError
 
 router = APIRouter()
 
+@job_handler("faiss")
+def run_faiss_job(payload: dict):
+    """스케줄러/워커에서 호출되는 FAISS 인덱스 생성 작업 핸들러"""
+    create_faiss_index_background_task(**payload)
+
 @router.post("/create-faiss-index", response_model=FaissIndexCreationResponse)
 async def endpoint_create_faiss_index(
-    background_tasks: BackgroundTasks,
     # 요청 본문을 Pydantic 모델로 받거나, Form 데이터로 받을 수 있습니다.
     # 여기서는 Form 데이터로 각 필드를 받도록 변경합니다.
     input_file: UploadFile = File(..., description="분석할 요구사항이 담긴 JSON 파일"),
@@ -48,13 +55,28 @@ async def endpoint_create_faiss_index(
     final_index_filename_with_ext = f"{final_index_name}.faiss"
     final_metadata_filename_with_ext = f"{final_metadata_name}.json"
 
-    background_tasks.add_task(
-        create_faiss_index_background_task,
-        task_id,
-        input_file_path, # 서버 내 파일명 전달
-        final_index_filename_with_ext,
-        final_metadata_filename_with_ext
-    )
+    job_store[task_id] = {
+        "job_name": "FAISS",
+        "status": "QUEUED",
+        "message": "FAISS 인덱스 생성 대기 중입니다.",
+        "result": None,
+        "error": None,
+        "start_time": datetime.now().isoformat()
+    }
+    try:
+        await dispatch_job(
+            task_id, "FAISS", "faiss",
+            {
+                "task_id": task_id,
+                "input_json_file_path": input_file_path, # 서버 내 파일명 전달
+                "output_index_name": final_index_filename_with_ext,
+                "output_metadata_name": final_metadata_filename_with_ext
+            },
+            size_hint=os.path.getsize(input_file_path)
+        )
+    except JobQueueFullError as e:
+        job_store.pop(task_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     
     # 응답에는 실제 저장될 예상 경로 제공
     expected_index_path = os.path.join(FAISS_INDEX_DIR, final_index_filename_with_ext)
@@ -1,15 +1,19 @@
 import os
-import io
+import uuid
+import tempfile
 import zipfile
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from app.services.mockup_service import run_mockup_generation_pipeline
+from app.services.mockup_service import arun_mockup_generation_pipeline, persist_mockup_zip, run_in_mockup_executor
+from app.services.http_client_service import post_with_retry
+from app.core.config import MOCKUP_ZIP_SPOOL_MB
 from urllib.parse import quote
 import json
-import httpx
-from fastapi import BackgroundTasks
+from app.api.v2.jobs import job_store, get_job, update_job_status
+from app.services.job_scheduler_service import dispatch_job, job_handler, get_queue_position, JobQueueFullError
 
 router = APIRouter()
 
@@ -29,67 +33,169 @@ class RequirementItem(BaseModel):
 class MockupRequest(BaseModel):
     callback_url: str
     requirements: List[RequirementItem]
-    output_folder_name: str = None
+    output_folder_name: Optional[str] = None
     project_id: int
     revision_count: int
+    incremental: Optional[bool] = None # None이면 MOCKUP_INCREMENTAL_ENABLED 설정을 따름
     
 
 @router.post("/generate-mockup")
 async def generate_mockup_endpoint(
-    request: MockupRequest,
-    background_tasks: BackgroundTasks
+    request: MockupRequest
 ):
+    job_id = str(uuid.uuid4())
     try:
         # 요구사항 데이터를 JSON 문자열로 변환 (UTF-8 인코딩 사용)
         input_data = json.dumps([req.dict() for req in request.requirements], ensure_ascii=False, indent=2)
         print(input_data)
 
-        # 비동기로 콜백 호출
-        background_tasks.add_task(
-            send_callback,
-            input_data=input_data,
-            request=request
+        job_store[job_id] = {
+            "job_name": "MOCKUP",
+            "status": "QUEUED",
+            "message": "목업 생성 대기 중입니다.",
+            "result": None,
+            "error": None,
+            "project_id": request.project_id,
+            "start_time": datetime.now().isoformat()
+        }
+        # 스케줄러를 통해 목업 생성 및 콜백 호출 (요구사항 수가 적은 작업 우선)
+        scheduled = await dispatch_job(
+            job_id, "MOCKUP", "mockup",
+            {"input_data": input_data, "request": request.model_dump(), "job_id": job_id},
+            size_hint=len(request.requirements),
+            project_id=request.project_id
         )
-        return {"message": "목업 생성 및 콜백 요청이 시작되었습니다."}
+        return {
+            "message": "목업 생성 및 콜백 요청이 시작되었습니다.",
+            "job_id": job_id,
+            "status": scheduled["status"],
+            "queue_position": scheduled["queue_position"]
+        }
+    except JobQueueFullError as e:
+        job_store.pop(job_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "60"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"목업 생성 실패: {str(e)}")
     
-async def send_callback(input_data: str, request: MockupRequest):
-    zip_buffer = io.BytesIO()
+@job_handler("mockup")
+async def run_mockup_job(payload: dict):
+    """스케줄러/워커에서 호출되는 목업 생성 작업 핸들러"""
+    await send_callback(input_data=payload["input_data"], request=MockupRequest(**payload["request"]), job_id=payload.get("job_id"))
+
+@router.get("/{job_id}/status")
+async def get_mockup_status(job_id: str):
+    """
+    목업 생성 상태 조회
+    COMPLETED 이후 zip_available 이 true 이면 GET /mockup/{job_id}/zip 으로 결과를 내려받을 수 있습니다.
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    result = job.get("result") if isinstance(job.get("result"), dict) else {}
+    return {
+        "job_id": job_id,
+        "state": job["status"],
+        "message": job.get("message", ""),
+        "queue_position": get_queue_position(job_id),
+        "zip_available": bool(result.get("zip_path")),
+        "callback_delivered": result.get("callback_delivered"),
+    }
+
+@router.get("/{job_id}/zip")
+async def download_mockup_zip(job_id: str):
+    """
+    완료된 목업 작업의 ZIP 파일을 내려받습니다. (콜백 전송이 실패했을 때의 pull 방식 대안)
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in ("QUEUED", "PROCESSING"):
+        raise HTTPException(status_code=409, detail="목업이 아직 생성 중입니다.")
+    result = job.get("result") or {}
+    zip_path = result.get("zip_path") if isinstance(result, dict) else None
+    if not zip_path or not os.path.exists(zip_path):
+        raise HTTPException(status_code=404, detail="내려받을 수 있는 목업 ZIP이 없습니다. (생성 실패 또는 보관 기간 만료)")
+    return FileResponse(zip_path, media_type="application/zip", filename=result.get("zip_filename") or os.path.basename(zip_path))
+
+async def send_callback(input_data: str, request: MockupRequest, job_id: Optional[str] = None):
+    """
+    목업을 생성해 ZIP으로 묶고 callback_url로 전송합니다.
+    - 페이지가 완성되는 대로 ZIP에 기록하며, ZIP이 MOCKUP_ZIP_SPOOL_MB를 넘으면 메모리 대신 임시 파일에 씁니다.
+    - 기획 LLM 호출, ZIP 압축/기록 등 동기 작업은 목업 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+    - 완성된 ZIP은 MOCKUP_ZIP_DIR에 저장되어 스트리밍 multipart로 업로드되고, GET /mockup/{job_id}/zip 으로도 제공됩니다.
+    - 콜백은 공용 HTTP 클라이언트로 보내며 실패 시 백오프 후 재시도합니다. (모든 시도에 같은 Idempotency-Key)
+    """
+    job_id = job_id or str(uuid.uuid4())
     status = "SUCCESS"
     error_message = None
-    try:
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            mockup_files = run_mockup_generation_pipeline(input_data, request.output_folder_name)
-            for file_path, file_content in mockup_files:
-                zip_file.writestr(file_path, file_content.encode('utf-8'))
-        zip_buffer.seek(0)
-        filename = f"mockup_{request.output_folder_name or 'result'}.zip"
-    except Exception as e:
-        status = "FAILED"
-        error_message = str(e)
-        print(f"[MOCKUP] 목업 생성 실패: {error_message}")
-        # 실패 시 zip_buffer를 비워서 전송
-        zip_buffer = io.BytesIO()
-        filename = f"mockup_{request.output_folder_name or 'result'}_failed.zip"
-    
+    zip_path = None
+    filename = f"mockup_{request.output_folder_name or 'result'}.zip"
+    with tempfile.SpooledTemporaryFile(max_size=int(MOCKUP_ZIP_SPOOL_MB * 1024 * 1024)) as zip_spool:
+        try:
+            with zipfile.ZipFile(zip_spool, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                # 페이지가 완성되는 대로 (기획 순서를 유지하며) ZIP에 기록
+                await arun_mockup_generation_pipeline(
+                    input_data,
+                    request.output_folder_name,
+                    on_file=lambda file_path, file_content: run_in_mockup_executor(zip_file.writestr, file_path, file_content.encode('utf-8')),
+                    project_id=request.project_id,
+                    revision_count=request.revision_count,
+                    incremental=request.incremental
+                )
+            zip_path = await run_in_mockup_executor(persist_mockup_zip, zip_spool, job_id)
+        except Exception as e:
+            status = "FAILED"
+            error_message = str(e)
+            print(f"[MOCKUP] 목업 생성 실패: {error_message}")
+            # 실패 시 빈 zip 파일명으로 전송
+            filename = f"mockup_{request.output_folder_name or 'result'}_failed.zip"
+
     encoded_filename = quote(filename.encode('utf-8'))
+    data = {
+        "revisionCount": str(request.revision_count),
+        "status": status,
+    }
+    if error_message:
+        data["errorMessage"] = error_message
+    params = {"projectId": request.project_id}
+
+    def build_request():
+        # 재시도마다 파일을 처음부터 다시 읽도록 새로 연다 (httpx가 청크 단위로 스트리밍 전송)
+        zip_body = open(zip_path, "rb") if zip_path else b""
+        opened_files.append(zip_body)
+        return {"params": params, "data": data, "files": {"mockUpZip": (encoded_filename, zip_body, "application/zip")}}
+
+    opened_files = []
+    delivered = False
+    status_code = None
     print(f"[MOCKUP] 콜백 URL로 zip 파일 전송 시작: {request.callback_url}")
-    async with httpx.AsyncClient() as client:
-        files = {
-            "mockUpZip": (encoded_filename, zip_buffer.getvalue(), "application/zip"),
-        }
-        data = {
-            "revisionCount": str(request.revision_count),
-            "status": status,
+    try:
+        response = await post_with_retry(
+            request.callback_url,
+            idempotency_key=f"mockup-{request.project_id}-{request.revision_count}-{job_id}",
+            build_request=build_request,
+            label="MOCKUP 콜백"
+        )
+        status_code = response.status_code
+        delivered = response.is_success
+        print(f"[MOCKUP] 콜백 요청 완료. 응답 코드: {response.status_code}")
+    except Exception as e:
+        print(f"[MOCKUP] 콜백 요청 실패: {e}")
+    finally:
+        for opened in opened_files:
+            if hasattr(opened, "close"):
+                opened.close()
+
+    if job_id in job_store:
+        result = {
+            "zip_path": zip_path,
+            "zip_filename": filename,
+            "zip_size": os.path.getsize(zip_path) if zip_path else 0,
+            "callback_delivered": delivered,
+            "callback_status_code": status_code,
         }
-        if error_message:
-            data["errorMessage"] = error_message
-        params = {"projectId": request.project_id}
-        try:
-            response = await client.post(request.callback_url, params=params, data=data, files=files, timeout=60)
-            print(f"[MOCKUP] 콜백 요청 완료. 응답 코드: {response.status_code}")
-        except Exception as e:
-            print(f"[MOCKUP] 콜백 요청 실패: {e}")
-            pass
-    
\ No newline at end of file
+        if status == "FAILED":
+            update_job_status(job_id, "FAILED", result=result, error=error_message, message=f"목업 생성 실패: {error_message}")
+        else:
+            message = "목업 생성 및 콜백 전송이 완료되었습니다." if delivered else "목업은 생성되었지만 콜백 전송에 실패했습니다. GET /mockup/{job_id}/zip 으로 내려받을 수 있습니다."
+            update_job_status(job_id, "COMPLETED", result=result, message=message)
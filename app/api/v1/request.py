@@ -2,11 +2,14 @@
 import os
 import json
 import uuid
+from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Form, UploadFile, File
+from fastapi import APIRouter, HTTPException, Form, UploadFile, File
 from app.schemas.request import ProcessMeetingRequest, ProcessMeetingResponse, ChangeRequestResultItem
 from app.services.change_request_service import process_meeting_for_change_requests
 from app.core.config import INPUT_DIR, FAISS_INDEX_DIR, METADATA_STORAGE_DIR
+from app.api.v2.jobs import job_store
+from app.services.job_scheduler_service import dispatch_job, job_handler, JobQueueFullError
 
 router = APIRouter()
 
@@ -36,9 +39,13 @@ def process_meeting_background_task(
         print(f"백그라운드 회의록 분석 중 오류 (Task ID: {task_id}): {e}")
         # TODO: 작업 실패 상태 기록
 
+@job_handler("meeting")
+def run_meeting_job(payload: dict):
+    """스케줄러/워커에서 호출되는 회의록 분석 작업 핸들러"""
+    process_meeting_background_task(**payload)
+
 @router.post("/process-meeting-minutes", response_model=ProcessMeetingResponse)
 async def endpoint_process_meeting_minutes(
-    background_tasks: BackgroundTasks,
     meeting_file: UploadFile = File(..., description="분석할 회의록 파일 (txt, md 등 텍스트 파일)"),
     faiss_index_name: str = Form(..., description="사용할 FAISS 인덱스 파일명 (예: existing_requirements.faiss)"),
     metadata_name: str = Form(..., description="사용할 메타데이터 파일명 (예: existing_requirements_metadata.json)"),
@@ -63,14 +70,29 @@ async def endpoint_process_meeting_minutes(
 
     task_id = str(uuid.uuid4())
 
-    background_tasks.add_task(
-        process_meeting_background_task,
-        task_id,
-        meeting_content_text,
-        faiss_index_name,
-        metadata_name,
-        top_k
-    )
+    job_store[task_id] = {
+        "job_name": "REQUEST",
+        "status": "QUEUED",
+        "message": "회의록 분석 대기 중입니다.",
+        "result": None,
+        "error": None,
+        "start_time": datetime.now().isoformat()
+    }
+    try:
+        await dispatch_job(
+            task_id, "REQUEST", "meeting",
+            {
+                "task_id": task_id,
+                "meeting_content": meeting_content_text,
+                "faiss_index_name": faiss_index_name,
+                "metadata_name": metadata_name,
+                "top_k": top_k
+            },
+            size_hint=len(meeting_content_text)
+        )
+    except JobQueueFullError as e:
+        job_store.pop(task_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
 
     return ProcessMeetingResponse(
         message="회의록 분석 및 변경 요청 추출 작업이 백그라운드에서 시작되었습니다.",
@@ -1,10 +1,11 @@
 import os
 import json
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Path
 from fastapi.responses import Response
 from app.core.config import OUTPUT_JSON_DIR
+from app.services.job_progress_service import job_progress
 
 router = APIRouter(
     prefix="/jobs",
@@ -15,6 +16,29 @@ router = APIRouter(
 # In-memory job store (in production, use Redis or a database)
 job_store: Dict[str, Dict[str, Any]] = {}
 
+# Shared job state backend (set to the SQLite job queue in worker mode)
+job_state_backend = None
+
+def set_job_state_backend(backend):
+    """Share job state with other processes (API <-> worker) through the given backend"""
+    global job_state_backend
+    job_state_backend = backend
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return the latest job entry, preferring the shared backend when configured"""
+    if job_state_backend is not None:
+        job = job_state_backend.load_job(job_id)
+        if job is not None:
+            return job
+    return job_store.get(job_id)
+
+def list_jobs() -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (job_id, job) pairs from the local store and the shared backend"""
+    jobs = dict(job_store)
+    if job_state_backend is not None:
+        jobs.update(job_state_backend.list_jobs())
+    return list(jobs.items())
+
 def create_job() -> str:
     """Create a new job and return its ID"""
     job_id = str(uuid.uuid4())
@@ -33,6 +57,11 @@ def update_job_status(job_id: str, status: str, result: Any = None, error: str =
         raise HTTPException(status_code=404, detail="Job not found")
     
     current_job = job_store[job_id]
+    # 취소된 작업은 이후 백그라운드 처리 결과로 상태를 덮어쓰지 않음
+    if current_job.get("status") == "CANCELLED" and status != "CANCELLED":
+        print(f"Job {job_id} is cancelled, ignoring status update: {status}")
+        return current_job
+
     current_job.update({
         "status": status,
         "result": result,
@@ -42,6 +71,12 @@ def update_job_status(job_id: str, status: str, result: Any = None, error: str =
     
     if message:
         current_job["message"] = message
+
+    # SSE/WebSocket 구독자에게 상태 변경 알림
+    job_progress.publish_status(job_id, status, current_job.get("message"))
+
+    if job_state_backend is not None:
+        job_state_backend.save_job_state(job_id, current_job)
     
     # 상태 업데이트 로깅
     print(f"Job {job_id} status updated: {status}, message: {message}, attempts: {current_job['attempts']}")
@@ -50,16 +85,16 @@ def update_job_status(job_id: str, status: str, result: Any = None, error: str =
 
 @router.get("/{job_id}/status", 
     summary="Get job status",
-    description="Get the current status of a job by its ID. Returns the job status which can be 'PROCESSING', 'COMPLETED', or 'FAILED'.",
+    description="Get the current status of a job by its ID. Returns the job status which can be 'QUEUED', 'PROCESSING', 'COMPLETED', 'FAILED', or 'CANCELLED'.",
     response_description="Returns the job ID and its current status")
 async def get_job_status(
     job_id: str = Path(..., description="The ID of the job to check status")
 ):
     """Get the status of a job"""
-    if job_id not in job_store:
+    job = get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = job_store[job_id]
     print(f"Job {job_id} status check: {job['status']}, attempts: {job.get('attempts', 0)}")
     
     return {
@@ -77,18 +112,20 @@ async def get_job_result(
     job_id: str = Path(..., description="The ID of the job to get results")
 ):
     """Get the result of a completed job"""
-    if job_id not in job_store:
+    job = get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = job_store[job_id]
-    
-    if job["status"] == "PROCESSING":
+    if job["status"] in ("QUEUED", "PROCESSING"):
         return {
-            "status": "PROCESSING",
+            "status": job["status"],
             "message": "The job is still being processed. Please check back later.",
             "attempts": job.get("attempts", 0)
         }
     
+    if job["status"] == "CANCELLED":
+        raise HTTPException(status_code=409, detail="The job was cancelled.")
+
     if job["status"] == "FAILED":
         raise HTTPException(status_code=500, detail=job["error"])
     
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
 from fastapi.concurrency import run_in_threadpool
 from concurrent.futures import ThreadPoolExecutor
 from app.schemas.requirement import ProcessResponse
-from app.graph.rfp_graph import get_rfp_graph_app
+from app.graph.rfp_graph import compiled_rfp_app
 from app.services.background_processing_service import process_requirements_in_memory
 from app.core.config import OPENAI_API_KEY, LLM_MODEL
 from app.agents.srs.requirements_extract_agent import extract_requirement_sentences_agent
@@ -16,7 +16,7 @@ from app.core.config import INPUT_DIR, OUTPUT_JSON_DIR, CHUNK_SIZE, CHUNK_OVERLA
 from app.api.v2.jobs import job_store, update_job_status
 
 router = APIRouter()
-compiled_app = get_rfp_graph_app()
+compiled_app = compiled_rfp_app # 첫 invoke 시 컴파일되는 지연 프록시 (get_rfp_graph_app() 참고)
 
 # 전역 스레드 풀 생성
 thread_pool = ThreadPoolExecutor(max_workers=4)
@@ -7,11 +7,14 @@ from datetime import datetime
 from app.core.config import OUTPUT_ASIS_DIR
 from app.models.document import Document
 from app.repositories.document_repository import DocumentRepository
-from app.core.mysql_config import get_mysql_db
+from app.core.mysql_config import job_session_scope
 
 # 수정된 서비스 함수 import
-from app.services.background_asis_services import run_as_is_analysis_and_return_bytes
+from app.services.background_asis_services import run_as_is_analysis_to_file
 from app.api.v2.jobs import job_store, update_job_status
+from app.services.document_id_service import document_id_allocator
+from typing import Any, Dict
+from app.services.job_scheduler_service import dispatch_job, job_handler, JobQueueFullError
 
 router = APIRouter()
 
@@ -34,17 +37,18 @@ async def process_as_is_background(pdf_content: bytes, job_id: str):
         filename = f"ASIS_RESULT_{project_id}_{timestamp}.pdf"
         output_pdf_path = upload_dir / filename
 
-        # 2. 분석 함수를 호출하여 파일 저장 및 바이트 반환을 동시에 수행
+        # 2. 분석 함수를 호출하여 최종 경로에 보고서를 한 번만 저장 (크기/체크섬 반환)
         print(f"Job[{job_id}]: 백그라운드 분석/저장 시작...")
-        result_pdf_bytes = await asyncio.to_thread(
-            run_as_is_analysis_and_return_bytes, 
+        report_file = await asyncio.to_thread(
+            run_as_is_analysis_to_file, 
             pdf_content,
-            output_pdf_path  # 생성한 파일 경로 전달
+            output_pdf_path,  # 생성한 파일 경로 전달
+            job_id
         )
 
         # 3. DB에 메타데이터 기록
         saved_doc_info = None
-        async for db in get_mysql_db():
+        async with job_session_scope(job_id) as db:
             document_repository = DocumentRepository(db)
             # ★★★ 변경점: 파일 저장 로직이 없는 DB 기록 함수 호출 ★★★
             saved_doc = await create_document_record(
@@ -55,15 +59,21 @@ async def process_as_is_background(pdf_content: bytes, job_id: str):
                 document_repository=document_repository
             )
             saved_doc_info = saved_doc.to_dict()
-            break
         
         # 4. Job 완료 상태 업데이트
-        # result에는 DB 저장 정보만 포함 (바이트는 너무 크므로 제외)
+        # result에는 DB 저장 정보와 보고서 파일 정보만 포함 (다운로드는 GET /jobs/as-is/{job_id}/report?format= 에서 파일로 제공)
         update_job_status(
             job_id=job_id,
             status="COMPLETED",
             message="As-Is 분석 및 파일 저장이 완료되었습니다.",
-            result={"saved_document": saved_doc_info}
+            result={
+                "saved_document": saved_doc_info,
+                "report_path": report_file["path"],
+                "report_filename": filename,
+                "report_size": report_file["size"],
+                "report_sha256": report_file["sha256"],
+                "report_markdown_path": report_file["markdown_path"],
+            }
         )
         
     except Exception as e:
@@ -71,13 +81,19 @@ async def process_as_is_background(pdf_content: bytes, job_id: str):
         update_job_status(job_id=job_id, status="FAILED", message=f"As-Is 분석 실패: {e}", error=str(e))
 
 
+@job_handler("asis")
+async def run_as_is_job(payload: Dict[str, Any]):
+    """스케줄러/워커에서 호출되는 As-Is 작업 핸들러"""
+    await process_as_is_background(payload["pdf_content"], payload["job_id"])
+
+
 # --- DB 저장 유틸리티 (수정됨) ---
 async def create_document_record(filename: str, file_path: str, project_id: int, member_id: int, document_repository: DocumentRepository) -> Document:
     """
     (수정됨) 파일 저장 로직 없이, 파일 메타데이터를 DB에 기록만 합니다.
     """
     try:
-        new_doc_id = await generate_doc_id("ASIS", document_repository)
+        new_doc_id = await generate_doc_id("ASIS")
         doc = Document(
             doc_id=new_doc_id,
             name=filename,
@@ -94,24 +110,12 @@ async def create_document_record(filename: str, file_path: str, project_id: int,
 # (generate_doc_id, start_as_is_analysis 함수는 이전과 동일하게 사용)
 # ... 이하 기존 `asis_db.py`의 다른 함수들 ...
 
-async def generate_doc_id(type_prefix: str, document_repository: DocumentRepository) -> str:
-    """Generate an incremental document ID with the given prefix"""
+async def generate_doc_id(type_prefix: str) -> str:
+    """
+    접두사별 문서 ID를 발급합니다. (시퀀스 테이블 기반, 동시 작업/레플리카 간 중복 없음)
+    """
     try:
-        # Find the latest document ID with the given prefix
-        doc_id = await document_repository.find_latest_doc_id_by_prefix(type_prefix)
-        next_number = 1
-
-        if doc_id:
-            # Extract the number part from the latest ID (e.g., "ASIS-000123" -> "000123")
-            try:
-                number_part = doc_id.split("-")[1]
-                print(f"Number part: {number_part}")
-                next_number = int(number_part) + 1
-            except (IndexError, ValueError) as e:
-                raise ValueError(f"Invalid docId format: {doc_id}")
-
-        # Format the new ID with leading zeros
-        return f"{type_prefix}-{next_number:06d}"
+        return await document_id_allocator.allocate(type_prefix)
     except Exception as e:
         raise Exception(f"Failed to generate document ID: {str(e)}")
     
@@ -133,8 +137,8 @@ async def start_as_is_analysis(
         
         job_store[job_id] = {
             "job_name": "ASIS",
-            "status": "PROCESSING",
-            "message": "As-Is 분석을 시작합니다.",
+            "status": "QUEUED",
+            "message": "As-Is 분석 대기 중입니다.",
             "result": None,
             "error": None,
             "project_id": project_id,
@@ -144,13 +148,21 @@ async def start_as_is_analysis(
             "end_time": None
         }
         
-        asyncio.create_task(process_as_is_background(pdf_content, job_id))
+        scheduled = await dispatch_job(
+            job_id, "ASIS", "asis",
+            {"pdf_content": pdf_content, "job_id": job_id},
+            size_hint=len(pdf_content), project_id=project_id, member_id=member_id
+        )
         
         return {
             "job_id": job_id,
-            "status": "PROCESSING",
-            "message": "As-Is 분석 작업이 시작되었습니다. Job ID로 상태를 확인하세요."
+            "status": scheduled["status"],
+            "queue_position": scheduled["queue_position"],
+            "message": "As-Is 분석 작업이 시작되었습니다. Job ID로 상태를 확인하세요." if scheduled["status"] == "PROCESSING" else "As-Is 분석 작업이 대기열에 등록되었습니다. Job ID로 상태를 확인하세요."
         }
     
+    except JobQueueFullError as e:
+        job_store.pop(job_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"작업 시작에 실패했습니다: {str(e)}")
\ No newline at end of file
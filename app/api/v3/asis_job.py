@@ -1,9 +1,13 @@
+import os
 import uuid
 import asyncio
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from io import BytesIO
-from app.api.v2.jobs import job_store
+from pathlib import Path
+from app.api.v2.jobs import get_job, list_jobs
+from app.services.job_scheduler_service import get_queue_position
+from app.services.report_renderer_service import render_report, report_file_response, supported_formats
 
 router = APIRouter()
 
@@ -12,9 +16,9 @@ async def get_as_is_status(job_id: str):
     """
     As-Is 분석 상태 조회
     """
-    if job_id not in job_store:
+    job = get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    job = job_store[job_id]
     if job["status"] == "COMPLETED" and isinstance(job["result"], bytes):
         pdf_buffer = BytesIO(job["result"])
         return StreamingResponse(
@@ -24,11 +28,50 @@ async def get_as_is_status(job_id: str):
                 "Content-Disposition": f"attachment; filename=as_is_analysis_report.pdf"
             }
         )
-    return {
+    result = job.get("result")
+    response = {
         "job_id": job_id,
         "state": job["status"],
         "message": job.get("message", ""),
+        "queue_position": get_queue_position(job_id),
     }
+    if job["status"] == "COMPLETED" and isinstance(result, dict) and result.get("report_path"):
+        response["report"] = {
+            "filename": result.get("report_filename"),
+            "size": result.get("report_size"),
+            "sha256": result.get("report_sha256"),
+            "formats": supported_formats("markdown"),
+        }
+    return response
+
+@router.get("/as-is/{job_id}/report")
+async def download_as_is_report(job_id: str, request: Request, format: str = "pdf"):
+    """
+    완료된 As-Is 분석 보고서를 내려받습니다. format: pdf(기본), docx, html, md
+    PDF는 분석 시 저장된 파일을, 다른 형식은 저장된 보고서 Markdown을 렌더링(캐시)해 파일로 제공합니다.
+    Range 요청(이어받기/부분 요청)을 지원하며, ETag가 If-None-Match와 일치하면 304를 반환합니다.
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"보고서가 아직 준비되지 않았습니다. (상태: {job['status']})")
+    result = job.get("result") if isinstance(job.get("result"), dict) else {}
+    report_path = result.get("report_path")
+    filename_stem = os.path.splitext(result.get("report_filename") or f"as_is_analysis_{job_id}")[0]
+    if_none_match = request.headers.get("if-none-match")
+
+    if format == "pdf" and report_path and os.path.exists(report_path):
+        return report_file_response(report_path, "application/pdf", f"{filename_stem}.pdf", result.get("report_sha256"), if_none_match)
+
+    markdown_path = result.get("report_markdown_path")
+    if not markdown_path or not os.path.exists(markdown_path):
+        raise HTTPException(status_code=404, detail="내려받을 수 있는 As-Is 보고서가 없습니다.")
+    if format not in supported_formats("markdown"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (가능한 형식: {', '.join(supported_formats('markdown'))})")
+    markdown = await asyncio.to_thread(Path(markdown_path).read_text, encoding="utf-8")
+    rendered = await asyncio.to_thread(render_report, format, markdown=markdown)
+    return report_file_response(rendered["path"], rendered["media_type"], f"{filename_stem}.{rendered['extension']}", rendered["etag"], if_none_match)
 
 @router.get("/as-is/latest-status")
 async def get_latest_as_is_status_by_project_member(
@@ -41,7 +84,7 @@ async def get_latest_as_is_status_by_project_member(
     """
     filtered_jobs = [
         (job_id, job)
-        for job_id, job in job_store.items()
+        for job_id, job in list_jobs()
         if job.get("project_id") == project_id and job.get("member_id") == member_id and job.get("job_name", "ASIS") == job_name and "start_time" in job
     ]
     if not filtered_jobs:
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from app.core.config import READINESS_FAIL_ON_OVERLOAD
+from app.services.health_service import liveness_report, readiness_report
+
+router = APIRouter()
+
+@router.get("/ready")
+async def readiness(refresh: bool = Query(False, description="캐시를 무시하고 다시 점검")):
+    """
+    readiness 프로브
+    임베딩 모델, DB 연결, 작업 큐 등 하위 시스템 점검 결과를 종합해 요청을 받을 수 있으면 200, 아니면 503을 반환합니다.
+    shed_load 가 true 이면 과부하 상태이므로 X-Load-Shed 헤더를 붙입니다. (READINESS_FAIL_ON_OVERLOAD 이면 503)
+    """
+    report = await readiness_report(force=refresh)
+    ready = report["ready"] and not (READINESS_FAIL_ON_OVERLOAD and report["shed_load"])
+    headers = {"X-Load-Shed": "1"} if report["shed_load"] else {}
+    return JSONResponse(status_code=200 if ready else 503, content=report, headers=headers)
+
+@router.get("/live")
+async def liveness():
+    """
+    liveness 프로브
+    이벤트 루프가 응답하는지만 확인합니다. DB/LLM 장애로 파드가 재시작되지 않도록 외부 의존성은 점검하지 않습니다.
+    """
+    return liveness_report()
@@ -0,0 +1,180 @@
+import json
+import asyncio
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.api.v2.jobs import job_store, get_job
+from app.services.job_scheduler_service import (
+    cancel_job as request_job_cancel,
+    get_queue_stats as read_queue_stats,
+    dispatch_job,
+    JobQueueFullError,
+    JobNotCancellableError,
+)
+from app.services.checkpoint_service import JobCheckpoint
+from app.services.job_progress_service import job_progress
+from app.services.job_result_buffer_service import job_result_buffer
+from app.core.config import JOB_RESULT_PAGE_MAX_LIMIT
+
+router = APIRouter()
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    대기 중이거나 실행 중인 작업을 취소합니다.
+    """
+    job = await asyncio.to_thread(get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+        raise HTTPException(status_code=409, detail=f"이미 종료된 작업입니다. (상태: {job['status']})")
+
+    try:
+        cancelled = await request_job_cancel(job_id)
+    except JobNotCancellableError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not cancelled:
+        raise HTTPException(status_code=409, detail="작업을 취소할 수 없습니다.")
+    job = await asyncio.to_thread(get_job, job_id)
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "message": job.get("message", "")
+    }
+
+@router.post("/{job_id}/resume")
+async def resume_job(job_id: str):
+    """
+    실패/취소되었거나 서버 재시작으로 중단된 SRS 작업을 마지막으로 완료된 단계(체크포인트)부터 다시 실행합니다.
+    """
+    checkpoint = JobCheckpoint(job_id)
+    meta = await asyncio.to_thread(checkpoint.load_meta)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="재개할 수 있는 작업 체크포인트가 없습니다.")
+
+    job = await asyncio.to_thread(get_job, job_id)
+    if job is not None and job["status"] in ("QUEUED", "PROCESSING", "COMPLETED"):
+        raise HTTPException(status_code=409, detail=f"재개할 수 없는 작업 상태입니다. (상태: {job['status']})")
+
+    progress = await asyncio.to_thread(checkpoint.summary)
+    resumed_from = await asyncio.to_thread(checkpoint.last_completed_stage)
+    job_store[job_id] = {
+        **meta,
+        "status": "QUEUED",
+        "message": "요구사항 분석 재개 대기 중입니다.",
+        "result": None,
+        "error": None,
+        "resumed_at": datetime.now().isoformat(),
+        "resumed_from": resumed_from,
+    }
+    try:
+        scheduled = await dispatch_job(
+            job_id, "SRS", "srs",
+            {"pdf_content": None, "job_id": job_id, "original_filename": meta["original_filename"], "extraction_mode": meta.get("extraction_mode")},
+            project_id=meta.get("project_id"), member_id=meta.get("member_id")
+        )
+    except JobQueueFullError as e:
+        job_store.pop(job_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        "job_id": job_id,
+        "status": scheduled["status"],
+        "queue_position": scheduled["queue_position"],
+        "completed_stages": progress["completed_stages"],
+        "partial_items": progress["partial_items"],
+        "message": "마지막으로 완료된 단계부터 요구사항 분석을 재개합니다."
+    }
+
+@router.get("/{job_id}/requirements")
+async def get_job_requirements(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="가져올 첫 항목의 위치 (이전 응답의 next_offset을 커서로 사용)"),
+    limit: int = Query(50, ge=1, le=JOB_RESULT_PAGE_MAX_LIMIT),
+):
+    """
+    처리 중이거나 완료된 SRS 작업에서 평가가 끝난 요구사항을 완료 순서대로 페이지 단위로 반환합니다.
+    작업이 끝나기 전에도 먼저 완료된 요구사항부터 검토할 수 있으며, next_offset으로 새로 추가된 항목만 이어서 받습니다.
+    """
+    job = await asyncio.to_thread(get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    page = await asyncio.to_thread(job_result_buffer.read, job_id, offset, limit)
+    progress = job.get("progress") or {}
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "offset": offset,
+        "limit": limit,
+        "items": page["items"],
+        "next_offset": page["next_offset"],
+        "buffered": page["buffered"],
+        "total_expected": progress.get("total") if progress.get("stage") == "assessing" else (page["buffered"] if page["complete"] else None),
+        "complete": page["complete"],
+        "has_more": page["next_offset"] < page["buffered"] or not (page["complete"] or job["status"] in ("COMPLETED", "FAILED", "CANCELLED")),
+    }
+
+@router.get("/queues/stats")
+async def get_queue_stats():
+    """
+    작업 유형별 큐의 워커 수와 대기/실행 중인 작업 수를 반환합니다.
+    """
+    return await asyncio.to_thread(read_queue_stats)
+
+def _format_sse(event: Optional[dict]) -> str:
+    if event is None:
+        return ": keep-alive\n\n"
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event['data'], ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(default=None)):
+    """
+    작업 진행 상황을 Server-Sent Events로 전달합니다.
+    단계(stage), 처리 개수(done/total), 생성된 요구사항 수, 예상 남은 시간과 부분 결과(requirements 이벤트)를 보내며,
+    작업이 종료되면 마지막 status 이벤트를 보낸 뒤 연결을 닫습니다.
+    재접속 시 Last-Event-ID 헤더를 보내면 그 이후의 이벤트부터 다시 받습니다.
+    """
+    if await asyncio.to_thread(get_job, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        last_id = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        last_id = 0
+
+    async def event_stream():
+        async for event in job_progress.iter_events(job_id, last_id):
+            yield _format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str):
+    """
+    작업 진행 이벤트를 WebSocket으로 전달합니다. (SSE와 같은 이벤트를 {"id", "event", "data"} JSON으로 전송)
+    쿼리 파라미터 last_event_id로 재접속 시 이어받을 수 있습니다.
+    """
+    await websocket.accept()
+    try:
+        last_id = int(websocket.query_params.get("last_event_id") or 0)
+    except ValueError:
+        last_id = 0
+    try:
+        async for event in job_progress.iter_events(job_id, last_id):
+            if event is None:
+                await websocket.send_json({"event": "keep-alive"})
+            else:
+                await websocket.send_text(json.dumps(event, ensure_ascii=False, default=str))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
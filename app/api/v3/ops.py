@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Query
+from app.core.mysql_config import db_pool_status
+from app.core.lazy import lazy_status
+from app.services.circuit_breaker_service import circuit_breaker_status
+from app.services.llm_hedging_service import hedge_stats
+from app.services.loop_monitor_service import loop_monitor
+
+router = APIRouter()
+
+@router.get("/db-pool")
+async def get_db_pool_status():
+    """
+    DB 커넥션 풀 상태 조회
+    checked_out/overflow 가 풀 한도에 자주 닿거나 wait_avg_ms, timeouts 가 늘면 DB_POOL_SIZE/DB_MAX_OVERFLOW 를 조정합니다.
+    """
+    return db_pool_status()
+
+@router.get("/lazy-init")
+async def get_lazy_init_status():
+    """
+    지연 초기화 자원(SDK 클라이언트, 임베딩 모델, 그래프 등)의 초기화 여부와 소요 시간 조회
+    warming_up 이 true 이면 시작 후 백그라운드 워밍업이 진행 중입니다.
+    """
+    return lazy_status()
+
+@router.get("/circuit-breakers")
+async def get_circuit_breaker_status():
+    """
+    LLM 제공자별 서킷 브레이커 상태 조회 (closed / open / half_open)
+    open 상태의 제공자는 retry_in_seconds 동안 호출하지 않고 LLM_FAILOVER_POLICY의 다음 제공자를 사용합니다.
+    """
+    return circuit_breaker_status()
+
+@router.get("/llm-latency")
+async def get_llm_latency_status():
+    """
+    에이전트별 LLM 호출 지연(p50/p95)과 hedged request 지표 조회
+    win_rate 는 중복 요청이 기본 요청보다 먼저 유효한 응답을 받은 비율이며, budget_skipped 가 늘면 LLM_HEDGE_BUDGET_RATIO 를 조정합니다.
+    """
+    return hedge_stats.snapshot()
+
+@router.get("/event-loop")
+async def get_event_loop_status(stacks: bool = Query(True, description="최근 지연의 스택 포함 여부")):
+    """
+    이벤트 루프 지연(lag) 분포와 루프를 EVENT_LOOP_LAG_WARN_MS 이상 막은 지연(stall) 기록 조회
+    blocking_sites 는 지연 중 루프 스레드가 실행하던 애플리케이션 코드 위치별 횟수이며, 해당 코드는 스레드/작업 큐로 옮겨야 합니다.
+    """
+    return loop_monitor.snapshot(include_stacks=stacks)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.mysql_config import AsyncSessionLocal
+from app.services.requirement_export_service import EXPORT_FORMATS, stream_requirement_export
+
+router = APIRouter()
+
+@router.get("/export")
+async def export_requirements(
+    project_id: int = Query(..., description="프로젝트 ID"),
+    format: str = Query("ndjson", description="ndjson 또는 csv"),
+    gzip: bool = Query(False, description="gzip 압축 여부"),
+    include_deleted: bool = Query(False, description="삭제된 요구사항 포함 여부"),
+):
+    """
+    프로젝트의 요구사항과 출처를 DB에서 바로 읽어 NDJSON/CSV로 스트리밍합니다.
+    서버 측 커서로 한 행씩 읽어 내보내므로 요구사항 수와 관계없이 일정한 메모리로 동작합니다.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (가능한 형식: {', '.join(EXPORT_FORMATS)})")
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"requirements_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}{'.gz' if gzip else ''}"}
+    if gzip:
+        media_type = "application/gzip"
+
+    async def body():
+        # 응답이 끝날 때까지 세션(서버 측 커서)을 유지하기 위해 스트림 안에서 세션을 엽니다.
+        async with AsyncSessionLocal() as db:
+            async for chunk in stream_requirement_export(db, project_id, format, compress=gzip, include_deleted=include_deleted):
+                yield chunk
+
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
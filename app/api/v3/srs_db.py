@@ -1,31 +1,38 @@
 import os
-import json
 import uuid
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.concurrency import run_in_threadpool
 from concurrent.futures import ThreadPoolExecutor
 from app.schemas.requirement import ProcessResponse
-from app.graph.rfp_graph import get_rfp_graph_app
+from app.graph.rfp_graph import compiled_rfp_app
 from app.services.background_processing_service import process_requirements_in_memory
 from app.core.config import OPENAI_API_KEY, LLM_MODEL
 from app.agents.srs.requirements_extract_agent import extract_requirement_sentences_agent
 from app.agents.srs.requirements_refine_agent import name_classify_describe_requirements_agent
-from app.services.file_processing_service import extract_pages_as_documents, create_chunks_from_documents
-from app.core.config import INPUT_DIR, OUTPUT_JSON_DIR, CHUNK_SIZE, CHUNK_OVERLAP
+from app.agents.srs.requirements_chunk_agent import extract_structured_requirements_agent
+from app.services.file_processing_service import extract_pages_as_documents, write_json_array
+from app.services.chunking_service import chunk_documents_for_agent, resolve_chunk_page_number
+from app.services.document_structure_service import prepare_documents_for_agent
+from app.core.config import INPUT_DIR, OUTPUT_JSON_DIR, REQUIREMENT_DEDUP_ENABLED, SRS_EXTRACTION_MODE, SRS_EXTRACTION_MODES
+from app.core.config import JOB_CHECKPOINT_ENABLED, JOB_CHECKPOINT_KEEP_ON_SUCCESS, REQUIREMENT_SAVE_BATCH_SIZE
+from app.services.requirement_dedup_service import deduplicate_requirement_sentences
+from app.services.checkpoint_service import JobCheckpoint, documents_to_records, records_to_documents
+from app.services.job_progress_service import job_progress
+from app.services.job_result_buffer_service import job_result_buffer
 from app.api.v2.jobs import job_store, update_job_status
 from datetime import datetime
 from app.services.requirement_service import RequirementService
-from app.core.mysql_config import get_mysql_db
-from app.models import Document, Member, Project
-from sqlalchemy import select
+from app.core.mysql_config import job_session_scope
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.repositories.document_repository import DocumentRepository
+from app.repositories.job_context_repository import JobContextRepository
+from app.services.job_scheduler_service import dispatch_job, job_handler, JobQueueFullError
 
 router = APIRouter()
-compiled_app = get_rfp_graph_app()
+compiled_app = compiled_rfp_app # 첫 invoke 시 컴파일되는 지연 프록시 (get_rfp_graph_app() 참고)
 
 # 전역 스레드 풀 생성
 thread_pool = ThreadPoolExecutor(max_workers=4)
@@ -37,13 +44,17 @@ async def start_srs_analysis(
     file: UploadFile = File(..., description="분석할 RFP PDF 파일"),
     project_id: int = Form(None, description="프로젝트 ID"),
     member_id: int = Form(None, description="멤버 ID"),
-    document_id: str = Form(None, description="문서 ID")
+    document_id: str = Form(None, description="문서 ID"),
+    extraction_mode: str = Form(None, description="요구사항 추출 방식 (two_pass: 문장 식별 후 문장별 상세화 / single_pass: 청크당 한 번에 생성)")
 ):
     """
     요구사항 분석 작업 시작 - Job ID 반환
     """
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다.")
+    extraction_mode = extraction_mode or SRS_EXTRACTION_MODE
+    if extraction_mode not in SRS_EXTRACTION_MODES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 추출 방식입니다: {extraction_mode} (가능: {', '.join(SRS_EXTRACTION_MODES)})")
 
     try:
         # Job ID 생성
@@ -55,26 +66,35 @@ async def start_srs_analysis(
         # 초기 작업 상태 설정
         job_store[job_id] = {
             "job_name": "SRS",
-            "status": "PROCESSING",
-            "message": "요구사항 분석을 시작합니다.",
+            "status": "QUEUED",
+            "message": "요구사항 분석 대기 중입니다.",
             "result": None,
             "error": None,
             "project_id": project_id,
             "member_id": member_id,
             "document_id": document_id,
+            "extraction_mode": extraction_mode,
             "start_time": datetime.now().isoformat()
         }
         
-        # 비동기 작업 시작
-        asyncio.create_task(process_srs_background(pdf_content, job_id, file.filename))
+        # 스케줄러 큐에 작업 등록 (작은 문서 우선, 프로젝트 간 공정 분배)
+        scheduled = await dispatch_job(
+            job_id, "SRS", "srs",
+            {"pdf_content": pdf_content, "job_id": job_id, "original_filename": file.filename, "extraction_mode": extraction_mode},
+            size_hint=len(pdf_content), project_id=project_id, member_id=member_id
+        )
         
         return {
             "job_id": job_id,
             "job_name": "SRS",
-            "status": "PROCESSING",
-            "message": "요구사항 분석을 시작합니다."
+            "status": scheduled["status"],
+            "queue_position": scheduled["queue_position"],
+            "message": "요구사항 분석을 시작합니다." if scheduled["status"] == "PROCESSING" else "요구사항 분석 작업이 대기열에 등록되었습니다."
         }
         
+    except JobQueueFullError as e:
+        job_store.pop(job_id, None)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     except Exception as e:
         import traceback
         error_traceback = traceback.format_exc()
@@ -95,97 +115,234 @@ async def start_srs_analysis(
         )
 
 
-async def process_srs_background(pdf_content: bytes, job_id: str, original_filename: str):
-    """백그라운드에서 요구사항 분석 처리"""
+async def process_srs_background(pdf_content: Optional[bytes], job_id: str, original_filename: str, extraction_mode: str = None):
+    """
+    백그라운드에서 요구사항 분석 처리
+    단계별 결과를 체크포인트로 저장하므로, 재개(resume) 시에는 pdf_content 없이 호출되어 마지막으로 완료된 단계부터 이어서 처리합니다.
+    """
+    extraction_mode = extraction_mode or SRS_EXTRACTION_MODE
+    checkpoint = JobCheckpoint(job_id) if JOB_CHECKPOINT_ENABLED else None
     try:
         print(f"\n=== 백그라운드 작업 시작 ===")
         print(f"Job ID: {job_id}")
         print(f"파일명: {original_filename}")
+        print(f"추출 방식: {extraction_mode}")
+
+        if checkpoint is not None:
+            if await asyncio.to_thread(checkpoint.exists):
+                print(f"체크포인트에서 재개합니다: {await asyncio.to_thread(checkpoint.summary)}")
+                if pdf_content is None:
+                    pdf_content = await asyncio.to_thread(checkpoint.load_input)
+            elif pdf_content is not None:
+                meta = {k: v for k, v in job_store.get(job_id, {}).items() if k not in ("result", "error", "status", "message")}
+                meta.update({"original_filename": original_filename, "extraction_mode": extraction_mode})
+                await asyncio.to_thread(checkpoint.save_meta, meta)
+                await asyncio.to_thread(checkpoint.save_input, pdf_content)
         
         # 임시 파일 저장
         unique_id = uuid.UUID(job_id)
         temp_pdf_path = os.path.abspath(os.path.join(INPUT_DIR, f"temp_{unique_id}_{original_filename}"))
-        print(f"임시 파일 경로: {temp_pdf_path}")
         
         try:
             print("\n=== PDF 처리 시작 ===")
-            # 파일 쓰기를 비동기로 처리
-            await asyncio.to_thread(lambda: open(temp_pdf_path, "wb").write(pdf_content))
-            
-            # PDF 처리 및 요구사항 추출
-            pages_as_docs = await asyncio.to_thread(extract_pages_as_documents, temp_pdf_path)
-            if not pages_as_docs:
-                raise Exception("PDF 문서에서 페이지를 추출할 수 없습니다.")
-                
-            chunked_docs = await asyncio.to_thread(create_chunks_from_documents, pages_as_docs, CHUNK_SIZE, CHUNK_OVERLAP)
-            if not chunked_docs:
-                raise Exception("문서 청크를 생성할 수 없습니다.")
+            if checkpoint is not None and await asyncio.to_thread(checkpoint.has_stage, "pages"):
+                pages_as_docs = records_to_documents(await asyncio.to_thread(checkpoint.load_stage, "pages"))
+                print(f"[체크포인트] 페이지 {len(pages_as_docs)}개를 불러왔습니다.")
+            else:
+                if pdf_content is None:
+                    raise Exception("재개할 원본 PDF를 찾을 수 없습니다.")
+                job_progress.set_stage(job_id, "extracting_pages")
+                print(f"임시 파일 경로: {temp_pdf_path}")
+                # 파일 쓰기를 비동기로 처리
+                await asyncio.to_thread(lambda: open(temp_pdf_path, "wb").write(pdf_content))
+
+                # PDF 처리 및 요구사항 추출
+                pages_as_docs = await asyncio.to_thread(extract_pages_as_documents, temp_pdf_path)
+                if not pages_as_docs:
+                    raise Exception("PDF 문서에서 페이지를 추출할 수 없습니다.")
+                # 요구사항 섹션만 골라 섹션 경계에 맞춰 청킹
+                pages_as_docs = await asyncio.to_thread(prepare_documents_for_agent, temp_pdf_path, pages_as_docs, "SRS")
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.save_stage, "pages", documents_to_records(pages_as_docs))
+
+            if checkpoint is not None and await asyncio.to_thread(checkpoint.has_stage, "chunks"):
+                chunked_docs = records_to_documents(await asyncio.to_thread(checkpoint.load_stage, "chunks"))
+                print(f"[체크포인트] 청크 {len(chunked_docs)}개를 불러왔습니다.")
+            else:
+                job_progress.set_stage(job_id, "chunking")
+                chunked_docs = await asyncio.to_thread(chunk_documents_for_agent, pages_as_docs, "SRS")
+                if not chunked_docs:
+                    raise Exception("문서 청크를 생성할 수 없습니다.")
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.save_stage, "chunks", documents_to_records(chunked_docs))
             
             all_classified_requirements = []
-            print("\n--- 에이전트 1 & 2: 요구사항 식별, 명명, 분류, 상세설명 작업 중 ---")
-            
-            # 청크 처리를 병렬로 실행
-            async def process_chunk(chunk_doc, i):
+            if extraction_mode == "single_pass":
+                print("\n--- 통합 에이전트: 청크별 요구사항 식별 및 상세화 중 ---")
+            else:
+                print("\n--- 에이전트 1: 요구사항 문장 식별 중 ---")
+
+            # 1단계: 청크별 요구사항 문장 추출 (병렬)
+            # single_pass 방식은 이 단계에서 7개 필드가 모두 채워진 요구사항을 함께 받습니다.
+            done_sentences = await asyncio.to_thread(checkpoint.load_items, "sentences") if checkpoint is not None else {}
+            async def extract_chunk_sentences(chunk_doc, i):
+                if i in done_sentences:
+                    return done_sentences[i]
+                chunk_candidates = await _extract_chunk_sentences(chunk_doc, i)
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.append_item, "sentences", i, chunk_candidates)
+                job_progress.advance(job_id)
+                return chunk_candidates
+
+            async def _extract_chunk_sentences(chunk_doc, i):
                 chunk_text = chunk_doc.page_content
-                page_num = chunk_doc.metadata.get("page_number", "N/A")
+                page_range = chunk_doc.metadata.get("page_range", chunk_doc.metadata.get("page_number", "N/A"))
 
-                print(f"\n[청크 {i+1}/{len(chunked_docs)} 처리중 (페이지: {page_num})]")
+                print(f"\n[청크 {i+1}/{len(chunked_docs)} 처리중 (페이지: {page_range})]")
                 if len(chunk_text.strip()) < 50:
                     print(f"  청크 {i+1}이 너무 짧아 건너뜁니다.")
                     return []
 
-                req_sentences = await asyncio.to_thread(extract_requirement_sentences_agent, chunk_text)
-                chunk_requirements = []
-                
-                if req_sentences:
-                    print(f"  청크 {i+1}에서 식별된 잠재적 요구사항 문장 ({len(req_sentences)}개):")
-                    for sent_idx, sentence in enumerate(req_sentences):
-                        print(f"    문장 {sent_idx+1}/{len(req_sentences)} 분석 중: '{sentence[:60]}...'")
-                        classified_req = await asyncio.to_thread(
-                            name_classify_describe_requirements_agent,
-                            requirement_sentence=sentence,
-                            source_chunk_text=chunk_text,
-                            page_number=page_num
-                        )
-                        if classified_req:
-                            requirement_data = {
-                                "description_name": classified_req.get("요구사항명", ""),
-                                "type": classified_req.get("type", ""),
-                                "description_content": classified_req.get("요구사항 상세설명", ""),
-                                "target_task": classified_req.get("대상업무", ""),
-                                "rfp_page": classified_req.get("RFP", 0),
-                                "processing_detail": classified_req.get("요건처리 상세", ""),
-                                "raw_text": classified_req.get("출처 문장", "")
+                if extraction_mode == "single_pass":
+                    structured = await asyncio.to_thread(
+                        extract_structured_requirements_agent, chunk_text, chunk_doc.metadata.get("page_number")
+                    )
+                    if structured is None:
+                        # 나눠서 요청해도 응답을 받지 못한 청크는 버리지 않고 two_pass(문장 식별 후 3단계 상세화)로 처리
+                        print(f"  청크 {i+1}의 통합 응답을 받지 못해 문장 식별 방식으로 처리합니다.")
+                    else:
+                        print(f"  청크 {i+1}에서 생성된 요구사항: {len(structured)}개")
+                        return [
+                            {
+                                "sentence": classified["출처 문장"],
+                                "page_number": resolve_chunk_page_number(chunk_doc, classified["출처 문장"]),
+                                "chunk_index": i,
+                                "classified": classified,
                             }
-                            chunk_requirements.append(requirement_data)
-                return chunk_requirements
+                            for classified in structured
+                        ]
 
-            # 모든 청크를 병렬로 처리
-            chunk_tasks = [process_chunk(chunk_doc, i) for i, chunk_doc in enumerate(chunked_docs)]
-            chunk_results = await asyncio.gather(*chunk_tasks)
-            
-            # 결과 병합
-            for requirements in chunk_results:
-                all_classified_requirements.extend(requirements)
+                req_sentences = await asyncio.to_thread(extract_requirement_sentences_agent, chunk_text)
+                print(f"  청크 {i+1}에서 식별된 잠재적 요구사항 문장: {len(req_sentences or [])}개")
+                return [
+                    {
+                        "sentence": sentence,
+                        "page_number": resolve_chunk_page_number(chunk_doc, sentence),
+                        "chunk_index": i,
+                    }
+                    for sentence in (req_sentences or [])
+                ]
+
+            if checkpoint is not None and await asyncio.to_thread(checkpoint.has_stage, "sentences"):
+                candidates = await asyncio.to_thread(checkpoint.load_stage, "sentences")
+                print(f"[체크포인트] 요구사항 문장 {len(candidates)}개를 불러왔습니다.")
+            else:
+                if done_sentences:
+                    print(f"[체크포인트] 청크 {len(done_sentences)}/{len(chunked_docs)}개의 문장 추출 결과를 재사용합니다.")
+                job_progress.set_stage(job_id, "extracting_sentences", total=len(chunked_docs), done=len(done_sentences))
+                sentence_results = await asyncio.gather(
+                    *[extract_chunk_sentences(chunk_doc, i) for i, chunk_doc in enumerate(chunked_docs)]
+                )
+                candidates = [candidate for result in sentence_results for candidate in result]
+
+                # 2단계: 청크 간 중복 문장 제거 (출처 페이지/문장은 병합하여 보존)
+                if REQUIREMENT_DEDUP_ENABLED:
+                    job_progress.set_stage(job_id, "deduplicating", total=len(candidates))
+                    candidates = await asyncio.to_thread(deduplicate_requirement_sentences, candidates)
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.save_stage, "sentences", candidates)
+
+            # 3단계: 요구사항 명명, 분류, 상세설명 (병렬, single_pass 방식은 1단계 결과 사용)
+            if extraction_mode != "single_pass":
+                print("\n--- 에이전트 2: 요구사항 명명, 분류, 상세설명 작업 중 ---")
+            done_refined = await asyncio.to_thread(checkpoint.load_items, "refined") if checkpoint is not None else {}
+            async def classify_candidate(candidate, i):
+                if i in done_refined:
+                    return done_refined[i]
+                requirements = await _classify_candidate(candidate, i)
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.append_item, "refined", i, requirements)
+                job_progress.advance(job_id, produced=len(requirements), batch=requirements)
+                return requirements
+
+            async def _classify_candidate(candidate, i):
+                if candidate.get("classified"):
+                    return [build_requirement_data({**candidate["classified"], "RFP": candidate["page_number"]}, candidate)]
+                sentence = candidate["sentence"]
+                print(f"    문장 {i+1}/{len(candidates)} 분석 중: '{sentence[:60]}...'")
+                classified_req = await asyncio.to_thread(
+                    name_classify_describe_requirements_agent,
+                    requirement_sentence=sentence,
+                    source_chunk_text=chunked_docs[candidate["chunk_index"]].page_content,
+                    page_number=candidate["page_number"]
+                )
+                if not classified_req:
+                    return []
+                return [build_requirement_data(classified_req, candidate)]
+
+            if checkpoint is not None and await asyncio.to_thread(checkpoint.has_stage, "refined"):
+                all_classified_requirements = await asyncio.to_thread(checkpoint.load_stage, "refined")
+                print(f"[체크포인트] 상세화된 요구사항 {len(all_classified_requirements)}개를 불러왔습니다.")
+            else:
+                if done_refined:
+                    print(f"[체크포인트] 문장 {len(done_refined)}/{len(candidates)}개의 상세화 결과를 재사용합니다.")
+                job_progress.set_stage(job_id, "refining", total=len(candidates), done=len(done_refined))
+                chunk_results = await asyncio.gather(
+                    *[classify_candidate(candidate, i) for i, candidate in enumerate(candidates)]
+                )
+
+                # 결과 병합
+                for requirements in chunk_results:
+                    all_classified_requirements.extend(requirements)
+                if checkpoint is not None and all_classified_requirements:
+                    await asyncio.to_thread(checkpoint.save_stage, "refined", all_classified_requirements)
             
             if not all_classified_requirements:
                 raise Exception("요구사항을 추출할 수 없습니다.")
             
-            # 요구사항 처리
-            processed_results = await asyncio.to_thread(process_requirements_in_memory, all_classified_requirements, compiled_app)
+            # 요구사항 처리 (평가/분류/ID 생성)
+            if checkpoint is not None and await asyncio.to_thread(checkpoint.has_stage, "assessed"):
+                processed_results = await asyncio.to_thread(checkpoint.load_stage, "assessed")
+                print(f"[체크포인트] 평가된 요구사항 {len(processed_results)}개를 불러왔습니다.")
+                if not await asyncio.to_thread(job_result_buffer.exists, job_id):
+                    await asyncio.to_thread(job_result_buffer.reset, job_id, dict(enumerate(processed_results)))
+            else:
+                done_assessed = await asyncio.to_thread(checkpoint.load_items, "assessed") if checkpoint is not None else {}
+                job_progress.set_stage(job_id, "assessing", total=len(all_classified_requirements), done=len(done_assessed))
+                await asyncio.to_thread(job_result_buffer.reset, job_id, done_assessed)
+
+                def on_assessed(index, result):
+                    if checkpoint is not None:
+                        checkpoint.append_item("assessed", index, result)
+                    job_result_buffer.append(job_id, index, result)
+                    job_progress.advance(job_id, batch=[result])
+
+                processed_results = await asyncio.to_thread(
+                    process_requirements_in_memory,
+                    all_classified_requirements,
+                    compiled_app,
+                    completed_results=done_assessed,
+                    on_result=on_assessed,
+                )
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.save_stage, "assessed", processed_results)
+            await asyncio.to_thread(job_result_buffer.mark_complete, job_id)
             
             # 결과 저장
             output_filename = f"processed_{unique_id}_{original_filename}.json"
             output_json_path = os.path.join(OUTPUT_JSON_DIR, output_filename)
             os.makedirs(OUTPUT_JSON_DIR, exist_ok=True)
             
-            await asyncio.to_thread(
-                lambda: json.dump(processed_results, open(output_json_path, "w", encoding="utf-8"), ensure_ascii=False, indent=4)
-            )
+            await asyncio.to_thread(write_json_array, processed_results, output_json_path)
+            # 결과 파일 위치 기록 (GET /jobs/srs-agent/{job_id}/report?format= 에서 csv/xlsx 등으로 렌더링)
+            job_store[job_id]["result"] = {"requirements_path": output_json_path, "requirement_count": len(processed_results)}
             
             # DB에 요구사항 저장
             print("\n=== 요구사항 저장 프로세스 시작 ===")
-            await save_requirements_to_db(processed_results, job_store[job_id])
+            await save_requirements_to_db(processed_results, job_store[job_id], checkpoint, job_id=job_id)
+
+            if checkpoint is not None and not JOB_CHECKPOINT_KEEP_ON_SUCCESS:
+                await asyncio.to_thread(checkpoint.clear)
             
         finally:
             # 임시 파일 정리
@@ -205,14 +362,38 @@ async def process_srs_background(pdf_content: bytes, job_id: str, original_filen
             job_id=job_id,
             status="FAILED",
             result=None,
-            error=error_message
+            error=error_message,
+            message=f"요구사항 처리 실패: {e}" + (" (POST /jobs/{job_id}/resume 으로 마지막 완료 단계부터 재개할 수 있습니다.)" if checkpoint is not None else "")
         )
 
-async def save_requirements_to_db(processed_results, job_info):
+def build_requirement_data(classified_req: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """에이전트의 7개 필드 결과를 요구사항 처리 그래프 입력 형식으로 변환합니다."""
+    requirement_data = {
+        "description_name": classified_req.get("요구사항명", ""),
+        "type": classified_req.get("type", ""),
+        "description_content": classified_req.get("요구사항 상세설명", ""),
+        "target_task": classified_req.get("대상업무", ""),
+        "rfp_page": classified_req.get("RFP", 0),
+        "processing_detail": classified_req.get("요건처리 상세", ""),
+        "raw_text": classified_req.get("출처 문장", "")
+    }
+    if candidate.get("sources"):
+        requirement_data["sources"] = candidate["sources"]
+    return requirement_data
+
+@job_handler("srs")
+async def run_srs_job(payload: Dict[str, Any]):
+    """스케줄러/워커에서 호출되는 SRS 작업 핸들러"""
+    await process_srs_background(
+        payload.get("pdf_content"), payload["job_id"], payload["original_filename"], payload.get("extraction_mode")
+    )
+
+async def save_requirements_to_db(processed_results, job_info, checkpoint: Optional[JobCheckpoint] = None, job_id: Optional[str] = None):
     """
     요구사항 리스트를 DB에 저장하는 함수
+    checkpoint가 주어지면 저장에 성공한 항목을 기록하고, 재개 시 이미 저장된 항목은 건너뜁니다.
     """
-    async for db in get_mysql_db():
+    async with job_session_scope(job_id) as db:
         print(f"DB 연결 성공")
         project_id = job_info.get("project_id")
         member_id = job_info.get("member_id")
@@ -224,21 +405,8 @@ async def save_requirements_to_db(processed_results, job_info):
             print("ERROR: 필수 ID 누락")
             raise Exception("프로젝트 ID, 멤버 ID, 문서 ID가 필요합니다.")
         
-        # 관련 엔티티 조회
-        project_query = select(Project).where(Project.project_id == project_id)
-        member_query = select(Member).where(Member.member_id == member_id)
-        document_query = select(Document).where(Document.doc_id == document_id)
-
-        print(f"\n문서 ID 조회: {document_id}")
-        print(f"문서 쿼리: {document_query}")
-
-        project_result = await db.execute(project_query)
-        member_result = await db.execute(member_query)
-        document_result = await db.execute(document_query)
-
-        project = project_result.scalar_one_or_none()
-        member = member_result.scalar_one_or_none()
-        document = document_result.scalar_one_or_none()
+        # 관련 엔티티 조회 (한 번의 결합 쿼리, 작업 안에서는 캐시 재사용)
+        project, member, document = await JobContextRepository(db).get_job_context(project_id, member_id, document_id)
 
         print(f"엔티티 조회 결과 - Project: {project is not None}, Member: {member is not None}, Document: {document is not None}")
         
@@ -252,15 +420,29 @@ async def save_requirements_to_db(processed_results, job_info):
         # RequirementService를 사용하여 요구사항 저장
         print("\n=== 요구사항 저장 시작 ===")
         requirement_service = RequirementService(db)
-        # 요구사항을 순차적으로 저장
-        for idx, requirement in enumerate(processed_results, 1):
-            print(f"\n요구사항 {idx}/{len(processed_results)} 저장 시도:")
-            print(f"요구사항 데이터: {requirement}")
+        persisted = await asyncio.to_thread(checkpoint.load_items, "persisted") if checkpoint is not None else {}
+        if persisted:
+            print(f"[체크포인트] 이미 저장된 요구사항 {len(persisted)}개를 건너뜁니다.")
+        if job_id:
+            job_progress.set_stage(job_id, "persisting", total=len(processed_results), done=len(persisted))
+        # 요구사항을 REQUIREMENT_SAVE_BATCH_SIZE 개씩 묶어 한 트랜잭션으로 저장
+        pending = [(idx, requirement) for idx, requirement in enumerate(processed_results, 1) if idx not in persisted]
+        for start in range(0, len(pending), REQUIREMENT_SAVE_BATCH_SIZE):
+            batch = pending[start:start + REQUIREMENT_SAVE_BATCH_SIZE]
+            first_idx, last_idx = batch[0][0], batch[-1][0]
             try:
-                await requirement_service.create_requirement(requirement, member, project, document)
-                print(f"요구사항 {idx} 저장 성공")
+                saved = await requirement_service.create_requirements([requirement for _, requirement in batch], member, project, document)
+                print(f"요구사항 {first_idx}~{last_idx}/{len(processed_results)} 저장 성공 ({len(batch)}개)")
             except Exception as e:
-                print(f"ERROR: 요구사항 {idx} 저장 실패 - {str(e)}")
+                print(f"ERROR: 요구사항 {first_idx}~{last_idx} 저장 실패 - {str(e)}")
                 raise
+            if checkpoint is not None:
+                await asyncio.to_thread(
+                    checkpoint.append_items, "persisted", {idx: req.req_id_code for (idx, _), req in zip(batch, saved)}
+                )
+            if job_id:
+                job_progress.advance(job_id, len(batch))
+        if checkpoint is not None:
+            all_persisted = {**persisted, **await asyncio.to_thread(checkpoint.load_items, "persisted")}
+            await asyncio.to_thread(checkpoint.save_stage, "persisted", [all_persisted.get(i) for i in range(1, len(processed_results) + 1)])
         print("\n=== 모든 요구사항 저장 완료 ===")
-        break
@@ -1,7 +1,12 @@
+import os
+import json
 import uuid
 import asyncio
-from fastapi import APIRouter, HTTPException
-from app.api.v2.jobs import job_store
+import hashlib
+from fastapi import APIRouter, HTTPException, Request
+from app.api.v2.jobs import get_job, list_jobs
+from app.services.job_scheduler_service import get_queue_position
+from app.services.report_renderer_service import render_report, report_file_response, supported_formats
 
 
 router = APIRouter()
@@ -11,15 +16,50 @@ async def get_srs_status(job_id: str):
     """
     요구사항 분석 상태 조회
     """
-    if job_id not in job_store:
+    job = get_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    job = job_store[job_id]
     return {
         "job_id": job_id,
         "state": job["status"],
         "message": job.get("message", ""),
+        "queue_position": get_queue_position(job_id),
     }
 
+@router.get("/srs-agent/{job_id}/report")
+async def download_srs_report(job_id: str, request: Request, format: str = "xlsx"):
+    """
+    완료된 요구사항 분석 결과를 원하는 형식으로 내려받습니다. format: xlsx(기본), csv, pdf, docx, html, md
+    저장된 요구사항 JSON을 렌더링하며, 같은 결과/형식의 재요청은 캐시된 파일로 응답합니다.
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"요구사항 분석 결과가 아직 준비되지 않았습니다. (상태: {job['status']})")
+    if format not in supported_formats("requirements"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (가능한 형식: {', '.join(supported_formats('requirements'))})")
+    result = job.get("result") if isinstance(job.get("result"), dict) else {}
+    requirements_path = result.get("requirements_path")
+    if not requirements_path or not os.path.exists(requirements_path):
+        raise HTTPException(status_code=404, detail="내려받을 수 있는 요구사항 분석 결과가 없습니다.")
+
+    def render():
+        digest = hashlib.sha256()
+        with open(requirements_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+        def load_requirements():
+            with open(requirements_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        return render_report(format, source_hash=digest.hexdigest(), load_requirements=load_requirements)
+
+    rendered = await asyncio.to_thread(render)
+    filename = f"requirements_{job_id}.{rendered['extension']}"
+    return report_file_response(rendered["path"], rendered["media_type"], filename, rendered["etag"], request.headers.get("if-none-match"))
+
 @router.get("/srs-agent/latest-status")
 async def get_latest_srs_status_by_project_member(
     project_id: int,
@@ -31,7 +71,7 @@ async def get_latest_srs_status_by_project_member(
     """
     filtered_jobs = [
         (job_id, job)
-        for job_id, job in job_store.items()
+        for job_id, job in list_jobs()
         if job.get("project_id") == project_id and job.get("member_id") == member_id and job.get("job_name", "SRS") == job_name and "start_time" in job
     ]
     if not filtered_jobs:
@@ -10,7 +10,38 @@ LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o") # 기본값 gpt-4o
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 # GEMINI_MODEL = "gemini-2.5-pro-preview-06-05"
-GEMINI_MODEL = "gemini-2.5-flash-preview-05-20"
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-05-20")
+ANTHROPIC_LLM_MODEL = os.getenv("ANTHROPIC_LLM_MODEL", "claude-4-sonnet-20250514") # 텍스트 분석용 (목업 HTML 모델과 별도)
+
+# LLM 제공자 장애 대응 (llm_call_service.call_llm)
+# 에이전트별 제공자 순서: "에이전트=제공자[:모델],제공자[:모델];..." (제공자: openai, gemini, anthropic)
+# 앞 제공자가 실패하거나 서킷 브레이커가 열려 있으면 다음 제공자로 넘어갑니다. 목록에 없는 에이전트는 default 사용.
+LLM_FAILOVER_POLICY = os.getenv(
+    "LLM_FAILOVER_POLICY",
+    "default=openai,gemini;"
+    "sentence_extraction=openai,gemini;"
+    "requirement_refine=openai,gemini;"
+    "assessment=openai,gemini;"
+    "synthesis=openai,anthropic,gemini",
+)
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120")) # 제공자 호출 1회의 최대 시간
+LLM_PROVIDER_MAX_RETRIES = int(os.getenv("LLM_PROVIDER_MAX_RETRIES", "1")) # SDK 자체 재시도 (이후에는 다음 제공자로 전환)
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5")) # 연속 실패 시 브레이커 open
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30")) # open 유지 시간 (이후 half_open 시험 호출)
+LLM_BREAKER_HALF_OPEN_MAX_CALLS = int(os.getenv("LLM_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+LLM_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "60")) # 이보다 느린 응답도 실패로 집계
+# 에이전트별 호출 제한 시간 (초, 없으면 LLM_REQUEST_TIMEOUT_SECONDS): "에이전트=초,..."
+LLM_AGENT_TIMEOUTS = os.getenv("LLM_AGENT_TIMEOUTS", "sentence_extraction=60,requirement_refine=60,assessment=45,synthesis=180")
+
+# hedged request: 호출이 에이전트의 p95 지연을 넘기면 중복 요청을 보내 먼저 온 유효한 응답 사용 (app/services/llm_hedging_service.py)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_TARGET = os.getenv("LLM_HEDGE_TARGET", "alternate") # alternate: 정책의 다음 제공자(없으면 같은 모델) / same: 같은 모델
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200")) # p95 계산에 쓰는 최근 호출 수
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")) # 표본이 이보다 적으면 중복 요청 안 함
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "2")) # 중복 요청 전 최소 대기 시간
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05")) # 중복 요청 상한 (기본 호출 대비 비율)
+LLM_HEDGE_BUDGET_BURST = float(os.getenv("LLM_HEDGE_BUDGET_BURST", "5")) # 한 번에 쓸 수 있는 최대 중복 요청 수
+LLM_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "32")) # 동시에 실행할 수 있는 중복 요청 수 (기본 요청은 제한 없음)
 
 INPUT_DIR = "app/docs"
 OUTPUT_CSV_DIR = "app/output/SRS_csv"
@@ -18,6 +49,45 @@ OUTPUT_JSON_DIR = "app/output/SRS_json"
 OUTPUT_UPLOADS_DIR = os.getenv("FILE_STORAGE_PATH_UPLOADS", "app/docs")
 OUTPUT_ASIS_DIR = os.getenv("FILE_STORAGE_PATH_ASIS", "uploads/analysis_results")
 OUTPUT_MOCKUP_DIR = os.getenv("FILE_STORAGE_PATH_MOCKUP", "app/output/mockup_html")
+MOCKUP_PAGE_CONCURRENCY = int(os.getenv("MOCKUP_PAGE_CONCURRENCY", "5")) # 목업 HTML 페이지 동시 생성 수
+MOCKUP_PAGE_MAX_RETRIES = int(os.getenv("MOCKUP_PAGE_MAX_RETRIES", "2")) # 페이지별 HTML 생성 재시도 횟수
+MOCKUP_PAGE_RETRY_BASE_DELAY = float(os.getenv("MOCKUP_PAGE_RETRY_BASE_DELAY", "2.0")) # 재시도 대기 시간(초, 시도마다 2배)
+# 목업 렌더링 방식: shell(공통 레이아웃/테마 CSS는 1회 생성, 페이지별로 메인 콘텐츠 조각만 생성) / full(페이지마다 전체 HTML 생성)
+MOCKUP_RENDER_MODES = ("shell", "full")
+MOCKUP_RENDER_MODE = os.getenv("MOCKUP_RENDER_MODE", "shell")
+# 목업 LLM 결과 영구 캐시 (입력 fingerprint → 결과, LRU 정리)
+MOCKUP_CACHE_ENABLED = os.getenv("MOCKUP_CACHE_ENABLED", "true").lower() == "true"
+MOCKUP_CACHE_DB_PATH = os.getenv("MOCKUP_CACHE_DB_PATH", "app/output/mockup_cache.sqlite3")
+MOCKUP_CACHE_MAX_MB = float(os.getenv("MOCKUP_CACHE_MAX_MB", "200"))
+MOCKUP_CACHE_MAX_ENTRIES = int(os.getenv("MOCKUP_CACHE_MAX_ENTRIES", "5000"))
+# 증분 목업: 프로젝트의 마지막 revision과 비교해 변경된 요구사항이 속한 페이지만 다시 생성
+MOCKUP_INCREMENTAL_ENABLED = os.getenv("MOCKUP_INCREMENTAL_ENABLED", "true").lower() == "true"
+MOCKUP_REVISION_DIR = os.getenv("MOCKUP_REVISION_DIR", "app/output/mockup_revisions")
+MOCKUP_INCREMENTAL_MAX_CHANGE_RATIO = float(os.getenv("MOCKUP_INCREMENTAL_MAX_CHANGE_RATIO", "0.5")) # 이보다 많이 바뀌면 전체 재생성
+# 목업 ZIP 전달 (작성 중에는 메모리 임계치를 넘으면 임시 파일로 전환, 완료 후 GET /mockup/{job_id}/zip 으로도 내려받기 가능)
+MOCKUP_ZIP_SPOOL_MB = float(os.getenv("MOCKUP_ZIP_SPOOL_MB", "16"))
+MOCKUP_ZIP_DIR = os.getenv("MOCKUP_ZIP_DIR", "app/output/mockup_zips") # worker 모드에서는 API/워커 공유 볼륨 경로
+MOCKUP_ZIP_RETENTION_HOURS = float(os.getenv("MOCKUP_ZIP_RETENTION_HOURS", "72"))
+# 목업 기획/ZIP 기록 등 동기 작업을 실행하는 전용 스레드 풀 크기 (이벤트 루프와 기본 스레드 풀을 막지 않도록 분리)
+MOCKUP_EXECUTOR_WORKERS = int(os.getenv("MOCKUP_EXECUTOR_WORKERS", "4"))
+
+# 보고서 렌더러 (As-Is 보고서 Markdown / SRS 요구사항 목록 → pdf, docx, html, md, csv, xlsx), 결과는 (원본 해시, 형식)별로 캐시
+REPORT_RENDER_CACHE_DIR = os.getenv("REPORT_RENDER_CACHE_DIR", "app/output/report_cache")
+REPORT_RENDER_CACHE_MAX_MB = float(os.getenv("REPORT_RENDER_CACHE_MAX_MB", "500"))
+
+# DB 요구사항 스트리밍 내보내기 (GET /requirements/export)
+EXPORT_STREAM_BATCH_SIZE = int(os.getenv("EXPORT_STREAM_BATCH_SIZE", "500")) # 서버 측 커서에서 한 번에 가져오는 행 수
+EXPORT_STREAM_CHUNK_KB = int(os.getenv("EXPORT_STREAM_CHUNK_KB", "64")) # 응답으로 내보내는 청크 크기
+
+# 문서 ID(ASIS-000001 등) 발급: 프로세스마다 시퀀스 테이블에서 이 개수만큼 번호를 미리 예약해 사용
+DOC_ID_BLOCK_SIZE = int(os.getenv("DOC_ID_BLOCK_SIZE", "20"))
+
+# 콜백 HTTP 클라이언트 (연결 풀 재사용, 재시도)
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+CALLBACK_CONNECT_TIMEOUT_SECONDS = float(os.getenv("CALLBACK_CONNECT_TIMEOUT_SECONDS", "10"))
+CALLBACK_TIMEOUT_SECONDS = float(os.getenv("CALLBACK_TIMEOUT_SECONDS", "300"))
+CALLBACK_MAX_RETRIES = int(os.getenv("CALLBACK_MAX_RETRIES", "4"))
+CALLBACK_RETRY_BASE_DELAY = float(os.getenv("CALLBACK_RETRY_BASE_DELAY", "2.0")) # 재시도 대기 시간(초, 시도마다 2배)
 
 SENTENCE_TRANSFORMER_MODEL = os.getenv("SENTENCE_TRANSFORMER_MODEL", "all-MiniLM-L6-v2")
 FAISS_INDEX_DIR = "app/indexes/faiss_indexes" # FAISS 인덱스 저장 디렉토리
@@ -26,6 +96,101 @@ METADATA_STORAGE_DIR = "app/indexes/metadata" # 메타데이터 JSON 저장 디
 CHUNK_SIZE = 4000
 CHUNK_OVERLAP = 200
 
+# 토큰 기반 청킹 설정 (CHUNK_STRATEGY=char 이면 기존 문자 수 기반 CHUNK_SIZE/CHUNK_OVERLAP 사용)
+CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "token")
+CHUNK_TOKENIZER_ENCODING = os.getenv("CHUNK_TOKENIZER_ENCODING", "o200k_base") # gpt-4o 계열 토크나이저
+CHUNK_TOKEN_BUDGETS = { # 청크를 입력으로 받는 에이전트별 목표 토큰 수
+    "SRS": int(os.getenv("CHUNK_TOKENS_SRS", "3000")), # 요구사항 문장 추출
+    "ASIS": int(os.getenv("CHUNK_TOKENS_ASIS", "6000")), # As-Is 정보 추출
+}
+CHUNK_TOKEN_OVERLAP = int(os.getenv("CHUNK_TOKEN_OVERLAP", "150")) # 한 페이지가 예산을 넘어 분할될 때의 중복 토큰 수
+CHUNK_HEADING_BREAK_RATIO = float(os.getenv("CHUNK_HEADING_BREAK_RATIO", "0.5")) # 청크가 이 비율 이상 찼을 때 새 장/절이 시작되면 청크를 나눔
+
+# 문서 구조 기반 섹션 라우팅 (파이프라인별로 제목에 키워드가 포함된 섹션만 LLM에 전달, 일치 섹션이 없으면 전체 사용)
+STRUCTURE_ROUTING_ENABLED = os.getenv("STRUCTURE_ROUTING_ENABLED", "true").lower() == "true"
+SECTION_ROUTING_KEYWORDS = {
+    "SRS": [k.strip() for k in os.getenv("SRS_SECTION_KEYWORDS", "요구사항").split(",") if k.strip()],
+    "ASIS": [k.strip() for k in os.getenv("ASIS_SECTION_KEYWORDS", "현황,현행").split(",") if k.strip()],
+}
+
+# 요구사항 문장 중복 제거 (문장 추출 직후, 분류/평가 LLM 호출 전에 수행)
+REQUIREMENT_DEDUP_ENABLED = os.getenv("REQUIREMENT_DEDUP_ENABLED", "true").lower() == "true"
+REQUIREMENT_DEDUP_MINHASH_THRESHOLD = float(os.getenv("REQUIREMENT_DEDUP_MINHASH_THRESHOLD", "0.7")) # LSH 후보의 자카드 유사도 (문자 3-gram)
+REQUIREMENT_DEDUP_EMBEDDING = os.getenv("REQUIREMENT_DEDUP_EMBEDDING", "false").lower() == "true" # 임베딩 코사인 유사도 병합 사용 여부
+REQUIREMENT_DEDUP_EMBEDDING_THRESHOLD = float(os.getenv("REQUIREMENT_DEDUP_EMBEDDING_THRESHOLD", "0.92"))
+
+# 요구사항 추출 방식 (작업 요청 시 extraction_mode 로 작업별 지정 가능)
+# two_pass: 문장 식별 후 문장마다 상세화 / single_pass: 청크당 한 번의 호출로 7개 필드 요구사항 목록 생성
+SRS_EXTRACTION_MODES = ("two_pass", "single_pass")
+SRS_EXTRACTION_MODE = os.getenv("SRS_EXTRACTION_MODE", "two_pass")
+# single_pass 응답 최대 토큰 수 (청크의 모든 요구사항을 한 응답으로 받으므로 기본 호출보다 크게 설정)
+SINGLE_PASS_MAX_TOKENS = int(os.getenv("SINGLE_PASS_MAX_TOKENS", "8000"))
+# 응답이 잘리거나(JSON 파싱 실패) 형식이 잘못되면 청크를 반으로 나눠 다시 요청하며, 이 길이(문자)보다 짧으면 더 나누지 않고 two_pass로 처리
+SINGLE_PASS_MIN_SPLIT_CHARS = int(os.getenv("SINGLE_PASS_MIN_SPLIT_CHARS", "600"))
+
+# SRS 작업 단계별 체크포인트 (POST /jobs/{id}/resume 으로 마지막 완료 단계부터 재개)
+JOB_CHECKPOINT_ENABLED = os.getenv("JOB_CHECKPOINT_ENABLED", "true").lower() == "true"
+JOB_CHECKPOINT_DIR = os.getenv("JOB_CHECKPOINT_DIR", "app/output/job_checkpoints") # worker 모드에서는 API/워커 공유 볼륨 경로
+JOB_CHECKPOINT_KEEP_ON_SUCCESS = os.getenv("JOB_CHECKPOINT_KEEP_ON_SUCCESS", "false").lower() == "true"
+
+# 요구사항 DB 저장 시 한 트랜잭션으로 묶는 요구사항 수
+REQUIREMENT_SAVE_BATCH_SIZE = int(os.getenv("REQUIREMENT_SAVE_BATCH_SIZE", "50"))
+
+# 작업 진행 이벤트 (SSE/WebSocket)
+JOB_PROGRESS_HISTORY = int(os.getenv("JOB_PROGRESS_HISTORY", "500")) # 재접속 시 다시 보내기 위해 작업별로 보관하는 최근 이벤트 수
+JOB_PROGRESS_ETA_WINDOW = int(os.getenv("JOB_PROGRESS_ETA_WINDOW", "20")) # ETA 계산에 사용하는 최근 완료 항목 수
+JOB_PROGRESS_SYNC_INTERVAL = float(os.getenv("JOB_PROGRESS_SYNC_INTERVAL", "1.0")) # 공유 작업 상태에 진행 요약을 기록/조회하는 간격(초)
+JOB_PROGRESS_KEEPALIVE_SECONDS = float(os.getenv("JOB_PROGRESS_KEEPALIVE_SECONDS", "15"))
+JOB_PROGRESS_MAX_JOBS = int(os.getenv("JOB_PROGRESS_MAX_JOBS", "200")) # 진행 상황을 메모리에 유지하는 최대 작업 수
+
+# 처리 중인 작업의 부분 결과 버퍼 (GET /jobs/{id}/requirements)
+JOB_RESULT_BUFFER_DIR = os.getenv("JOB_RESULT_BUFFER_DIR", "app/output/job_results") # worker 모드에서는 API/워커 공유 볼륨 경로
+JOB_RESULT_BUFFER_RETENTION_HOURS = float(os.getenv("JOB_RESULT_BUFFER_RETENTION_HOURS", "24"))
+JOB_RESULT_PAGE_MAX_LIMIT = int(os.getenv("JOB_RESULT_PAGE_MAX_LIMIT", "500"))
+
+# 작업 스케줄러 설정 (작업 유형별 큐의 워커 수)
+JOB_QUEUE_WORKERS = {
+    "SRS": int(os.getenv("JOB_WORKERS_SRS", "2")),
+    "ASIS": int(os.getenv("JOB_WORKERS_ASIS", "2")),
+    "MOCKUP": int(os.getenv("JOB_WORKERS_MOCKUP", "1")),
+    "FAISS": int(os.getenv("JOB_WORKERS_FAISS", "1")),
+    "REQUEST": int(os.getenv("JOB_WORKERS_REQUEST", "2")),
+}
+JOB_QUEUE_MAX_PENDING = int(os.getenv("JOB_QUEUE_MAX_PENDING", "20")) # 큐별 최대 대기 작업 수 (초과 시 429)
+JOB_PRIORITY_POLICY = os.getenv("JOB_PRIORITY_POLICY", "size") # size: 작은 문서 우선 / project: 프로젝트 우선순위 / fifo
+JOB_PROJECT_PRIORITIES = os.getenv("JOB_PROJECT_PRIORITIES", "") # 예: "12=0,7=5" (값이 작을수록 먼저 처리)
+JOB_PRIORITY_AGING_SECONDS = float(os.getenv("JOB_PRIORITY_AGING_SECONDS", "120")) # 대기 시간에 따른 우선순위 보정 (기아 방지)
+
+# 작업 실행 모드: inprocess(API 프로세스 내 실행) / worker(별도 `python -m app.worker` 프로세스에서 실행)
+JOB_EXECUTION_MODE = os.getenv("JOB_EXECUTION_MODE", "inprocess")
+JOB_QUEUE_DB_PATH = os.getenv("JOB_QUEUE_DB_PATH", "app/output/job_queue.sqlite3") # API와 워커가 공유하는 작업 큐/상태 DB (같은 노드의 로컬 볼륨, 네트워크 파일시스템 불가)
+JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", "app/output/job_spool") # 업로드 파일 등 큰 입력을 워커에 넘기기 위한 공유 디렉토리
+WORKER_QUEUES = [q.strip() for q in os.getenv("WORKER_QUEUES", ",".join(JOB_QUEUE_WORKERS)).split(",") if q.strip()]
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+WORKER_HEARTBEAT_TIMEOUT = float(os.getenv("WORKER_HEARTBEAT_TIMEOUT", "60")) # 이 시간 동안 하트비트가 없으면 다른 워커가 재처리
+WORKER_DRAIN_TIMEOUT = float(os.getenv("WORKER_DRAIN_TIMEOUT", "300")) # SIGTERM 후 실행 중인 작업을 기다리는 최대 시간
+
+# 시작 시간 단축: 무거운 의존성(SDK, 임베딩 모델, 그래프 컴파일 등)은 첫 사용 시 초기화하고,
+# 활성화하면 서버가 요청을 받기 시작한 뒤 백그라운드 스레드에서 미리 초기화합니다. (app/core/lazy.py)
+STARTUP_WARMUP_ENABLED = os.getenv("STARTUP_WARMUP_ENABLED", "true").lower() == "true"
+
+# readiness(/ready) / liveness(/live) 프로브 (app/services/health_service.py)
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "2")) # 점검 결과 재사용 시간
+READINESS_CHECK_TIMEOUT_SECONDS = float(os.getenv("READINESS_CHECK_TIMEOUT_SECONDS", "2")) # 점검 하나의 최대 시간
+READINESS_QUEUE_SHED_RATIO = float(os.getenv("READINESS_QUEUE_SHED_RATIO", "0.8")) # 대기 작업이 JOB_QUEUE_MAX_PENDING의 이 비율 이상이면 과부하
+# 임베딩 모델이 로드되기 전에는 준비되지 않은 것으로 봄 (워밍업을 끄면 첫 사용 시 로드되므로 기본값도 꺼짐)
+READINESS_REQUIRE_EMBEDDING_MODEL = os.getenv("READINESS_REQUIRE_EMBEDDING_MODEL", str(STARTUP_WARMUP_ENABLED)).lower() == "true"
+# 과부하(shed_load)일 때도 /ready 가 503을 반환할지 여부
+# 모든 파드가 동시에 과부하면 서비스 엔드포인트가 모두 빠지므로, 파드 수가 충분할 때만 켜는 것을 권장
+READINESS_FAIL_ON_OVERLOAD = os.getenv("READINESS_FAIL_ON_OVERLOAD", "false").lower() == "true"
+
+# 이벤트 루프 지연 모니터 (app/services/loop_monitor_service.py, /ops/event-loop)
+EVENT_LOOP_MONITOR_ENABLED = os.getenv("EVENT_LOOP_MONITOR_ENABLED", "true").lower() == "true"
+EVENT_LOOP_MONITOR_INTERVAL_MS = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL_MS", "50")) # 하트비트 간격
+EVENT_LOOP_LAG_WARN_MS = float(os.getenv("EVENT_LOOP_LAG_WARN_MS", "100")) # 루프가 이 시간 이상 막히면 스택을 캡처하고 경고
+EVENT_LOOP_STALL_HISTORY = int(os.getenv("EVENT_LOOP_STALL_HISTORY", "20")) # 보관할 최근 지연 기록 수
+EVENT_LOOP_STALL_DEGRADED_SECONDS = float(os.getenv("EVENT_LOOP_STALL_DEGRADED_SECONDS", "60")) # 최근 이 시간 내 지연이 있으면 readiness degraded
+
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY 환경 변수를 설정해주세요.")
 
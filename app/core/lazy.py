@@ -0,0 +1,125 @@
+# app/core/lazy.py
+"""
+무거운 의존성(SDK 클라이언트, 임베딩 모델, 컴파일된 그래프, 대형 라이브러리 import)을 처음 사용할 때 초기화합니다.
+
+- LazyResource(name, factory): factory를 처음 get() 할 때 한 번만 실행하고 결과를 공유합니다. (스레드 안전)
+  속성 접근은 초기화된 객체로 위임되므로 `client.chat.completions.create(...)`처럼 기존 코드를 그대로 쓸 수 있습니다.
+- lazy_import("fitz"): 속성에 처음 접근할 때 모듈을 import 하는 LazyResource를 반환합니다.
+- 생성된 자원은 LAZY_RESOURCES에 등록되며, warm_up=True 인 자원은 서버가 요청을 받기 시작한 뒤
+  start_background_warm_up()으로 백그라운드 스레드에서 미리 초기화할 수 있습니다.
+- factory가 실패하면 예외를 그대로 전달하고, 다음 get()에서 다시 시도합니다.
+"""
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+LAZY_RESOURCES: Dict[str, "LazyResource"] = {}
+_registry_lock = threading.Lock()
+_warm_up_thread: Optional[threading.Thread] = None
+
+
+class LazyResource:
+    def __init__(self, name: str, factory: Callable[[], Any], warm_up: bool = True):
+        self.name = name
+        self.warm_up = warm_up
+        self.init_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._factory = factory
+        self._value: Any = None
+        self._initialized = False
+        self._lock = threading.Lock()
+        with _registry_lock:
+            LAZY_RESOURCES[name] = self
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+
+    def get(self) -> Any:
+        if self._initialized:
+            return self._value
+        with self._lock:
+            if not self._initialized:
+                start = time.perf_counter()
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise
+                self.init_seconds = time.perf_counter() - start
+                self.last_error = None
+                self._initialized = True
+                print(f"[지연 초기화] {self.name} 초기화 완료 ({self.init_seconds:.2f}s)")
+        return self._value
+
+    def __getattr__(self, attr: str) -> Any:
+        # 내부 속성/특수 메서드 조회(copy, pickle 등)가 초기화를 일으키지 않도록 제외
+        if attr.startswith("__") or attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self._initialized else "pending"
+        return f"<LazyResource {self.name} ({state})>"
+
+
+def lazy_resource(name: str, warm_up: bool = True) -> Callable[[Callable[[], Any]], LazyResource]:
+    """팩토리 함수를 LazyResource로 등록하는 데코레이터입니다."""
+    def decorator(factory: Callable[[], Any]) -> LazyResource:
+        return LazyResource(name, factory, warm_up=warm_up)
+    return decorator
+
+
+def lazy_import(module_name: str, warm_up: bool = True) -> Any:
+    """모듈을 처음 사용할 때 import 합니다. 같은 모듈은 하나의 LazyResource를 공유합니다."""
+    name = f"module:{module_name}"
+    with _registry_lock:
+        existing = LAZY_RESOURCES.get(name)
+    if existing is not None:
+        return existing
+    return LazyResource(name, lambda: importlib.import_module(module_name), warm_up=warm_up)
+
+
+def warm_up_resources(names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """warm_up=True 로 등록된 자원(또는 지정한 이름)을 순서대로 초기화하고 결과를 반환합니다."""
+    with _registry_lock:
+        targets = [r for r in LAZY_RESOURCES.values() if (r.name in names if names is not None else r.warm_up)]
+    start = time.perf_counter()
+    failed = []
+    for resource in targets:
+        try:
+            resource.get()
+        except Exception as e:
+            failed.append(resource.name)
+            print(f"[지연 초기화] {resource.name} 미리 초기화 실패 (첫 사용 시 다시 시도): {e!r}")
+    elapsed = time.perf_counter() - start
+    print(f"[지연 초기화] 워밍업 완료: {len(targets) - len(failed)}/{len(targets)}개 ({elapsed:.2f}s)")
+    return {"total": len(targets), "failed": failed, "seconds": round(elapsed, 3)}
+
+
+def start_background_warm_up() -> threading.Thread:
+    """워밍업을 데몬 스레드에서 시작합니다. (요청 처리와 readiness 응답을 막지 않음)"""
+    global _warm_up_thread
+    if _warm_up_thread is None or not _warm_up_thread.is_alive():
+        _warm_up_thread = threading.Thread(target=warm_up_resources, name="lazy-warm-up", daemon=True)
+        _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def lazy_status() -> Dict[str, Any]:
+    """등록된 지연 초기화 자원의 상태를 반환합니다."""
+    with _registry_lock:
+        resources = list(LAZY_RESOURCES.values())
+    return {
+        "warming_up": _warm_up_thread is not None and _warm_up_thread.is_alive(),
+        "resources": {
+            r.name: {
+                "initialized": r.initialized,
+                "warm_up": r.warm_up,
+                "init_seconds": round(r.init_seconds, 3) if r.init_seconds is not None else None,
+                "last_error": r.last_error,
+            }
+            for r in resources
+        },
+    }
@@ -1,7 +1,13 @@
 import os
+import time
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from dotenv import load_dotenv
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.base import Base
 
 # .env 파일 로드
@@ -17,8 +23,104 @@ DB_NAME = os.getenv("DB_NAME")
 # MySQL 비동기 데이터베이스 URL
 ASYNC_DB_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10")) # 상시 유지하는 연결 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10")) # 풀이 모두 사용 중일 때 추가로 여는 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30")) # 연결을 기다리는 최대 시간(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800")) # 이 시간(초)이 지난 연결은 재생성 (MySQL wait_timeout보다 짧게)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true" # 사용 전 연결 확인 (끊긴 연결 자동 교체)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true" # SQL 로그 출력 (운영에서는 끔)
+
+
+class PoolMetrics:
+    """커넥션 풀 대기 시간과 연결 교체 횟수를 집계합니다."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.slow_waits = 0 # 10ms 이상 기다린 횟수 (풀 부족 신호)
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidated = 0
+        self.active_jobs = {} # job_id -> 세션 시작 시각 (job_session_scope)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if seconds >= 0.01:
+                self.slow_waits += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def session_started(self, key: str):
+        with self._lock:
+            self.active_jobs[key] = time.time()
+
+    def session_finished(self, key: str) -> Optional[float]:
+        """세션 사용 시간(초)을 반환합니다."""
+        with self._lock:
+            started = self.active_jobs.pop(key, None)
+        return time.time() - started if started is not None else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "waits": self.waits,
+                "wait_avg_ms": round(self.wait_total / self.waits * 1000, 2) if self.waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+                "slow_waits": self.slow_waits,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidated": self.invalidated,
+                "active_job_sessions": {job_id: round(time.time() - started, 1) for job_id, started in self.active_jobs.items()},
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """연결을 얻기까지 기다린 시간을 pool_metrics에 기록하는 풀"""
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
 # 비동기 데이터베이스 엔진 생성
-async_engine = create_async_engine(ASYNC_DB_URL, echo=True)
+async_engine = create_async_engine(
+    ASYNC_DB_URL,
+    echo=DB_ECHO,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_metrics.increment("connects")
+
+
+@event.listens_for(async_engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_metrics.increment("invalidated")
+
 
 # 비동기 세션 팩토리 설정
 AsyncSessionLocal = sessionmaker(
@@ -31,3 +133,40 @@ AsyncSessionLocal = sessionmaker(
 async def get_mysql_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+@asynccontextmanager
+async def job_session_scope(job_id: Optional[str] = None) -> AsyncIterator[AsyncSession]:
+    """
+    백그라운드 작업 하나가 사용하는 세션 범위입니다.
+    오류가 나면 롤백하고, 끝나면 세션을 닫아 연결을 풀에 바로 돌려줍니다. (커밋은 작업 코드가 직접 수행)
+    job_id가 주어지면 세션을 사용 중인 작업과 사용 시간을 db_pool_status()에 표시합니다.
+    """
+    session = AsyncSessionLocal()
+    key = job_id or f"session-{id(session)}"
+    pool_metrics.session_started(key)
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+        held = pool_metrics.session_finished(key)
+        if job_id and held is not None:
+            print(f"[DB] Job {job_id} 세션 종료 (사용 {held:.1f}s)")
+
+
+def db_pool_status() -> dict:
+    """현재 커넥션 풀 상태와 누적 대기 지표"""
+    pool = async_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pre_ping": DB_POOL_PRE_PING,
+        **pool_metrics.snapshot(),
+    }
@@ -2,14 +2,15 @@
 
 import concurrent.futures
 from typing import Dict, Any
-from langgraph.graph import StateGraph, END
 
+from app.core.lazy import lazy_resource
 from app.schemas.requirement import RequirementAnalysisState
 from app.agents.srs.classification_agent import classify_requirement_agent
 from app.agents.srs.difficulty_agent import get_difficulty_agent
 from app.agents.srs.importance_agent import get_importance_agent
 # <<< 1. ID 매니저 임포트 >>>
 from app.services.id_management_service import RequirementIdManager
+from app.services.llm_call_service import LLMUnavailableError
 
 # <<< 2. 모듈 레벨에서 ID 매니저 인스턴스 생성 >>>
 # 이렇게 하면 애플리케이션이 실행되는 동안 상태(카운터)가 유지됩니다.
@@ -32,6 +33,8 @@ def node_parallel_assessments(state: RequirementAnalysisState) -> Dict[str, Any]
         try:
             classification_dict = future_classify.result()
             print(f"    - 분류 완료 for: {description_name[:30]}...")
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error in future_classify.result(): {e}")
             classification_dict = {"category_large": "Error", "category_medium": "Error", "category_small": "Error"}
@@ -39,6 +42,8 @@ def node_parallel_assessments(state: RequirementAnalysisState) -> Dict[str, Any]
         try:
             difficulty_str = future_difficulty.result()
             print(f"    - 난이도 평가 완료 for: {description_name[:30]}...")
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error in future_difficulty.result(): {e}")
             difficulty_str = "Error"
@@ -46,6 +51,8 @@ def node_parallel_assessments(state: RequirementAnalysisState) -> Dict[str, Any]
         try:
             importance_str = future_importance.result()
             print(f"    - 중요도 평가 완료 for: {description_name[:30]}...")
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             print(f"Error in future_importance.result(): {e}")
             importance_str = "Error"
@@ -90,22 +97,27 @@ def node_combine_results(state: RequirementAnalysisState) -> Dict[str, Any]:
 
 
 # <<< 4. 그래프 빌더 및 엣지 연결 수정 >>>
-workflow = StateGraph(RequirementAnalysisState)
+# langgraph import와 컴파일은 첫 요청 또는 서버 시작 후 백그라운드 워밍업 시 한 번만 수행합니다.
+@lazy_resource("rfp_graph")
+def compiled_rfp_app():
+    from langgraph.graph import StateGraph, END
 
-# 노드 추가
-workflow.add_node("parallel_processor", node_parallel_assessments)
-workflow.add_node("id_generator", node_generate_id) # 새 노드 추가
-workflow.add_node("final_combiner", node_combine_results)
+    workflow = StateGraph(RequirementAnalysisState)
 
-# 엣지 연결 (데이터 흐름 정의)
-workflow.set_entry_point("parallel_processor")
-workflow.add_edge("parallel_processor", "id_generator") # 평가 후 ID 생성으로 이동
-workflow.add_edge("id_generator", "final_combiner")   # ID 생성 후 결과 취합으로 이동
-workflow.add_edge("final_combiner", END)
+    # 노드 추가
+    workflow.add_node("parallel_processor", node_parallel_assessments)
+    workflow.add_node("id_generator", node_generate_id) # 새 노드 추가
+    workflow.add_node("final_combiner", node_combine_results)
 
-# 그래프 컴파일
-compiled_rfp_app = workflow.compile()
+    # 엣지 연결 (데이터 흐름 정의)
+    workflow.set_entry_point("parallel_processor")
+    workflow.add_edge("parallel_processor", "id_generator") # 평가 후 ID 생성으로 이동
+    workflow.add_edge("id_generator", "final_combiner")   # ID 생성 후 결과 취합으로 이동
+    workflow.add_edge("final_combiner", END)
 
-# 컴파일된 앱 인스턴스 반환 함수
+    # 그래프 컴파일
+    return workflow.compile()
+
+# 컴파일된 앱 인스턴스 반환 함수 (처음 호출 시 컴파일)
 def get_rfp_graph_app():
-    return compiled_rfp_app
\ No newline at end of file
+    return compiled_rfp_app.get()
@@ -6,6 +6,7 @@ from app.models.project import Project
 from app.models.document import Document
 from app.models.requirement import Requirement
 from app.models.source import Source
+from app.models.document_sequence import DocumentSequence
 
 # This ensures all models are imported and their relationships are properly initialized
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     'Project',
     'Document',
     'Requirement',
-    'Source'
+    'Source',
+    'DocumentSequence'
 ] 
\ No newline at end of file
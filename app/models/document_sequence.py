@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, BigInteger
+from app.database import Base
+
+class DocumentSequence(Base):
+    __tablename__ = "tm_document_sequences"
+
+    """
+    doc_id 접두사(ASIS, REQ, MOMD 등)별 다음 번호
+    - 번호는 DocumentIdAllocator가 블록 단위로 예약하므로, 프로세스 재시작 시 사용하지 않은 번호는 건너뛸 수 있습니다.
+    """
+    prefix = Column(String(20), primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=1)
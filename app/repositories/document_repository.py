@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from app.models.document import Document
 
 class DocumentRepository:
@@ -29,6 +30,54 @@ class DocumentRepository:
         doc_id=result.scalar()
         return doc_id if doc_id else None
 
+    async def find_max_doc_number_by_prefix(self, prefix: str) -> int:
+        """
+        접두사별 기존 문서 번호의 최댓값 (숫자 기준 비교). 시퀀스 행을 처음 만들 때 시작 번호를 정하는 데만 사용합니다.
+        """
+        query = text("""
+            SELECT MAX(CAST(SUBSTRING(doc_id, CHAR_LENGTH(:prefix) + 2) AS UNSIGNED))
+            FROM tm_documents
+            WHERE doc_id LIKE CONCAT(:prefix, '-%')
+        """)
+        result = await self.db.execute(query, {"prefix": prefix})
+        return result.scalar() or 0
+
+    async def reserve_doc_number_block(self, prefix: str, size: int) -> int:
+        """
+        tm_document_sequences 에서 접두사의 번호 size개를 원자적으로 예약하고 첫 번호를 반환합니다.
+        행 잠금(SELECT ... FOR UPDATE) 안에서 증가시키므로 여러 프로세스/레플리카가 동시에 호출해도 번호가 겹치지 않습니다.
+        시퀀스 행이 없으면 잠금 없이 먼저 만들어 커밋합니다. 없는 행에 FOR UPDATE를 걸면 갭 잠금이 잡혀,
+        두 레플리카가 같은 접두사를 처음 예약할 때 INSERT끼리 교착 상태(deadlock)가 됩니다.
+        """
+        exists = (await self.db.execute(
+            text("SELECT 1 FROM tm_document_sequences WHERE prefix = :prefix"), {"prefix": prefix}
+        )).scalar()
+        if exists is None:
+            seed = await self.find_max_doc_number_by_prefix(prefix) + 1
+            await self.db.execute(
+                text("INSERT IGNORE INTO tm_document_sequences (prefix, next_value) VALUES (:prefix, :seed)"),
+                {"prefix": prefix, "seed": seed}
+            )
+            await self.db.commit()
+
+        select_query = text("SELECT next_value FROM tm_document_sequences WHERE prefix = :prefix FOR UPDATE")
+        for attempt in range(2):
+            try:
+                next_value = (await self.db.execute(select_query, {"prefix": prefix})).scalar()
+                await self.db.execute(
+                    text("UPDATE tm_document_sequences SET next_value = :next_value WHERE prefix = :prefix"),
+                    {"prefix": prefix, "next_value": next_value + size}
+                )
+                await self.db.commit()
+                return next_value
+            except DBAPIError as e:
+                await self.db.rollback()
+                # 교착 상태(1213)/잠금 대기 시간 초과(1205)는 한 번 다시 시도
+                error_code = e.orig.args[0] if e.orig is not None and e.orig.args else None
+                if attempt or error_code not in (1205, 1213):
+                    raise
+                print(f"[문서 ID] {prefix} 번호 블록 예약 재시도 (MySQL 오류 {error_code})")
+
 # Create a singleton instance
 document_repository = None
 
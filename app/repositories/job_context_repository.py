@@ -0,0 +1,33 @@
+from typing import Optional, Tuple
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Document, Member, Project
+
+JobContext = Tuple[Optional[Project], Optional[Member], Optional[Document]]
+
+class JobContextRepository:
+    """
+    작업이 사용하는 프로젝트/멤버/문서 엔티티를 한 번의 쿼리로 조회합니다.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_job_context(self, project_id: int, member_id: int, document_id: str) -> JobContext:
+        # 세 엔티티 모두 기본 키로 한 행씩만 일치하므로, 결합 조회 결과는 0행 또는 1행입니다.
+        query = (
+            select(Project, Member, Document)
+            .join_from(Project, Member, true())
+            .join_from(Project, Document, true())
+            .where(Project.project_id == project_id)
+            .where(Member.member_id == member_id)
+            .where(Document.doc_id == document_id)
+        )
+        row = (await self.db.execute(query)).first()
+        if row is not None:
+            return row[0], row[1], row[2]
+        # 어느 엔티티가 없는지 알리기 위해 개별 조회 (세션 identity map에 있으면 쿼리 없이 반환)
+        return (
+            await self.db.get(Project, project_id),
+            await self.db.get(Member, member_id),
+            await self.db.get(Document, document_id),
+        )
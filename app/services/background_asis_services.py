@@ -1,12 +1,19 @@
 import os
+import hashlib
 import tempfile
+from io import BytesIO
 from pathlib import Path
-from markdown_pdf import MarkdownPdf, Section
+from typing import Any, Dict, Optional
 
 # 다른 import 구문들은 이미 존재한다고 가정합니다.
-from app.core.config import CHUNK_SIZE, CHUNK_OVERLAP
-from app.services.file_processing_service import extract_pages_as_documents, create_chunks_from_documents
+from app.services.file_processing_service import extract_pages_as_documents
+from app.services.chunking_service import chunk_documents_for_agent
+from app.services.document_structure_service import prepare_documents_for_agent
+from app.core.lazy import lazy_import
+
+markdown_pdf = lazy_import("markdown_pdf") # PDF 렌더러 (첫 보고서 생성 또는 워밍업 시 import)
 from app.agents.asis.asis_extraction_agent import extract_asis_and_generate_report
+from app.services.job_progress_service import job_progress
 
 
 def clean_markdown_fences(markdown_text: str) -> str:
@@ -24,11 +31,53 @@ def clean_markdown_fences(markdown_text: str) -> str:
     return text
 
 
-def run_as_is_analysis_and_return_bytes(pdf_content_bytes: bytes, output_pdf_path: Path) -> bytes:
+def render_markdown_to_pdf(markdown_text: str, output_pdf_path: Optional[Path] = None) -> Dict[str, Any]:
     """
-    (수정됨) PDF를 분석하여, 결과를 'output_pdf_path'에 파일로 저장하고,
-    동시에 해당 파일의 내용을 바이트(bytes) 객체로 반환합니다.
+    마크다운 보고서를 PDF로 변환합니다.
+    - output_pdf_path가 주어지면 최종 경로에 한 번만 기록하고(임시 파일 작성 후 교체) 다시 읽지 않습니다.
+      반환값: {"path", "size", "sha256"}
+    - 경로가 없으면 메모리 버퍼에 렌더링합니다. 반환값: {"buffer": BytesIO(위치 0), "size", "sha256"}
+    크기와 체크섬은 렌더링된 버퍼에서 바로 계산합니다.
     """
+    user_css = "body { font-family: 'NanumGothic', 'Malgun Gothic', sans-serif; } @page { margin: 1in; }"
+    pdf_converter = markdown_pdf.MarkdownPdf(toc_level=2)
+    pdf_converter.add_section(markdown_pdf.Section(markdown_text), user_css=user_css)
+
+    buffer = BytesIO()
+    pdf_converter.save(buffer)
+    view = buffer.getbuffer()
+    info: Dict[str, Any] = {"size": view.nbytes, "sha256": hashlib.sha256(view).hexdigest()}
+    if output_pdf_path is None:
+        view.release()
+        buffer.seek(0)
+        return {"buffer": buffer, **info}
+
+    output_pdf_path = Path(output_pdf_path)
+    output_pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_pdf_path.with_name(output_pdf_path.name + ".tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(view)
+        os.replace(temp_path, output_pdf_path)
+    finally:
+        view.release()
+        buffer.close()
+        if temp_path.exists():
+            temp_path.unlink()
+    return {"path": str(output_pdf_path), **info}
+
+
+def run_as_is_analysis_to_file(pdf_content_bytes: bytes, output_pdf_path: Path, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    PDF를 분석하여 결과 보고서를 'output_pdf_path'에 저장하고, 저장된 파일 정보({"path", "size", "sha256", "markdown_path"})를 반환합니다.
+    보고서 바이트는 메모리에 들고 있지 않으며, 다운로드는 저장된 파일에서 바로 제공됩니다.
+    원본 Markdown도 같은 이름의 .md 파일로 남겨, 다른 형식(docx/html 등)은 LLM 단계 없이 렌더링합니다.
+    job_id가 주어지면 단계별 진행 상황을 job_progress로 알립니다.
+    """
+    def set_stage(stage: str, total: Optional[int] = None):
+        if job_id:
+            job_progress.set_stage(job_id, stage, total=total)
+
     with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
         temp_pdf.write(pdf_content_bytes)
         temp_pdf_path = temp_pdf.name
@@ -36,37 +85,34 @@ def run_as_is_analysis_and_return_bytes(pdf_content_bytes: bytes, output_pdf_pat
     try:
         # 1 & 2. PDF 텍스트 추출 및 청크 분할 (이전과 동일)
         print(f"임시 파일 처리 시작: {temp_pdf_path}")
+        set_stage("extracting_pages")
         docs = extract_pages_as_documents(temp_pdf_path)
         if not docs: raise ValueError("PDF에서 텍스트를 추출하지 못했습니다.")
+        docs = prepare_documents_for_agent(temp_pdf_path, docs, "ASIS") # 현황 섹션만 사용
 
         print("문서를 청크로 분할 중...")
-        chunks = create_chunks_from_documents(docs, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+        set_stage("chunking")
+        chunks = chunk_documents_for_agent(docs, "ASIS")
         if not chunks: raise ValueError("문서를 청크로 분할하지 못했습니다.")
 
         # 3 & 4. LLM 호출 및 결과 정리 (이전과 동일)
         print("AS-IS 보고서 생성 시작 (LLM 호출)...")
-        markdown_report_raw = extract_asis_and_generate_report(chunks)
+        set_stage("extracting_asis", total=len(chunks))
+        markdown_report_raw = extract_asis_and_generate_report(
+            chunks, on_chunk_done=(lambda _: job_progress.advance(job_id)) if job_id else None
+        )
         markdown_report_clean = clean_markdown_fences(markdown_report_raw)
-        
-        # 5. PDF 생성
-        print("마크다운 콘텐츠를 PDF로 변환 시작...")
-        user_css = "body { font-family: 'NanumGothic', 'Malgun Gothic', sans-serif; } @page { margin: 1in; }"
-        pdf_converter = MarkdownPdf(toc_level=2)
-        pdf_converter.add_section(Section(markdown_report_clean), user_css=user_css)
-        
-        # 6-1. 지정된 경로에 파일로 먼저 저장합니다.
-        print(f"PDF 파일 저장 중... 경로: {output_pdf_path}")
-        pdf_converter.save(output_pdf_path)
-        print("✅ PDF 파일 저장 성공!")
-
-        # 6-2. 저장된 파일을 다시 '바이너리 읽기 모드(rb)'로 열어서 내용을 읽습니다.
-        print(f"저장된 PDF 파일을 바이트로 읽는 중... 경로: {output_pdf_path}")
-        with open(output_pdf_path, 'rb') as f:
-            output_pdf_bytes = f.read()
-        print("✅ PDF 바이트 변환 성공!")
-        
-        return output_pdf_bytes
+        markdown_path = Path(output_pdf_path).with_suffix(".md")
+        markdown_path.parent.mkdir(parents=True, exist_ok=True)
+        markdown_path.write_text(markdown_report_clean, encoding="utf-8")
+
+        # 5. PDF 생성 및 저장 (최종 경로에 한 번만 기록)
+        print(f"마크다운 콘텐츠를 PDF로 변환 및 저장 시작... 경로: {output_pdf_path}")
+        set_stage("rendering_pdf")
+        report_file = render_markdown_to_pdf(markdown_report_clean, output_pdf_path)
+        print(f"✅ PDF 파일 저장 성공! ({report_file['size']} bytes)")
 
+        return {**report_file, "markdown_path": str(markdown_path)}
 
     except Exception as e:
         print(f"❌ 분석/저장/변환 중 오류 발생: {e}")
@@ -1,10 +1,11 @@
 import os
 import traceback
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
 
 from app.schemas.requirement import RequirementAnalysisState
 from app.core.config import INPUT_DIR, OUTPUT_CSV_DIR, OUTPUT_JSON_DIR
 from app.services.id_management_service import RequirementIdManager
+from app.services.llm_call_service import LLMUnavailableError
 
 os.makedirs(INPUT_DIR, exist_ok=True)
 os.makedirs(OUTPUT_CSV_DIR, exist_ok=True)
@@ -12,10 +13,15 @@ os.makedirs(OUTPUT_JSON_DIR, exist_ok=True)
 
 def process_requirements_in_memory(
     requirements_to_process: List[Dict[str, Any]],
-    compiled_app: Any
+    compiled_app: Any,
+    completed_results: Optional[Dict[int, Dict[str, Any]]] = None,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
 ) -> List[Dict[str, Any]]:
     """
     백그라운드에서 LangGraph를 사용하여 요구사항을 처리하고, 고유 ID가 포함된 결과 리스트를 반환합니다.
+    completed_results(인덱스 -> 결과)에 있는 항목은 다시 처리하지 않고, 새로 처리한 항목은 on_result로 알립니다. (체크포인트 재개용)
+    모든 LLM 제공자를 사용할 수 없으면(LLMUnavailableError) 오류 결과를 남기지 않고 예외를 그대로 발생시킵니다.
+    작업은 FAILED가 되고, 재개하면 이미 평가된 항목 다음부터 다시 처리합니다.
     """
     print(f"요구사항 처리 시작: {len(requirements_to_process)}개 항목")
     
@@ -27,6 +33,9 @@ def process_requirements_in_memory(
     total_requirements = len(requirements_to_process)
 
     for i, req_data in enumerate(requirements_to_process):
+        if completed_results and i in completed_results:
+            all_final_results.append(completed_results[i])
+            continue
         print(f"\n[{i+1}/{total_requirements}] 처리 중: '{req_data.get('description_content', 'N/A')[:70]}...'")
         
         inputs_for_graph: RequirementAnalysisState = {
@@ -48,7 +57,13 @@ def process_requirements_in_memory(
             # LangGraph의 최종 결과물인 'combined_results' 딕셔너리 전체를 가져와야 합니다.
             if final_state and "combined_results" in final_state:
                 # ✅ 올바른 방법: 'combined_results' 딕셔너리 전체를 추가
-                all_final_results.append(final_state["combined_results"])
+                combined_results = final_state["combined_results"]
+                # 중복 제거 단계에서 병합된 출처(페이지/원문 문장)는 그래프 상태에 없으므로 그대로 전달
+                if req_data.get("sources"):
+                    combined_results["sources"] = req_data["sources"]
+                all_final_results.append(combined_results)
+                if on_result:
+                    on_result(i, combined_results)
             else:
                 # 오류 처리
                 error_msg = f"요구사항 '{req_data.get('description_name')}' 처리 후 'combined_results' 누락."
@@ -59,6 +74,8 @@ def process_requirements_in_memory(
                     "id": "REQ-ERR-ERR-0000"
                 })
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             # 예외 처리
             error_msg = f"요구사항 '{req_data.get('description_name')}' 처리 중 오류: {str(e)}"
@@ -0,0 +1,146 @@
+# app/services/checkpoint_service.py
+"""
+SRS 작업의 단계별 중간 산출물(체크포인트)을 로컬 디스크에 저장하는 서비스입니다.
+
+작업마다 JOB_CHECKPOINT_DIR/<job_id>/ 아래에 다음 파일을 둡니다.
+- meta.json            : 작업 정보 (파일명, 프로젝트/멤버/문서 ID, 추출 방식 등) — 재개 시 작업 상태 복원에 사용
+- input.pdf            : 업로드된 원본 PDF
+- <stage>.json.gz      : 완료된 단계의 결과 (gzip JSON)
+- <stage>.items.jsonl  : 진행 중인 단계의 항목별 결과 (한 줄에 {"index": i, "item": ...}, 항목이 끝날 때마다 추가)
+
+POST /jobs/{id}/resume 으로 재실행하면 완료된 단계는 결과를 읽어오고, 진행 중이던 단계는 끝난 항목을 건너뜁니다.
+worker 모드에서는 API와 워커가 같은 볼륨을 보도록 JOB_CHECKPOINT_DIR 을 공유 디렉토리로 지정해야 합니다.
+"""
+import os
+import json
+import gzip
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import JOB_CHECKPOINT_DIR
+
+# SRS 파이프라인 단계 (순서대로)
+SRS_STAGES = ("pages", "chunks", "sentences", "refined", "assessed", "persisted")
+
+
+class JobCheckpoint:
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.directory = os.path.join(JOB_CHECKPOINT_DIR, job_id)
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path("meta.json"))
+
+    # --- 작업 정보 / 입력 파일 ---
+    def save_meta(self, meta: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+
+    def load_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_input(self, content: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path("input.pdf"), "wb") as f:
+            f.write(content)
+
+    def load_input(self) -> Optional[bytes]:
+        try:
+            with open(self._path("input.pdf"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    # --- 완료된 단계 ---
+    def has_stage(self, stage: str) -> bool:
+        return os.path.exists(self._path(f"{stage}.json.gz"))
+
+    def save_stage(self, stage: str, data: Any):
+        """단계 결과를 저장하고 해당 단계의 항목별 진행 파일을 정리합니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._path(f"{stage}.json.gz.tmp")
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        os.replace(temp_path, self._path(f"{stage}.json.gz"))
+        try:
+            os.remove(self._path(f"{stage}.items.jsonl"))
+        except FileNotFoundError:
+            pass
+
+    def load_stage(self, stage: str) -> Any:
+        with gzip.open(self._path(f"{stage}.json.gz"), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    # --- 진행 중인 단계의 항목별 결과 ---
+    def append_item(self, stage: str, index: int, item: Any):
+        """항목 하나가 끝날 때마다 호출합니다. (여러 스레드/태스크에서 호출 가능)"""
+        line = json.dumps({"index": index, "item": item}, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(f"{stage}.items.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+
+    def append_items(self, stage: str, items: Dict[int, Any]):
+        """여러 항목을 한 번에 기록합니다. (일괄 처리 단위가 끝났을 때)"""
+        lines = "".join(
+            json.dumps({"index": index, "item": item}, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for index, item in items.items()
+        )
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(f"{stage}.items.jsonl"), "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+
+    def load_items(self, stage: str) -> Dict[int, Any]:
+        items: Dict[int, Any] = {}
+        try:
+            with open(self._path(f"{stage}.items.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # 기록 도중 중단된 마지막 줄
+                    items[record["index"]] = record["item"]
+        except FileNotFoundError:
+            pass
+        return items
+
+    def last_completed_stage(self) -> Optional[str]:
+        completed = [stage for stage in SRS_STAGES if self.has_stage(stage)]
+        return completed[-1] if completed else None
+
+    def summary(self) -> Dict[str, Any]:
+        """완료된 단계와 진행 중인 단계의 완료 항목 수를 반환합니다."""
+        return {
+            "completed_stages": [stage for stage in SRS_STAGES if self.has_stage(stage)],
+            "partial_items": {
+                stage: len(self.load_items(stage))
+                for stage in SRS_STAGES
+                if not self.has_stage(stage) and os.path.exists(self._path(f"{stage}.items.jsonl"))
+            },
+        }
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def documents_to_records(documents: List[Document]) -> List[Dict[str, Any]]:
+    return [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents]
+
+
+def records_to_documents(records: List[Dict[str, Any]]) -> List[Document]:
+    return [Document(page_content=record["page_content"], metadata=record["metadata"]) for record in records]
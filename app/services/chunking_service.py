@@ -0,0 +1,204 @@
+# app/services/chunking_service.py
+"""
+토큰 수 기반 청킹 서비스입니다.
+
+문자 수 기준(CHUNK_SIZE)으로 자르면 한글/영문/표 비율에 따라 실제 토큰 수가 크게 달라지므로,
+로컬 토크나이저(tiktoken)로 길이를 재고 에이전트별 목표 토큰 수(CHUNK_TOKEN_BUDGETS)까지 페이지를 채워 넣습니다.
+- 페이지 경계를 유지합니다. 한 페이지가 예산을 넘는 경우에만 장/절 제목 → 문단 → 줄 순서로 나눕니다.
+- 새 장/절이 시작되는 페이지에서는 청크가 충분히 찼다면(CHUNK_HEADING_BREAK_RATIO) 새 청크를 시작합니다.
+- 청크 metadata에 page_number(첫 페이지), page_range, page_spans(청크 내 페이지별 위치), token_count를 기록합니다.
+"""
+import re
+import statistics
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import (
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    CHUNK_STRATEGY,
+    CHUNK_TOKENIZER_ENCODING,
+    CHUNK_TOKEN_BUDGETS,
+    CHUNK_TOKEN_OVERLAP,
+    CHUNK_HEADING_BREAK_RATIO,
+)
+from app.core.lazy import lazy_import
+from app.services.file_processing_service import create_chunks_from_documents
+
+text_splitters = lazy_import("langchain_text_splitters") # 큰 페이지를 나눌 때만 필요하므로 첫 사용 시 import
+
+# 페이지 첫머리의 장/절 제목 (예: "제2장", "Ⅲ. 사업 내용", "3. 요구사항", "3.1 기능 요구사항")
+# 숫자 제목은 "3." 처럼 점이 있거나 "3.1" 처럼 여러 단계인 경우만 인정 ("3 개월 이내" 같은 본문 줄 제외)
+HEADING_PATTERN = re.compile(r"^\s*(제\s*\d+\s*[장절]|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩIVX]+\.\s|\d+(\.\d+)+\.?\s+\S|\d+\.\s+\S)")
+MAX_HEADING_LINE_LENGTH = 60 # 이보다 긴 첫 줄은 번호 목록 항목으로 보고 제목으로 취급하지 않음
+
+# 한 페이지가 예산을 넘을 때 사용할 분할 기준 (장/절 제목과 글머리 기호를 문단보다 먼저 고려)
+HEADING_AWARE_SEPARATORS = [
+    r"\n{3,}",
+    r"\n(?=\s*제\s*\d+\s*[장절])",
+    r"\n(?=\s*(?:\d+(?:\.\d+)+\.?|\d+\.)\s+\S)",
+    r"\n(?=\s*[□■◆◇○●▶※]\s?)",
+    r"\n\n",
+    r"\n",
+    r"\.\s",
+    r"\s",
+    "",
+]
+
+PAGE_JOINER = "\n\n"
+
+
+@lru_cache(maxsize=1)
+def get_token_length_function() -> Callable[[str], int]:
+    """
+    청킹에 사용할 토큰 길이 함수를 반환합니다.
+    tiktoken 인코딩을 불러올 수 없는 환경(오프라인 등)에서는 문자 종류별 추정치를 사용합니다.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(CHUNK_TOKENIZER_ENCODING)
+        print(f"청킹 토크나이저: tiktoken '{CHUNK_TOKENIZER_ENCODING}'")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception as e:
+        print(f"경고: tiktoken 인코딩 '{CHUNK_TOKENIZER_ENCODING}'을 불러오지 못해 추정 토큰 수를 사용합니다: {e}")
+        return estimate_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """한글은 글자당 약 1토큰, 그 외 문자는 약 4글자당 1토큰으로 추정합니다."""
+    hangul = len(re.findall(r"[가-힣ㄱ-ㆎ]", text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def _split_oversized_page(page: Document, token_budget: int, length_function: Callable[[str], int]) -> List[Document]:
+    splitter = text_splitters.RecursiveCharacterTextSplitter(
+        chunk_size=token_budget,
+        chunk_overlap=min(CHUNK_TOKEN_OVERLAP, token_budget // 4),
+        length_function=length_function,
+        separators=HEADING_AWARE_SEPARATORS,
+        is_separator_regex=True,
+        keep_separator=False,
+    )
+    return splitter.split_documents([page])
+
+
+def _starts_with_heading(text: str) -> bool:
+    """페이지 첫 줄이 장/절 제목인지 확인합니다."""
+    first_line = text.lstrip().split("\n", 1)[0].strip()
+    return len(first_line) <= MAX_HEADING_LINE_LENGTH and bool(HEADING_PATTERN.match(first_line))
+
+
+def _build_chunk(parts: List[Document], length_function: Callable[[str], int]) -> Document:
+    texts, spans, offset = [], [], 0
+    for part in parts:
+        text = part.page_content
+        texts.append(text)
+        spans.append((part.metadata.get("page_number"), offset, offset + len(text)))
+        offset += len(text) + len(PAGE_JOINER)
+    content = PAGE_JOINER.join(texts)
+    first_page, last_page = spans[0][0], spans[-1][0]
+    metadata = dict(parts[0].metadata)
+    metadata.update({
+        "page_number": first_page,
+        "page_range": f"{first_page}" if first_page == last_page else f"{first_page}-{last_page}",
+        "page_spans": spans,
+        "token_count": length_function(content),
+    })
+    return Document(page_content=content, metadata=metadata)
+
+
+def create_token_chunks_from_documents(
+    documents: List[Document],
+    token_budget: int,
+    length_function: Optional[Callable[[str], int]] = None,
+) -> List[Document]:
+    """
+    페이지 Document 목록을 목표 토큰 수(token_budget)에 맞춰 청크로 묶습니다.
+    여러 페이지를 한 청크로 채우므로 페이지 간 중복(overlap)은 두지 않고,
+    예산을 넘는 페이지를 나눌 때만 CHUNK_TOKEN_OVERLAP 만큼 중복시킵니다.
+    """
+    if not documents:
+        return []
+    length_function = length_function or get_token_length_function()
+    print(f"Document 토큰 기반 청킹 중 (목표 토큰 수: {token_budget})...")
+
+    chunks: List[Document] = []
+    current: List[Document] = []
+    current_tokens = 0
+    joiner_tokens = length_function(PAGE_JOINER)
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(_build_chunk(current, length_function))
+        current, current_tokens = [], 0
+
+    for page in documents:
+        page_tokens = length_function(page.page_content)
+        if page_tokens > token_budget:
+            flush()
+            for part in _split_oversized_page(page, token_budget, length_function):
+                chunks.append(_build_chunk([part], length_function))
+            continue
+
+        starts_section = bool(page.metadata.get("section_start") or _starts_with_heading(page.page_content))
+        if current and (
+            current_tokens + joiner_tokens + page_tokens > token_budget
+            or (starts_section and current_tokens >= token_budget * CHUNK_HEADING_BREAK_RATIO)
+        ):
+            flush()
+        current_tokens += page_tokens + (joiner_tokens if current else 0)
+        current.append(page)
+    flush()
+
+    report_chunk_token_distribution(chunks, token_budget)
+    return chunks
+
+
+def report_chunk_token_distribution(chunks: List[Document], token_budget: int) -> Dict[str, float]:
+    """청크별 토큰 수 분포를 출력하고 요약 값을 반환합니다."""
+    counts = sorted(chunk.metadata.get("token_count", 0) for chunk in chunks)
+    if not counts:
+        return {}
+    summary = {
+        "chunks": len(counts),
+        "total_tokens": sum(counts),
+        "min": counts[0],
+        "p50": counts[len(counts) // 2],
+        "p90": counts[min(len(counts) - 1, int(len(counts) * 0.9))],
+        "max": counts[-1],
+        "mean_fill": round(statistics.mean(counts) / token_budget, 3),
+    }
+    print(
+        f"총 {summary['chunks']}개의 청크(Document) 생성 완료. "
+        f"토큰 수 min {summary['min']} / p50 {summary['p50']} / p90 {summary['p90']} / max {summary['max']}, "
+        f"총 {summary['total_tokens']} 토큰, 평균 채움률 {summary['mean_fill']:.0%}"
+    )
+    return summary
+
+
+def chunk_documents_for_agent(documents: List[Document], agent: str) -> List[Document]:
+    """
+    에이전트(SRS/ASIS)에 맞는 청크를 생성합니다.
+    CHUNK_STRATEGY=char 이면 기존 문자 수 기반 분할을 사용합니다.
+    """
+    if CHUNK_STRATEGY == "char":
+        return create_chunks_from_documents(documents, CHUNK_SIZE, CHUNK_OVERLAP)
+    return create_token_chunks_from_documents(documents, CHUNK_TOKEN_BUDGETS[agent])
+
+
+def resolve_chunk_page_number(chunk: Document, sentence: str) -> Optional[int]:
+    """
+    여러 페이지를 묶은 청크에서 문장이 실제로 위치한 페이지 번호를 찾습니다.
+    찾지 못하면 청크의 첫 페이지 번호를 반환합니다.
+    """
+    spans = chunk.metadata.get("page_spans")
+    if spans and sentence:
+        position = chunk.page_content.find(sentence.strip()[:40])
+        if position >= 0:
+            for page_number, start, end in spans:
+                if start <= position < end + len(PAGE_JOINER):
+                    return page_number
+    return chunk.metadata.get("page_number")
@@ -0,0 +1,119 @@
+# app/services/circuit_breaker_service.py
+"""
+외부 의존성(LLM 제공자 등)별 서킷 브레이커입니다.
+
+- closed    : 정상. 연속 실패가 LLM_BREAKER_FAILURE_THRESHOLD 번이 되면 open 으로 전환합니다.
+- open      : 호출을 바로 거절합니다. LLM_BREAKER_OPEN_SECONDS 가 지나면 half_open 으로 전환합니다.
+- half_open : LLM_BREAKER_HALF_OPEN_MAX_CALLS 개의 시험 호출만 허용합니다. 성공하면 closed, 실패하면 다시 open.
+에이전트는 스레드 풀에서 LLM을 호출하므로 상태 변경은 스레드 안전하게 처리합니다.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import (
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_OPEN_SECONDS,
+    LLM_BREAKER_HALF_OPEN_MAX_CALLS,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, open_seconds: float, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = max(half_open_max_calls, 1)
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._last_error: Optional[str] = None
+        self._counts = {"success": 0, "failure": 0, "rejected": 0, "opened": 0}
+        self._lock = threading.Lock()
+
+    def _refresh_state(self, now: float):
+        if self._state == STATE_OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._half_open_in_flight = 0
+            print(f"[서킷 브레이커] {self.name}: half_open (시험 호출 허용)")
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            return self._state
+
+    def allow_request(self) -> bool:
+        """호출해도 되면 True. half_open 상태에서는 시험 호출 슬롯을 하나 차지합니다."""
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self._counts["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._counts["success"] += 1
+            # open 전에 시작된 느린 호출의 성공으로 open 상태를 풀지 않음 (차단 시간은 그대로 유지)
+            if self._state == STATE_OPEN:
+                return
+            self._consecutive_failures = 0
+            if self._state == STATE_HALF_OPEN:
+                print(f"[서킷 브레이커] {self.name}: closed (시험 호출 성공)")
+                self._half_open_in_flight = 0
+                self._state = STATE_CLOSED
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self._counts["failure"] += 1
+            self._consecutive_failures += 1
+            self._last_error = reason
+            if self._state == STATE_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    self._counts["opened"] += 1
+                    print(f"[서킷 브레이커] {self.name}: open ({self.open_seconds:.0f}s 동안 호출 차단) - {reason}")
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in_seconds": round(max(self.open_seconds - (now - self._opened_at), 0), 1) if self._state == STATE_OPEN else 0,
+                "last_error": self._last_error,
+                **self._counts,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """이름별 서킷 브레이커를 반환합니다. (없으면 설정값으로 생성)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name, LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_OPEN_SECONDS, LLM_BREAKER_HALF_OPEN_MAX_CALLS
+            )
+        return breaker
+
+
+def circuit_breaker_status() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,56 @@
+# app/services/document_id_service.py
+"""
+문서 ID(ASIS-000123 등)를 발급합니다.
+
+tm_document_sequences 테이블에 접두사별 다음 번호를 두고, 프로세스마다 DOC_ID_BLOCK_SIZE 개씩 번호 블록을
+원자적으로 예약한 뒤 메모리에서 나눠 줍니다. 따라서 대부분의 발급은 DB 조회 없이 O(1)이며,
+여러 작업/레플리카가 동시에 발급해도 같은 ID가 나오지 않습니다.
+- 시퀀스 행이 없는 접두사는 처음 예약할 때 기존 문서 번호의 최댓값(숫자 기준) 다음부터 시작합니다.
+- 프로세스가 종료되면 예약했지만 쓰지 않은 번호는 건너뛰므로 ID에 빈 번호가 생길 수 있습니다.
+- 번호는 6자리로 채우며, 999999를 넘으면 자릿수가 늘어납니다.
+"""
+import asyncio
+from typing import Dict, List
+
+from app.core.config import DOC_ID_BLOCK_SIZE
+from app.core.mysql_config import AsyncSessionLocal, async_engine
+from app.models.document_sequence import DocumentSequence
+from app.repositories.document_repository import DocumentRepository
+
+
+class DocumentIdAllocator:
+    def __init__(self, block_size: int):
+        self.block_size = max(block_size, 1)
+        self._blocks: Dict[str, List[int]] = {} # prefix -> [다음 번호, 블록 끝(미포함)]
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._table_ready = False
+
+    async def _ensure_table(self):
+        if self._table_ready:
+            return
+        async with async_engine.begin() as conn:
+            await conn.run_sync(DocumentSequence.__table__.create, checkfirst=True)
+        self._table_ready = True
+
+    async def _reserve_block(self, prefix: str) -> List[int]:
+        await self._ensure_table()
+        # 호출한 작업의 트랜잭션과 별개로 바로 커밋해야 하므로 전용 세션을 사용
+        async with AsyncSessionLocal() as db:
+            start = await DocumentRepository(db).reserve_doc_number_block(prefix, self.block_size)
+        print(f"[문서 ID] {prefix} 번호 블록 예약: {start} ~ {start + self.block_size - 1}")
+        return [start, start + self.block_size]
+
+    async def allocate(self, prefix: str) -> str:
+        """접두사의 다음 문서 ID를 발급합니다. 예: allocate("ASIS") -> "ASIS-000124" """
+        lock = self._locks.setdefault(prefix, asyncio.Lock())
+        async with lock:
+            block = self._blocks.get(prefix)
+            if block is None or block[0] >= block[1]:
+                block = self._blocks[prefix] = await self._reserve_block(prefix)
+            number = block[0]
+            block[0] += 1
+        return f"{prefix}-{number:06d}"
+
+
+# 애플리케이션 전역 문서 ID 발급기
+document_id_allocator = DocumentIdAllocator(DOC_ID_BLOCK_SIZE)
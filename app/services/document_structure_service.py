@@ -0,0 +1,287 @@
+# app/services/document_structure_service.py
+"""
+RFP 문서의 구조(목차/장·절 제목)를 분석해 섹션 트리를 만들고,
+파이프라인별로 필요한 섹션(SRS: "요구사항", As-Is: "현황")의 페이지만 골라내는 서비스입니다.
+
+- PDF 북마크(outline)가 있으면 그대로 섹션 트리로 사용합니다.
+- 북마크가 없으면 page.get_text("dict")의 글자 크기/굵기로 제목 줄을 찾아 트리를 만듭니다.
+- 섹션이 페이지 중간에서 시작하면 페이지를 제목 위치에서 나눠, 청크 경계가 섹션 경계와 맞도록 합니다.
+"""
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+from pydantic import BaseModel, Field
+
+from app.core.config import (
+    STRUCTURE_ROUTING_ENABLED,
+    SECTION_ROUTING_KEYWORDS,
+)
+from app.core.lazy import lazy_import
+
+fitz = lazy_import("fitz") # PyMuPDF (첫 사용 또는 워밍업 시 import)
+
+NUMBERED_HEADING_PATTERN = re.compile(r"^\s*(제\s*\d+\s*[장절]|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+\.?\s|[IVX]+\.\s|\d+(\.\d+)*\.?\s+\S|[가-하]\.\s)")
+TOC_PAGE_PATTERN = re.compile(r"(목\s*차|차\s*례|contents)", re.IGNORECASE)
+TOC_LEADER_PATTERN = re.compile(r"(\.{3,}|·{3,}|…{2,})\s*\d+\s*$", re.MULTILINE)
+
+MAX_HEADING_LENGTH = 60
+MAX_HEADING_LEVEL = 3
+MAX_TOC_SCAN_PAGES = 6
+
+
+class DocumentSection(BaseModel):
+    title: str
+    level: int
+    start_page: int
+    end_page: int
+    source: str = Field(description="toc: PDF 북마크 / heading: 글꼴 기반 제목 검출")
+    children: List["DocumentSection"] = Field(default_factory=list)
+
+
+class DocumentStructure(BaseModel):
+    page_count: int
+    sections: List[DocumentSection] = Field(default_factory=list)
+    toc_pages: List[int] = Field(default_factory=list)
+
+    def iter_sections(self):
+        stack = list(reversed(self.sections))
+        while stack:
+            section = stack.pop()
+            yield section
+            stack.extend(reversed(section.children))
+
+
+def _open_pdf(pdf_source) -> "fitz.Document":
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return fitz.open(stream=pdf_source, filetype="pdf")
+    return fitz.open(pdf_source)
+
+
+def detect_toc_page_numbers(page_texts: Sequence[str]) -> List[int]:
+    """앞쪽 페이지 중 '목차' 표기나 점선 + 페이지 번호 줄이 많은 페이지를 목차 페이지로 판단합니다."""
+    toc_pages = []
+    for page_index, text in enumerate(page_texts[:MAX_TOC_SCAN_PAGES]):
+        leaders = len(TOC_LEADER_PATTERN.findall(text))
+        if leaders >= 3 or (TOC_PAGE_PATTERN.search(text[:200]) and leaders >= 1):
+            toc_pages.append(page_index + 1)
+        elif toc_pages:
+            break
+    return toc_pages
+
+
+def _sections_from_outline(document: "fitz.Document") -> List[Dict[str, Any]]:
+    flat = []
+    for level, title, page in document.get_toc(simple=True):
+        if page < 1 or not title.strip():
+            continue
+        flat.append({"title": title.strip(), "level": min(level, MAX_HEADING_LEVEL), "start_page": page, "source": "toc"})
+    return flat
+
+
+def _sections_from_headings(document: "fitz.Document", skip_pages: Sequence[int]) -> List[Dict[str, Any]]:
+    """본문보다 큰 글자 또는 굵은 번호 제목 줄을 장/절 제목으로 검출합니다."""
+    lines = []
+    size_weights: Counter = Counter()
+    for page_index in range(document.page_count):
+        if page_index + 1 in skip_pages:
+            continue
+        page_dict = document.load_page(page_index).get_text("dict")
+        for block in page_dict.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+            for line in block.get("lines", []):
+                spans = [span for span in line.get("spans", []) if span.get("text", "").strip()]
+                if not spans:
+                    continue
+                text = "".join(span["text"] for span in spans).strip()
+                size = round(max(span["size"] for span in spans), 1)
+                bold = all(span["flags"] & 16 or "bold" in span.get("font", "").lower() for span in spans)
+                size_weights[size] += len(text)
+                lines.append({"page": page_index + 1, "text": text, "size": size, "bold": bold})
+    if not lines:
+        return []
+
+    body_size = size_weights.most_common(1)[0][0]
+    # 머리말/꼬리말처럼 여러 페이지에 반복되는 줄은 제목에서 제외
+    repeated = {text for text, count in Counter(line["text"] for line in lines).items() if count >= max(3, document.page_count * 0.3)}
+
+    candidates = []
+    for line in lines:
+        if len(line["text"]) > MAX_HEADING_LENGTH or line["text"] in repeated or line["text"].isdigit():
+            continue
+        larger = line["size"] >= body_size * 1.15
+        numbered_bold = line["bold"] and NUMBERED_HEADING_PATTERN.match(line["text"])
+        if larger or numbered_bold:
+            candidates.append(line)
+
+    heading_sizes = sorted({line["size"] for line in candidates}, reverse=True)
+    flat = []
+    for line in candidates:
+        level = min(heading_sizes.index(line["size"]) + 1, MAX_HEADING_LEVEL)
+        flat.append({"title": line["text"], "level": level, "start_page": line["page"], "source": "heading"})
+    return flat
+
+
+def _build_tree(flat: List[Dict[str, Any]], page_count: int) -> List[DocumentSection]:
+    for index, item in enumerate(flat):
+        end_page = page_count
+        for following in flat[index + 1:]:
+            if following["level"] <= item["level"]:
+                end_page = max(item["start_page"], following["start_page"] - 1)
+                break
+        item["end_page"] = end_page
+
+    roots: List[DocumentSection] = []
+    stack: List[DocumentSection] = []
+    for item in flat:
+        section = DocumentSection(
+            title=item["title"],
+            level=item["level"],
+            start_page=item["start_page"],
+            end_page=item["end_page"],
+            source=item["source"],
+        )
+        while stack and stack[-1].level >= section.level:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(section)
+        stack.append(section)
+    return roots
+
+
+def analyze_document_structure(pdf_source) -> DocumentStructure:
+    """PDF(경로 또는 바이트)의 섹션 트리와 목차 페이지를 분석합니다."""
+    document = _open_pdf(pdf_source)
+    try:
+        scan_pages = min(MAX_TOC_SCAN_PAGES, document.page_count)
+        toc_pages = detect_toc_page_numbers([document.load_page(i).get_text("text") for i in range(scan_pages)])
+
+        flat = _sections_from_outline(document)
+        if not flat:
+            flat = _sections_from_headings(document, skip_pages=toc_pages)
+
+        structure = DocumentStructure(
+            page_count=document.page_count,
+            sections=_build_tree(flat, document.page_count),
+            toc_pages=toc_pages,
+        )
+        source = flat[0]["source"] if flat else "none"
+        print(f"문서 구조 분석 완료: 섹션 {len(flat)}개 (출처: {source}), 목차 페이지 {toc_pages}")
+        return structure
+    finally:
+        document.close()
+
+
+def find_sections_by_keywords(structure: DocumentStructure, keywords: Sequence[str]) -> List[DocumentSection]:
+    """제목에 키워드가 포함된 섹션을 찾습니다. 상위 섹션이 선택되면 하위 섹션은 따로 포함하지 않습니다."""
+    matched = []
+
+    def visit(sections: List[DocumentSection]):
+        for section in sections:
+            if any(keyword in section.title for keyword in keywords):
+                matched.append(section)
+            else:
+                visit(section.children)
+
+    visit(structure.sections)
+    return matched
+
+
+def _split_page_at_headings(page: Document, headings: List[DocumentSection], previous_title: Optional[str]) -> List[Document]:
+    """페이지 중간에서 시작하는 섹션 제목 위치로 페이지를 나눕니다."""
+    text = page.page_content
+    cut_points = []
+    for section in headings:
+        position = text.find(section.title[:30])
+        if position > 0 and text[:position].strip():
+            cut_points.append((position, section))
+    if not cut_points:
+        return [page]
+
+    cut_points.sort(key=lambda item: item[0])
+    parts = []
+    previous = 0
+    for position, _ in cut_points:
+        parts.append(text[previous:position])
+        previous = position
+    parts.append(text[previous:])
+
+    documents = []
+    for index, part in enumerate(parts):
+        if not part.strip():
+            continue
+        metadata = dict(page.metadata)
+        if index > 0:
+            metadata["section_start"] = True
+            metadata["section_title"] = cut_points[index - 1][1].title
+        else:
+            # 페이지 첫머리에서 시작하는 섹션이 없으면 앞부분은 이전 섹션의 이어지는 내용
+            cut_sections = [section for _, section in cut_points]
+            leading = [section for section in headings if section not in cut_sections]
+            if leading:
+                metadata["section_title"] = leading[-1].title
+            else:
+                metadata.pop("section_start", None)
+                metadata["section_title"] = previous_title
+        documents.append(Document(page_content=part, metadata=metadata))
+    return documents
+
+
+def segment_documents_by_structure(
+    page_documents: List[Document],
+    structure: DocumentStructure,
+    keywords: Optional[Sequence[str]] = None,
+) -> List[Document]:
+    """
+    페이지 Document 목록에 섹션 정보를 붙이고, keywords가 주어지면 해당 섹션의 페이지만 남깁니다.
+    일치하는 섹션이 없으면 전체 페이지를 그대로 사용합니다. 목차 페이지는 항상 제외합니다.
+    """
+    sections = list(structure.iter_sections())
+    selected_pages = None
+    if keywords:
+        matched = find_sections_by_keywords(structure, keywords)
+        if matched:
+            selected_pages = set()
+            for section in matched:
+                selected_pages.update(range(section.start_page, section.end_page + 1))
+            print(f"섹션 라우팅: {keywords} → {[s.title for s in matched]} ({len(selected_pages)}/{structure.page_count} 페이지)")
+        else:
+            print(f"섹션 라우팅: {keywords}에 해당하는 섹션을 찾지 못해 전체 페이지를 사용합니다.")
+
+    segmented: List[Document] = []
+    for page in page_documents:
+        page_number = page.metadata.get("page_number")
+        if page_number in structure.toc_pages:
+            continue
+        if selected_pages is not None and page_number not in selected_pages:
+            continue
+
+        containing = [s for s in sections if s.start_page <= page_number <= s.end_page]
+        starting = [s for s in sections if s.start_page == page_number]
+        metadata = dict(page.metadata)
+        if containing:
+            metadata["section_title"] = containing[-1].title
+            metadata["section_path"] = " > ".join(s.title for s in containing)
+        if starting:
+            metadata["section_start"] = True
+        continuing = [s for s in containing if s.start_page < page_number]
+        previous_title = continuing[-1].title if continuing else None
+        segmented.extend(_split_page_at_headings(Document(page_content=page.page_content, metadata=metadata), starting, previous_title))
+    return segmented
+
+
+def prepare_documents_for_agent(pdf_source, page_documents: List[Document], agent: str) -> List[Document]:
+    """
+    파이프라인(SRS/ASIS)에 맞는 섹션의 페이지만 골라 섹션 정보를 붙여 반환합니다.
+    STRUCTURE_ROUTING_ENABLED=false 이거나 구조 분석에 실패하면 입력을 그대로 반환합니다.
+    """
+    if not STRUCTURE_ROUTING_ENABLED or not page_documents:
+        return page_documents
+    try:
+        structure = analyze_document_structure(pdf_source)
+    except Exception as e:
+        print(f"경고: 문서 구조 분석 실패로 전체 페이지를 사용합니다: {e}")
+        return page_documents
+    segmented = segment_documents_by_structure(page_documents, structure, SECTION_ROUTING_KEYWORDS.get(agent))
+    return segmented or page_documents
@@ -1,19 +1,21 @@
 # app/services/faiss_search_service.py
 import os
 import json
-import numpy as np
-import faiss
 from typing import List, Tuple, Dict, Any, Optional
 from app.core.config import FAISS_INDEX_DIR, METADATA_STORAGE_DIR
+from app.core.lazy import lazy_import
 from app.services.embedding_service import get_embeddings_for_texts # 단일 텍스트 임베딩 함수도 필요할 수 있음, 또는 배치 사용
 
+np = lazy_import("numpy")
+faiss = lazy_import("faiss") # 첫 검색(또는 워밍업) 시 import
+
 # 임베딩 모델은 embedding_service에서 로드된 것을 공유하거나 여기서도 로드할 수 있음
 # from app.services.embedding_service import hf_model
 
 def load_faiss_index_and_metadata(
     index_filename: str,
     metadata_filename: str
-) -> Tuple[Optional[faiss.Index], Optional[List[Dict[str, Any]]]]:
+) -> Tuple[Optional["faiss.Index"], Optional[List[Dict[str, Any]]]]:
     index_path = os.path.join(FAISS_INDEX_DIR, index_filename)
     metadata_path = os.path.join(METADATA_STORAGE_DIR, metadata_filename)
 
@@ -31,7 +33,7 @@ def load_faiss_index_and_metadata(
         return None, None
 
 def search_similar_requirements(
-    faiss_index: faiss.Index,
+    faiss_index: "faiss.Index",
     metadata_list: List[Dict[str, Any]],
     query_text: str,
     top_k: int = 1
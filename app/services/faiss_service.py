@@ -1,13 +1,15 @@
 # app/services/faiss_service.py
 import os
 import json
-import numpy as np
-import faiss
 from typing import List, Dict, Any, Tuple, Optional
 
 from app.services.file_processing_service import prepare_data_for_faiss
 from app.services.embedding_service import get_embeddings_for_texts, hf_model # 모델 차원 접근 위해 hf_model 임포트
 from app.core.config import FAISS_INDEX_DIR, METADATA_STORAGE_DIR
+from app.core.lazy import lazy_import
+
+np = lazy_import("numpy")
+faiss = lazy_import("faiss") # 첫 인덱스 생성(또는 워밍업) 시 import
 
 def build_and_save_faiss_index(
     processed_data_items: List[Dict[str, Any]], # prepare_data_for_faiss의 결과
@@ -42,9 +44,10 @@ def build_and_save_faiss_index(
     embeddings_array = np.array(valid_embeddings_np_list).astype('float32')
 
     try:
-        if hf_model is None: # 임베딩 모델 로드 확인
+        model = hf_model.get() # 첫 사용 시 로드
+        if model is None: # 임베딩 모델 로드 확인
              raise ValueError("SentenceTransformer 모델이 로드되지 않았습니다.")
-        dimension = hf_model.get_sentence_embedding_dimension() # 모델로부터 차원 가져오기
+        dimension = model.get_sentence_embedding_dimension() # 모델로부터 차원 가져오기
         
         index = faiss.IndexFlatL2(dimension)
         index.add(embeddings_array)
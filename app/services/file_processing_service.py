@@ -1,14 +1,18 @@
 # app/services/file_processing_service.py
 import json
 import csv
-import fitz # PyMuPDF
 import re
 import os
 from typing import List, Tuple, Optional, Dict, Any
 from io import BytesIO
 
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.core.lazy import lazy_import
+from app.services.document_structure_service import detect_toc_page_numbers
+
+# 무거운 라이브러리는 첫 사용(또는 워밍업) 시 import
+fitz = lazy_import("fitz") # PyMuPDF
+text_splitters = lazy_import("langchain_text_splitters")
 
 def sanitize_filename(name: str) -> str:
     """파일 이름으로 사용하기 어려운 문자를 제거하거나 대체합니다."""
@@ -44,7 +48,7 @@ def create_chunks_from_documents(
         return []
 
     print(f"Document 청킹 중 (청크 크기: {chunk_size}, 중복: {chunk_overlap})...")
-    text_splitter = RecursiveCharacterTextSplitter(
+    text_splitter = text_splitters.RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         length_function=len,
@@ -86,8 +90,11 @@ def extract_text_for_pages_from_list(page_texts_list: List[str], start_page_num:
     return "\\n".join(page_texts_list[start_idx:end_idx])
 
 
-def get_toc_raw_text_from_page_list(page_texts_list: List[str], toc_page_numbers: List[int] = [2,3]) -> Optional[str]:
+def get_toc_raw_text_from_page_list(page_texts_list: List[str], toc_page_numbers: Optional[List[int]] = None) -> Optional[str]:
     # as_is_module.ipynb의 get_toc_raw_text_from_full_text 함수 내용 (입력을 리스트로 받도록 수정)
+    # 목차 페이지를 지정하지 않으면 문서 앞부분에서 목차 페이지를 찾습니다.
+    if toc_page_numbers is None:
+        toc_page_numbers = detect_toc_page_numbers(page_texts_list)
     toc_texts = []
     for page_num in toc_page_numbers:
         page_content = extract_text_for_pages_from_list(page_texts_list, page_num, page_num)
@@ -123,11 +130,31 @@ def load_requirements_from_json(filepath: str) -> List[Dict[str, Any]]:
         print(f"Error loading JSON file {filepath}: {e}")
         return []
 
+def write_json_array(items, filepath: str) -> int:
+    """
+    항목을 하나씩 직렬화해 JSON 배열 파일로 기록합니다. (전체 목록을 하나의 문자열로 만들지 않음)
+    임시 파일에 쓴 뒤 교체하므로 기록 중 실패해도 기존 파일이 깨지지 않습니다. 기록한 항목 수를 반환합니다.
+    """
+    temp_path = f"{filepath}.tmp"
+    count = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for item in items:
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(item, ensure_ascii=False, default=str))
+                count += 1
+            f.write("\n]\n")
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
+
 def save_results_to_json(results: List[Dict[str, Any]], filepath: str):
     """결과 목록을 지정된 경로에 JSON 파일로 저장합니다."""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        write_json_array(results, filepath)
         print(f"\n결과가 성공적으로 {filepath} 파일에 저장되었습니다.")
     except Exception as e:
         print(f"Error saving results to JSON file {filepath}: {e}")
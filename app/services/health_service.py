@@ -0,0 +1,167 @@
+# app/services/health_service.py
+"""
+readiness(/ready) 판단을 위한 하위 시스템 상태 점검 레지스트리입니다.
+
+점검 함수는 @health_check(이름)으로 등록하며 {"status": "ok" | "degraded" | "fail", ...세부 정보}를 반환합니다.
+- fail     : 이 파드가 요청을 처리할 수 없음 (모델 미로드, DB 연결 불가 등) → /ready 503
+- degraded : 처리는 가능하지만 과부하(작업 큐/커넥션 풀 포화)이거나 일부 기능이 제한된 상태 → 부하 차단(load shedding) 신호
+critical=False 로 등록한 점검의 fail은 readiness에 영향을 주지 않고 degraded로만 취급합니다.
+점검은 동시에 실행되며 READINESS_CHECK_TIMEOUT_SECONDS 안에 끝나지 않으면 fail로 봅니다.
+프로브가 DB를 과도하게 호출하지 않도록 결과를 READINESS_CACHE_SECONDS 동안 재사용합니다.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import (
+    EVENT_LOOP_STALL_DEGRADED_SECONDS,
+    JOB_EXECUTION_MODE,
+    JOB_QUEUE_MAX_PENDING,
+    READINESS_CACHE_SECONDS,
+    READINESS_CHECK_TIMEOUT_SECONDS,
+    READINESS_QUEUE_SHED_RATIO,
+    READINESS_REQUIRE_EMBEDDING_MODEL,
+)
+from app.core.mysql_config import async_engine, db_pool_status
+from app.services.circuit_breaker_service import STATE_CLOSED, circuit_breaker_status
+from app.services.embedding_service import hf_model
+from app.services.job_scheduler_service import get_queue_stats
+from app.services.loop_monitor_service import loop_monitor
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_FAIL = "fail"
+
+# 점검 이름 → (점검 함수, critical 여부)
+HEALTH_CHECKS: Dict[str, Tuple[Callable[[], Awaitable[Dict[str, Any]]], bool]] = {}
+
+_started_at = time.monotonic()
+_cached_report: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+_report_lock = asyncio.Lock()
+
+
+def health_check(name: str, critical: bool = True):
+    """readiness 점검 함수를 이름으로 등록하는 데코레이터."""
+    def decorator(func: Callable[[], Awaitable[Dict[str, Any]]]):
+        HEALTH_CHECKS[name] = (func, critical)
+        return func
+    return decorator
+
+
+@health_check("embedding_model")
+async def check_embedding_model() -> Dict[str, Any]:
+    if not hf_model.initialized:
+        if READINESS_REQUIRE_EMBEDDING_MODEL:
+            return {"status": STATUS_FAIL, "detail": "임베딩 모델 로드 중"}
+        return {"status": STATUS_OK, "detail": "첫 사용 시 로드"}
+    if hf_model.get() is None:
+        # 로드에 실패한 경우 다시 시도하지 않으므로, FAISS 기능만 사용할 수 없는 상태로 봄
+        return {"status": STATUS_DEGRADED, "detail": "임베딩 모델 로드 실패 (FAISS 기능 사용 불가)"}
+    return {"status": STATUS_OK}
+
+
+@health_check("database")
+async def check_database() -> Dict[str, Any]:
+    pool = db_pool_status()
+    limit = pool["pool_size"] + pool["max_overflow"]
+    if pool["checked_out"] >= limit:
+        # 풀이 가득 차면 connect()가 DB_POOL_TIMEOUT 동안 대기하므로 점검하지 않음 (과부하일 뿐 DB 장애가 아님)
+        return {"status": STATUS_DEGRADED, "detail": "커넥션 풀 포화", "checked_out": pool["checked_out"], "limit": limit}
+
+    async def probe():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        # 점검 직후 풀이 가득 찬 경우에도 전체 점검 타임아웃(fail)보다 먼저 끝나도록 짧게 대기
+        await asyncio.wait_for(probe(), timeout=READINESS_CHECK_TIMEOUT_SECONDS * 0.8)
+    except asyncio.TimeoutError:
+        pool = db_pool_status()
+        if pool["checked_out"] >= limit:
+            return {"status": STATUS_DEGRADED, "detail": "커넥션 풀 포화", "checked_out": pool["checked_out"], "limit": limit}
+        return {"status": STATUS_FAIL, "detail": "DB 응답 없음", "checked_out": pool["checked_out"], "limit": limit}
+    except Exception as e:
+        return {"status": STATUS_FAIL, "detail": f"DB 연결 실패: {type(e).__name__}", "checked_out": pool["checked_out"], "limit": limit}
+    return {"status": STATUS_OK, "checked_out": pool["checked_out"], "limit": limit}
+
+
+@health_check("job_queue")
+async def check_job_queue() -> Dict[str, Any]:
+    stats = await asyncio.to_thread(get_queue_stats) if JOB_EXECUTION_MODE == "worker" else get_queue_stats()
+    threshold = JOB_QUEUE_MAX_PENDING * READINESS_QUEUE_SHED_RATIO
+    saturated = sorted(name for name, queue in stats.items() if queue["pending"] >= threshold)
+    return {
+        "status": STATUS_DEGRADED if saturated else STATUS_OK,
+        "pending": {name: queue["pending"] for name, queue in stats.items()},
+        "saturated_queues": saturated,
+    }
+
+
+@health_check("llm_providers", critical=False)
+async def check_llm_providers() -> Dict[str, Any]:
+    # 제공자 장애는 모든 파드에 같이 영향을 주므로 readiness는 유지하고 부하 차단 신호로만 사용
+    breakers = {name: snapshot["state"] for name, snapshot in circuit_breaker_status().items() if name.startswith("llm:")}
+    not_closed = sorted(name for name, state in breakers.items() if state != STATE_CLOSED)
+    return {"status": STATUS_DEGRADED if not_closed else STATUS_OK, "breakers": breakers, "not_closed": not_closed}
+
+
+@health_check("event_loop", critical=False)
+async def check_event_loop() -> Dict[str, Any]:
+    # 루프를 막는 핸들러가 있으면 모든 요청의 지연이 늘어나므로 부하 차단 신호로 사용
+    since_stall = loop_monitor.seconds_since_last_stall()
+    recent = since_stall is not None and since_stall < EVENT_LOOP_STALL_DEGRADED_SECONDS
+    lag = loop_monitor.snapshot(include_stacks=False)["lag_ms"]
+    return {
+        "status": STATUS_DEGRADED if recent else STATUS_OK,
+        "lag_p99_ms": lag["p99"],
+        "seconds_since_last_stall": round(since_stall, 1) if since_stall is not None else None,
+    }
+
+
+async def _run_check(name: str, func: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    try:
+        return await asyncio.wait_for(func(), timeout=READINESS_CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"status": STATUS_FAIL, "detail": f"{READINESS_CHECK_TIMEOUT_SECONDS}s 내에 응답 없음"}
+    except Exception as e:
+        print(f"[readiness] {name} 점검 오류: {e!r}")
+        return {"status": STATUS_FAIL, "detail": f"{type(e).__name__}: {e}"}
+
+
+async def _build_report() -> Dict[str, Any]:
+    names = list(HEALTH_CHECKS)
+    results = await asyncio.gather(*(_run_check(name, HEALTH_CHECKS[name][0]) for name in names))
+    checks = {}
+    ready = True
+    shed_load = False
+    for name, result in zip(names, results):
+        critical = HEALTH_CHECKS[name][1]
+        if result["status"] == STATUS_FAIL and critical:
+            ready = False
+        elif result["status"] != STATUS_OK:
+            shed_load = True
+        checks[name] = {**result, "critical": critical}
+    return {
+        "status": "ready" if ready else "not_ready",
+        "ready": ready,
+        "shed_load": shed_load, # true 이면 새 대용량 작업(업로드)은 다른 파드로 보내는 것이 좋음
+        "checks": checks,
+    }
+
+
+async def readiness_report(force: bool = False) -> Dict[str, Any]:
+    """하위 시스템 점검 결과를 종합합니다. (READINESS_CACHE_SECONDS 동안 캐시)"""
+    global _cached_report, _cached_at
+    async with _report_lock:
+        if force or _cached_report is None or time.monotonic() - _cached_at >= READINESS_CACHE_SECONDS:
+            _cached_report = await _build_report()
+            _cached_at = time.monotonic()
+        return _cached_report
+
+
+def liveness_report() -> Dict[str, Any]:
+    """프로세스가 응답 가능한지만 확인합니다. (외부 의존성 상태와 무관)"""
+    return {"status": "alive", "uptime_seconds": round(time.monotonic() - _started_at, 1)}
@@ -0,0 +1,84 @@
+# app/services/http_client_service.py
+"""
+외부 콜백 호출에 사용하는 공용 비동기 HTTP 클라이언트입니다.
+
+요청마다 AsyncClient를 새로 만들면 매번 TCP/TLS 연결을 새로 맺으므로, 이벤트 루프별로 연결 풀을 유지합니다.
+post_with_retry는 네트워크 오류/타임아웃과 429/5xx 응답을 지수 백오프(Retry-After 우선)로 재시도하며,
+수신 측이 중복 요청을 걸러낼 수 있도록 모든 시도에 같은 Idempotency-Key 헤더를 보냅니다.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import (
+    HTTP_CLIENT_MAX_CONNECTIONS,
+    CALLBACK_CONNECT_TIMEOUT_SECONDS,
+    CALLBACK_TIMEOUT_SECONDS,
+    CALLBACK_MAX_RETRIES,
+    CALLBACK_RETRY_BASE_DELAY,
+)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+MAX_RETRY_DELAY_SECONDS = 60
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 사용할 공용 AsyncClient를 반환합니다. (연결 풀은 루프에 묶이므로 루프가 바뀌면 새로 생성)"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(CALLBACK_TIMEOUT_SECONDS, connect=CALLBACK_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=HTTP_CLIENT_MAX_CONNECTIONS, max_keepalive_connections=HTTP_CLIENT_MAX_CONNECTIONS),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client():
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+    return min(CALLBACK_RETRY_BASE_DELAY * (2 ** attempt), MAX_RETRY_DELAY_SECONDS)
+
+
+async def post_with_retry(
+    url: str,
+    idempotency_key: str,
+    build_request: Callable[[], Dict[str, Any]],
+    max_retries: int = CALLBACK_MAX_RETRIES,
+    label: str = "HTTP",
+) -> httpx.Response:
+    """
+    build_request()가 반환한 키워드 인자(params, data, files 등)로 POST 요청을 보냅니다.
+    파일 본문은 시도마다 처음부터 다시 읽어야 하므로 build_request는 매 시도 새로 호출됩니다.
+    재시도할 수 없는 응답(4xx)은 그대로 반환하고, 재시도가 모두 실패하면 마지막 응답을 반환하거나 마지막 예외를 발생시킵니다.
+    """
+    client = get_http_client()
+    response: Optional[httpx.Response] = None
+    for attempt in range(max_retries + 1):
+        response = None
+        try:
+            response = await client.post(url, headers={"Idempotency-Key": idempotency_key}, **build_request())
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            print(f"[{label}] 응답 코드 {response.status_code} (시도 {attempt + 1}/{max_retries + 1})")
+        except httpx.HTTPError as e:
+            print(f"[{label}] 요청 실패 (시도 {attempt + 1}/{max_retries + 1}): {e!r}")
+            if attempt >= max_retries:
+                raise
+        if attempt < max_retries:
+            await asyncio.sleep(_retry_delay(attempt, response))
+    return response
@@ -4,11 +4,10 @@ import os
 import json
 import time
 from typing import Dict, Any
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY, LLM_MODEL
+from app.core.config import LLM_MODEL
 
-# LLM을 사용하므로 클라이언트 초기화
-client = OpenAI(api_key=OPENAI_API_KEY)
+# LLM을 사용하므로 공용 클라이언트 사용 (첫 호출 시 생성)
+from app.services.llm_call_service import client
 
 class RequirementIdManager:
     """
@@ -0,0 +1,219 @@
+# app/services/job_progress_service.py
+"""
+작업 진행 상황을 이벤트로 발행하고 SSE/WebSocket 구독자에게 전달하는 서비스입니다.
+
+- 파이프라인은 set_stage / advance / publish 로 단계, 처리 개수(done/total), 생성된 요구사항 수,
+  부분 결과 묶음(batch)을 알립니다. 스레드(asyncio.to_thread)에서 호출해도 안전합니다.
+- ETA는 현재 단계에서 최근 완료된 항목들의 처리 속도(이동 구간)로 추정합니다.
+- 작업별 최근 이벤트를 보관하므로, 재접속한 클라이언트는 Last-Event-ID 이후 이벤트를 다시 받습니다.
+- 진행 요약(progress)은 job_store에도 기록되므로, worker 모드처럼 다른 프로세스에서 실행 중인 작업은
+  공유 작업 상태를 주기적으로 읽어 진행 이벤트를 만들어 냅니다. (이 경우 부분 결과 묶음은 전달되지 않음)
+"""
+import time
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    JOB_PROGRESS_HISTORY,
+    JOB_PROGRESS_ETA_WINDOW,
+    JOB_PROGRESS_SYNC_INTERVAL,
+    JOB_PROGRESS_KEEPALIVE_SECONDS,
+    JOB_PROGRESS_MAX_JOBS,
+)
+
+TERMINAL_STATUSES = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+class _JobProgress:
+    def __init__(self):
+        self.stage: Optional[str] = None
+        self.done = 0
+        self.total: Optional[int] = None
+        self.produced = 0
+        self.stage_started_at = time.time()
+        self.completions: Deque[float] = deque(maxlen=JOB_PROGRESS_ETA_WINDOW)
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=JOB_PROGRESS_HISTORY)
+        self.seq = 0
+        self.last_synced_at = 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        if self.total is None or self.done >= self.total or len(self.completions) < 2:
+            return None
+        elapsed = self.completions[-1] - self.completions[0]
+        if elapsed <= 0:
+            return None
+        rate = (len(self.completions) - 1) / elapsed
+        return round((self.total - self.done) / rate, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "requirements_produced": self.produced,
+            "eta_seconds": self.eta_seconds(),
+            "stage_elapsed_seconds": round(time.time() - self.stage_started_at, 1),
+        }
+
+
+class JobProgressTracker:
+    def __init__(self):
+        self._jobs: "OrderedDict[str, _JobProgress]" = OrderedDict()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def _job(self, job_id: str) -> _JobProgress:
+        progress = self._jobs.get(job_id)
+        if progress is None:
+            progress = self._jobs[job_id] = _JobProgress()
+            # 오래된 작업부터 정리 (구독 중인 작업은 유지)
+            for old_job_id in list(self._jobs):
+                if len(self._jobs) <= JOB_PROGRESS_MAX_JOBS:
+                    break
+                if old_job_id != job_id and old_job_id not in self._subscribers:
+                    del self._jobs[old_job_id]
+        return progress
+
+    # --- 발행 ---
+    def publish(self, job_id: str, event_type: str, data: Dict[str, Any]):
+        with self._lock:
+            progress = self._job(job_id)
+            progress.seq += 1
+            event = {"id": progress.seq, "event": event_type, "data": {"job_id": job_id, **data, "ts": time.time()}}
+            progress.events.append(event)
+            subscribers = list(self._subscribers.get(job_id, []))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass # 구독자의 이벤트 루프가 이미 종료됨
+
+    def _publish_progress(self, job_id: str, batch: Optional[List[Dict[str, Any]]] = None):
+        with self._lock:
+            snapshot = self._job(job_id).snapshot()
+        self._sync_snapshot(job_id, snapshot)
+        self.publish(job_id, "progress", snapshot)
+        if batch:
+            self.publish(job_id, "requirements", {"stage": snapshot["stage"], "items": batch})
+
+    def _sync_snapshot(self, job_id: str, snapshot: Dict[str, Any], persist: bool = True):
+        """진행 요약을 job_store(및 공유 작업 상태)에 기록합니다. 공유 저장소 쓰기는 일정 간격으로 제한합니다."""
+        from app.api.v2.jobs import job_store, job_state_backend
+
+        job = job_store.get(job_id)
+        if job is None:
+            return
+        job["progress"] = snapshot
+        progress = self._jobs.get(job_id)
+        now = time.time()
+        if persist and job_state_backend is not None and progress is not None and now - progress.last_synced_at >= JOB_PROGRESS_SYNC_INTERVAL:
+            progress.last_synced_at = now
+            job_state_backend.save_job_state(job_id, job)
+
+    def set_stage(self, job_id: str, stage: str, total: Optional[int] = None, done: int = 0):
+        """새 단계 시작을 알립니다. 재개된 작업은 done에 이미 끝난 항목 수를 넘깁니다."""
+        with self._lock:
+            progress = self._job(job_id)
+            progress.stage = stage
+            progress.total = total
+            progress.done = done
+            progress.stage_started_at = time.time()
+            progress.completions.clear()
+            progress.last_synced_at = 0.0
+        self._publish_progress(job_id)
+
+    def advance(self, job_id: str, count: int = 1, produced: int = 0, batch: Optional[List[Dict[str, Any]]] = None):
+        """현재 단계의 항목 처리 완료를 알립니다. batch에는 새로 만들어진 부분 결과(요구사항 등)를 담습니다."""
+        with self._lock:
+            progress = self._job(job_id)
+            progress.done += count
+            progress.produced += produced
+            progress.completions.append(time.time())
+        self._publish_progress(job_id, batch)
+
+    def publish_status(self, job_id: str, status: str, message: Optional[str] = None):
+        """update_job_status에서 호출됩니다. 최신 진행 요약은 호출 측이 작업 상태와 함께 저장합니다."""
+        with self._lock:
+            progress = self._jobs.get(job_id)
+            snapshot = progress.snapshot() if progress else None
+        if snapshot is not None:
+            self._sync_snapshot(job_id, snapshot, persist=False)
+        self.publish(job_id, "status", {"status": status, "message": message, "progress": snapshot})
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            progress = self._jobs.get(job_id)
+            return progress.snapshot() if progress else None
+
+    # --- 구독 ---
+    def subscribe(self, job_id: str, last_event_id: int = 0) -> Tuple[asyncio.Queue, List[Dict[str, Any]]]:
+        """구독 큐와 last_event_id 이후의 보관된 이벤트 목록을 반환합니다."""
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((loop, queue))
+            progress = self._jobs.get(job_id)
+            backlog = [event for event in (progress.events if progress else []) if event["id"] > last_event_id]
+        return queue, backlog
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = [item for item in self._subscribers.get(job_id, []) if item[1] is not queue]
+            if subscribers:
+                self._subscribers[job_id] = subscribers
+            else:
+                self._subscribers.pop(job_id, None)
+
+    async def iter_events(self, job_id: str, last_event_id: int = 0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        작업 이벤트를 순서대로 내보냅니다. 작업이 종료 상태가 되면 끝납니다.
+        None은 연결 유지(keep-alive) 신호입니다.
+        다른 프로세스에서 실행 중인 작업은 공유 작업 상태를 주기적으로 읽어 진행 이벤트를 만듭니다.
+        """
+        from app.api.v2.jobs import get_job
+
+        queue, backlog = self.subscribe(job_id, last_event_id)
+        try:
+            job = await asyncio.to_thread(get_job, job_id)
+            if job is None:
+                yield {"id": None, "event": "error", "data": {"job_id": job_id, "message": "Job not found"}}
+                return
+            if not backlog:
+                yield {"id": None, "event": "status", "data": {"job_id": job_id, "status": job["status"], "message": job.get("message"), "progress": job.get("progress")}}
+            for event in backlog:
+                yield event
+            if job["status"] in TERMINAL_STATUSES:
+                return
+
+            last_remote = job.get("progress")
+            idle_since = time.time()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=JOB_PROGRESS_SYNC_INTERVAL)
+                except asyncio.TimeoutError:
+                    job = await asyncio.to_thread(get_job, job_id)
+                    if job is None:
+                        return
+                    if job["status"] in TERMINAL_STATUSES:
+                        yield {"id": None, "event": "status", "data": {"job_id": job_id, "status": job["status"], "message": job.get("message"), "progress": job.get("progress")}}
+                        return
+                    if self.snapshot(job_id) is None and job.get("progress") and job.get("progress") != last_remote:
+                        last_remote = job["progress"]
+                        idle_since = time.time()
+                        yield {"id": None, "event": "progress", "data": {"job_id": job_id, **last_remote}}
+                    elif time.time() - idle_since >= JOB_PROGRESS_KEEPALIVE_SECONDS:
+                        idle_since = time.time()
+                        yield None
+                    continue
+                idle_since = time.time()
+                yield event
+                if event["event"] == "status" and event["data"].get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            self.unsubscribe(job_id, queue)
+
+
+# 애플리케이션 전역 진행 상황 추적기
+job_progress = JobProgressTracker()
@@ -0,0 +1,368 @@
+# app/services/job_queue_service.py
+import os
+import json
+import time
+import sqlite3
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from app.core.config import JOB_QUEUE_DB_PATH, JOB_SPOOL_DIR, JOB_PRIORITY_AGING_SECONDS
+
+_SPOOL_MARKER = "__spool__"
+
+
+class SqliteJobQueue:
+    """
+    API 프로세스와 워커 프로세스가 공유하는 SQLite 기반 작업 큐 겸 작업 상태 저장소입니다.
+    - 작업 등록/점유(claim)는 BEGIN IMMEDIATE 트랜잭션으로 원자적으로 처리
+    - job_data 컬럼에 job_store 항목(JSON)을 그대로 보관하여 상태/결과를 공유
+    - 하트비트가 끊긴 작업은 다른 워커가 다시 가져갈 수 있도록 QUEUED로 되돌림
+    SQLite 파일 잠금은 NFS 등 네트워크 파일시스템에서 노드 간에 보장되지 않으므로, API와 워커는 같은 노드(같은 파드)에서
+    로컬 볼륨의 DB 파일을 공유해야 합니다. (k8s/worker-deploy.yaml 참고)
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._initialized = False
+        self.owner_worker_id: Optional[str] = None # 워커 프로세스에서 설정하면 점유하지 않은 작업의 상태는 기록하지 않음
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 30000")
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection):
+        # WAL은 잠금을 공유 메모리(-shm)로 조정하므로 볼륨이 네트워크 파일시스템이면 DB가 손상될 수 있어 롤백 저널을 사용
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                queue_name TEXT NOT NULL,
+                handler TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                job_data TEXT NOT NULL,
+                priority_class INTEGER NOT NULL DEFAULT 0,
+                size_hint REAL NOT NULL DEFAULT 0,
+                fair_key TEXT,
+                worker_id TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                claims INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                heartbeat_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue_status ON jobs (queue_name, status)")
+        self._initialized = True
+
+    def enqueue(
+        self,
+        job_id: str,
+        queue_name: str,
+        handler: str,
+        payload: Dict[str, Any],
+        job_data: Dict[str, Any],
+        priority_class: int,
+        size_hint: float,
+        fair_key: Any,
+        max_pending: int
+    ) -> Optional[int]:
+        """작업을 QUEUED 상태로 등록합니다. 큐가 가득 찼으면 None, 아니면 등록 전 대기 작업 수를 반환합니다."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE queue_name = ? AND status = 'QUEUED'", (queue_name,)
+            ).fetchone()[0]
+            if pending >= max_pending:
+                conn.execute("ROLLBACK")
+                return None
+            job_data = {**job_data, "status": "QUEUED", "queue": queue_name}
+            # 재개(resume)된 작업은 종료된 기존 행을 새 등록으로 대체
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs (job_id, queue_name, handler, payload, status, job_data,
+                                  priority_class, size_hint, fair_key, created_at)
+                VALUES (?, ?, ?, ?, 'QUEUED', ?, ?, ?, ?, ?)
+                """,
+                (job_id, queue_name, handler, json.dumps(payload, ensure_ascii=False),
+                 json.dumps(job_data, ensure_ascii=False, default=str),
+                 priority_class, size_hint, None if fair_key is None else str(fair_key), time.time())
+            )
+            conn.execute("COMMIT")
+            return pending
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, queue_name: str) -> Optional[Dict[str, Any]]:
+        """
+        큐에서 다음 작업 하나를 원자적으로 점유합니다.
+        실행 중인 작업이 적은 프로젝트 → 우선순위 → (대기 시간 보정된) 문서 크기 → 등록 순서로 고릅니다.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                """
+                SELECT j.* FROM jobs j
+                WHERE j.queue_name = ? AND j.status = 'QUEUED'
+                ORDER BY
+                    (SELECT COUNT(*) FROM jobs r
+                      WHERE r.queue_name = j.queue_name AND r.status = 'PROCESSING' AND r.fair_key IS j.fair_key),
+                    j.priority_class,
+                    j.size_hint / (1.0 + (? - j.created_at) / ?),
+                    j.created_at
+                LIMIT 1
+                """,
+                (queue_name, now, JOB_PRIORITY_AGING_SECONDS)
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            job_data = json.loads(row["job_data"])
+            job_data["status"] = "PROCESSING"
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'PROCESSING', worker_id = ?, heartbeat_at = ?,
+                                claims = claims + 1, job_data = ?
+                WHERE job_id = ?
+                """,
+                (worker_id, now, json.dumps(job_data, ensure_ascii=False, default=str), row["job_id"])
+            )
+            conn.execute("COMMIT")
+            return {
+                "job_id": row["job_id"],
+                "queue_name": row["queue_name"],
+                "handler": row["handler"],
+                "payload": json.loads(row["payload"]),
+                "job_data": job_data,
+            }
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, worker_id: str, job_ids: List[str]) -> List[str]:
+        """실행 중인 작업들의 하트비트를 갱신하고, 취소 요청된 작업 ID 목록을 반환합니다."""
+        if not job_ids:
+            return []
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" for _ in job_ids)
+            conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ? AND job_id IN ({placeholders})",
+                (time.time(), worker_id, *job_ids)
+            )
+            rows = conn.execute(
+                f"SELECT job_id FROM jobs WHERE cancel_requested = 1 AND job_id IN ({placeholders})",
+                job_ids
+            ).fetchall()
+            return [row["job_id"] for row in rows]
+        finally:
+            conn.close()
+
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        """하트비트가 timeout 이상 끊긴 PROCESSING 작업(워커 비정상 종료)을 다시 QUEUED로 돌립니다."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = 'QUEUED', worker_id = NULL
+                WHERE status = 'PROCESSING' AND cancel_requested = 0 AND heartbeat_at < ?
+                """,
+                (time.time() - timeout_seconds,)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def release(self, job_id: str):
+        """워커 종료(drain) 시 끝내지 못한 작업을 다른 워커가 가져가도록 되돌립니다."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'QUEUED', worker_id = NULL WHERE job_id = ? AND status = 'PROCESSING'",
+                (job_id,)
+            )
+        finally:
+            conn.close()
+
+    def save_job_state(self, job_id: str, job_data: Dict[str, Any]):
+        """
+        job_store 항목을 공유 저장소에 기록합니다. 취소된 작업은 CANCELLED 외의 상태로 덮어쓰지 않습니다.
+        owner_worker_id가 설정된 워커에서는 다른 워커에게 넘어간(재점유된) 작업의 상태를 덮어쓰지 않습니다.
+        """
+        status = job_data.get("status")
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, job_data = ?
+                WHERE job_id = ? AND (status != 'CANCELLED' OR ? = 'CANCELLED')
+                  AND (? IS NULL OR worker_id = ?)
+                """,
+                (status, json.dumps(job_data, ensure_ascii=False, default=str), job_id, status,
+                 self.owner_worker_id, self.owner_worker_id)
+            )
+        finally:
+            conn.close()
+
+    def owns(self, job_id: str, worker_id: str) -> bool:
+        """작업이 아직 worker_id 워커에 점유되어 있는지 확인합니다. (재점유된 작업의 결과를 기록하지 않기 위함)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT worker_id FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return row is not None and row["worker_id"] == worker_id
+        finally:
+            conn.close()
+
+    def request_cancel(self, job_id: str, uncancellable_handlers: Collection[str] = ()) -> bool:
+        """
+        대기 중인 작업은 바로 취소하고, 실행 중인 작업은 워커가 취소하도록 표시합니다.
+        uncancellable_handlers(스레드에서 실행되는 동기 핸들러)의 실행 중인 작업은 취소하지 않고 False를 반환합니다.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, handler, job_data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] not in ("QUEUED", "PROCESSING"):
+                conn.execute("ROLLBACK")
+                return False
+            if row["status"] == "PROCESSING" and row["handler"] in uncancellable_handlers:
+                conn.execute("ROLLBACK")
+                return False
+            job_data = json.loads(row["job_data"])
+            job_data.update({"status": "CANCELLED", "message": "사용자 요청으로 작업이 취소되었습니다."})
+            conn.execute(
+                "UPDATE jobs SET status = 'CANCELLED', cancel_requested = 1, job_data = ? WHERE job_id = ?",
+                (json.dumps(job_data, ensure_ascii=False, default=str), job_id)
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def running_handler(self, job_id: str) -> Optional[str]:
+        """실행 중인 작업의 핸들러 이름. 실행 중이 아니면 None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT handler FROM jobs WHERE job_id = ? AND status = 'PROCESSING'", (job_id,)).fetchone()
+            return row["handler"] if row else None
+        finally:
+            conn.close()
+
+    def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT status, job_data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job_data = json.loads(row["job_data"])
+            job_data["status"] = row["status"]
+            return job_data
+        finally:
+            conn.close()
+
+    def list_jobs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT job_id, status, job_data FROM jobs").fetchall()
+            jobs = []
+            for row in rows:
+                job_data = json.loads(row["job_data"])
+                job_data["status"] = row["status"]
+                jobs.append((row["job_id"], job_data))
+            return jobs
+        finally:
+            conn.close()
+
+    def position(self, job_id: str) -> Optional[int]:
+        """대기 중인 작업의 대략적인 실행 순번(1부터)을 반환합니다."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT queue_name, priority_class, size_hint, created_at FROM jobs WHERE job_id = ? AND status = 'QUEUED'",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            ahead = conn.execute(
+                """
+                SELECT COUNT(*) FROM jobs
+                WHERE queue_name = ? AND status = 'QUEUED' AND job_id != ?
+                  AND (priority_class < ? OR (priority_class = ? AND size_hint < ?)
+                       OR (priority_class = ? AND size_hint = ? AND created_at < ?))
+                """,
+                (row["queue_name"], job_id, row["priority_class"], row["priority_class"], row["size_hint"],
+                 row["priority_class"], row["size_hint"], row["created_at"])
+            ).fetchone()[0]
+            return ahead + 1
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT queue_name, status, COUNT(*) AS cnt FROM jobs WHERE status IN ('QUEUED', 'PROCESSING') GROUP BY queue_name, status"
+            ).fetchall()
+            stats: Dict[str, Dict[str, int]] = {}
+            for row in rows:
+                key = "pending" if row["status"] == "QUEUED" else "running"
+                stats.setdefault(row["queue_name"], {"pending": 0, "running": 0})[key] = row["cnt"]
+            return stats
+        finally:
+            conn.close()
+
+
+def spool_payload(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """payload의 bytes 값을 공유 스풀 디렉토리의 파일로 옮기고 경로 참조로 바꿉니다."""
+    os.makedirs(JOB_SPOOL_DIR, exist_ok=True)
+    spooled = {}
+    for key, value in payload.items():
+        if isinstance(value, (bytes, bytearray)):
+            path = os.path.abspath(os.path.join(JOB_SPOOL_DIR, f"{job_id}_{key}.bin"))
+            with open(path, "wb") as f:
+                f.write(value)
+            spooled[key] = {_SPOOL_MARKER: path}
+        else:
+            spooled[key] = value
+    return spooled
+
+
+def load_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """spool_payload로 파일에 옮겨둔 값을 다시 bytes로 읽어옵니다."""
+    loaded = {}
+    for key, value in payload.items():
+        if isinstance(value, dict) and _SPOOL_MARKER in value:
+            with open(value[_SPOOL_MARKER], "rb") as f:
+                loaded[key] = f.read()
+        else:
+            loaded[key] = value
+    return loaded
+
+
+def cleanup_spool(payload: Dict[str, Any]):
+    """작업이 끝난 뒤 스풀 파일을 삭제합니다."""
+    for value in payload.values():
+        if isinstance(value, dict) and _SPOOL_MARKER in value:
+            try:
+                os.remove(value[_SPOOL_MARKER])
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"스풀 파일 삭제 실패 ({value[_SPOOL_MARKER]}): {e}")
+
+
+# 애플리케이션 전역 작업 큐 인스턴스 (worker 모드에서 사용)
+os.makedirs(os.path.dirname(JOB_QUEUE_DB_PATH) or ".", exist_ok=True)
+job_queue = SqliteJobQueue(JOB_QUEUE_DB_PATH)
@@ -0,0 +1,105 @@
+# app/services/job_result_buffer_service.py
+"""
+처리 중인 SRS 작업의 부분 결과(평가가 끝난 요구사항)를 모아 두는 결과 버퍼입니다.
+
+요구사항 평가가 하나 끝날 때마다 JOB_RESULT_BUFFER_DIR/<job_id>.jsonl 에 한 줄씩 추가하므로,
+작업 전체가 끝나기 전에도 GET /jobs/{id}/requirements?offset=&limit= 로 앞부분부터 조회할 수 있습니다.
+- 항목은 완료된 순서대로 쌓이며 추가만 되므로, 응답의 next_offset 을 다음 요청의 offset(커서)으로 쓰면
+  새로 완료된 항목만 이어서 받을 수 있습니다.
+- 파일 기반이므로 worker 모드에서는 API와 워커가 같은 볼륨을 보도록 공유 디렉토리로 지정해야 합니다.
+- 작업이 끝나면 완료 표시를 남기며, JOB_RESULT_BUFFER_RETENTION_HOURS 가 지난 버퍼는 정리됩니다.
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import JOB_RESULT_BUFFER_DIR, JOB_RESULT_BUFFER_RETENTION_HOURS
+
+
+class JobResultBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(JOB_RESULT_BUFFER_DIR, f"{job_id}.jsonl")
+
+    def _write_lines(self, job_id: str, records: List[Dict[str, Any]], mode: str):
+        lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n" for record in records)
+        with self._lock:
+            os.makedirs(JOB_RESULT_BUFFER_DIR, exist_ok=True)
+            with open(self._path(job_id), mode, encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+
+    def reset(self, job_id: str, completed: Optional[Dict[int, Any]] = None):
+        """
+        새 평가 단계를 시작할 때 호출합니다. 재개된 작업은 이미 끝난 항목(인덱스 -> 결과)으로 버퍼를 다시 채웁니다.
+        """
+        self.prune_expired()
+        records = [{"index": index, "item": item} for index, item in sorted((completed or {}).items())]
+        self._write_lines(job_id, records, "w")
+
+    def append(self, job_id: str, index: int, item: Dict[str, Any]):
+        """평가가 끝난 요구사항 하나를 추가합니다. (여러 스레드에서 호출 가능)"""
+        self._write_lines(job_id, [{"index": index, "item": item}], "a")
+
+    def mark_complete(self, job_id: str):
+        self._write_lines(job_id, [{"complete": True}], "a")
+
+    def exists(self, job_id: str) -> bool:
+        return os.path.exists(self._path(job_id))
+
+    def read(self, job_id: str, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        offset 번째부터 최대 limit 개의 항목을 완료 순서대로 반환합니다.
+        반환값: {"items": [{"index", ...요구사항}], "buffered": 전체 버퍼 항목 수, "next_offset": 다음 offset, "complete": bool}
+        """
+        items: List[Dict[str, Any]] = []
+        buffered = 0
+        complete = False
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # 기록 중인 마지막 줄
+                    if record.get("complete"):
+                        complete = True
+                        continue
+                    if offset <= buffered < offset + limit:
+                        items.append({"index": record["index"], **record["item"]})
+                    buffered += 1
+        except FileNotFoundError:
+            pass
+        return {
+            "items": items,
+            "buffered": buffered,
+            "next_offset": offset + len(items),
+            "complete": complete,
+        }
+
+    def clear(self, job_id: str):
+        try:
+            os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def prune_expired(self):
+        """보관 기간이 지난 버퍼 파일을 삭제합니다."""
+        if not os.path.isdir(JOB_RESULT_BUFFER_DIR):
+            return
+        cutoff = time.time() - JOB_RESULT_BUFFER_RETENTION_HOURS * 3600
+        for name in os.listdir(JOB_RESULT_BUFFER_DIR):
+            path = os.path.join(JOB_RESULT_BUFFER_DIR, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+# 애플리케이션 전역 결과 버퍼
+job_result_buffer = JobResultBuffer()
@@ -0,0 +1,344 @@
+# app/services/job_scheduler_service.py
+import asyncio
+import inspect
+import itertools
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import (
+    JOB_QUEUE_WORKERS,
+    JOB_QUEUE_MAX_PENDING,
+    JOB_PRIORITY_POLICY,
+    JOB_PROJECT_PRIORITIES,
+    JOB_PRIORITY_AGING_SECONDS,
+    JOB_EXECUTION_MODE,
+)
+from app.api.v2.jobs import job_store, update_job_status, set_job_state_backend
+from app.services.job_queue_service import job_queue, spool_payload, cleanup_spool
+
+
+class JobQueueFullError(Exception):
+    """큐의 대기 작업 수가 한도를 넘어 작업을 받을 수 없을 때 발생합니다."""
+    def __init__(self, queue_name: str, pending: int):
+        self.queue_name = queue_name
+        self.pending = pending
+        super().__init__(f"'{queue_name}' 큐가 가득 찼습니다 (대기 {pending}건). 잠시 후 다시 시도해주세요.")
+
+
+class JobNotCancellableError(Exception):
+    """스레드에서 실행 중인 동기 작업처럼 중간에 멈출 수 없는 작업을 취소하려 할 때 발생합니다."""
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        super().__init__("실행 중인 동기 작업은 중간에 멈출 수 없어 취소할 수 없습니다. 작업이 끝난 뒤 결과를 무시하거나 삭제해주세요.")
+
+
+class _JobEntry:
+    """스케줄러 내부에서 관리하는 작업 단위."""
+    def __init__(self, job_id: str, queue_name: str, func: Callable, args: tuple, kwargs: dict,
+                 priority: tuple, fair_key: Any, seq: int):
+        self.job_id = job_id
+        self.queue_name = queue_name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.fair_key = fair_key
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+
+class _JobQueue:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self.pending: List[_JobEntry] = []
+        self.running: Dict[str, _JobEntry] = {}
+        self.running_by_key: Dict[Any, int] = defaultdict(int)
+        self.condition: Optional[asyncio.Condition] = None
+        self.worker_tasks: List[asyncio.Task] = []
+
+
+def _parse_project_priorities(raw: str) -> Dict[int, int]:
+    """"12=0,7=5" 형식의 환경 변수를 {프로젝트 ID: 우선순위} 딕셔너리로 변환합니다."""
+    priorities = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        try:
+            project_id, priority = item.split("=")
+            priorities[int(project_id)] = int(priority)
+        except ValueError:
+            print(f"경고: JOB_PROJECT_PRIORITIES 항목 '{item}'을(를) 해석할 수 없어 무시합니다.")
+    return priorities
+
+
+class JobScheduler:
+    """
+    작업 유형별 이름 있는 큐와 고정 크기 워커 풀로 백그라운드 작업을 실행하는 인프로세스 스케줄러입니다.
+    - 우선순위: 작은 문서 우선(size) 또는 프로젝트 우선순위(project), 대기 시간이 길수록 보정
+    - 공정 분배: 같은 큐에서 실행 중인 작업이 적은 프로젝트의 작업을 먼저 꺼냄
+    - 승인 제어: 큐별 대기 작업 수가 한도를 넘으면 JobQueueFullError
+    - 취소: 대기 중인 작업은 큐에서 제거, 실행 중인 작업은 Task 취소
+    """
+    def __init__(self, queue_workers: Dict[str, int], max_pending: int, policy: str = "size"):
+        self.max_pending = max_pending
+        self.policy = policy
+        self.project_priorities = _parse_project_priorities(JOB_PROJECT_PRIORITIES)
+        self._queues = {name: _JobQueue(name, workers) for name, workers in queue_workers.items()}
+        self._entries: Dict[str, _JobEntry] = {}
+        self._seq = itertools.count()
+
+    def _get_queue(self, queue_name: str) -> _JobQueue:
+        if queue_name not in self._queues:
+            self._queues[queue_name] = _JobQueue(queue_name, 1)
+        return self._queues[queue_name]
+
+    def _ensure_workers(self, queue: _JobQueue):
+        """이벤트 루프가 실행 중인 시점(첫 작업 제출 시)에 큐의 워커들을 띄웁니다."""
+        if queue.condition is None:
+            queue.condition = asyncio.Condition()
+        queue.worker_tasks = [t for t in queue.worker_tasks if not t.done()]
+        for i in range(len(queue.worker_tasks), queue.workers):
+            queue.worker_tasks.append(asyncio.create_task(self._worker(queue, i)))
+
+    def _make_priority(self, size_hint: int, project_id: Optional[int]) -> tuple:
+        if self.policy == "fifo":
+            return (0, 0)
+        if self.policy == "project":
+            return (self.project_priorities.get(project_id, 100), size_hint)
+        return (0, size_hint)
+
+    def _rank(self, queue: _JobQueue, entry: _JobEntry, now: float) -> tuple:
+        # 대기 시간이 길어질수록 문서 크기 가중치를 낮춰 큰 문서가 무한정 밀리지 않도록 함
+        waited = now - entry.enqueued_at
+        aged_size = entry.priority[1] / (1.0 + waited / JOB_PRIORITY_AGING_SECONDS)
+        return (queue.running_by_key[entry.fair_key], entry.priority[0], aged_size, entry.seq)
+
+    async def submit(
+        self,
+        job_id: str,
+        queue_name: str,
+        func: Callable,
+        *args,
+        size_hint: int = 0,
+        project_id: Optional[int] = None,
+        member_id: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        작업을 큐에 등록하고 현재 상태(QUEUED/PROCESSING)와 대기 순번을 반환합니다.
+        func는 코루틴 함수 또는 일반 함수(스레드에서 실행) 모두 가능합니다.
+        """
+        queue = self._get_queue(queue_name)
+        self._ensure_workers(queue)
+
+        if len(queue.pending) >= self.max_pending:
+            raise JobQueueFullError(queue_name, len(queue.pending))
+
+        fair_key = project_id if project_id is not None else member_id
+        entry = _JobEntry(
+            job_id, queue_name, func, args, kwargs,
+            priority=self._make_priority(size_hint, project_id),
+            fair_key=fair_key,
+            seq=next(self._seq),
+        )
+        self._entries[job_id] = entry
+
+        async with queue.condition:
+            queue.pending.append(entry)
+            if job_id in job_store:
+                job_store[job_id]["status"] = "QUEUED"
+                job_store[job_id]["queue"] = queue_name
+            queue.condition.notify()
+
+        # 빈 워커가 있으면 바로 실행되므로 한 번 양보한 뒤 실제 상태를 돌려줌
+        await asyncio.sleep(0)
+        return {
+            "status": "PROCESSING" if job_id in queue.running else "QUEUED",
+            "queue": queue_name,
+            "queue_position": self.position(job_id),
+        }
+
+    def position(self, job_id: str) -> Optional[int]:
+        """대기 중인 작업의 예상 실행 순번(1부터)을 반환합니다. 대기 중이 아니면 None."""
+        entry = self._entries.get(job_id)
+        if not entry:
+            return None
+        queue = self._queues[entry.queue_name]
+        if entry not in queue.pending:
+            return None
+        now = time.monotonic()
+        ordered = sorted(queue.pending, key=lambda e: self._rank(queue, e, now))
+        return ordered.index(entry) + 1
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        작업을 취소합니다. 취소했으면 True, 이미 끝났거나 모르는 작업이면 False.
+        asyncio.to_thread로 실행 중인 동기 작업은 태스크를 취소해도 스레드가 계속 실행되므로 JobNotCancellableError를 발생시킵니다.
+        """
+        entry = self._entries.get(job_id)
+        if not entry or entry.cancelled:
+            return False
+        queue = self._queues[entry.queue_name]
+        entry.cancelled = True
+
+        async with queue.condition:
+            if entry in queue.pending:
+                queue.pending.remove(entry)
+                self._entries.pop(job_id, None)
+                self._mark_cancelled(job_id)
+                return True
+
+        if entry.task and not entry.task.done() and not inspect.iscoroutinefunction(entry.func):
+            entry.cancelled = False
+            raise JobNotCancellableError(job_id)
+        if entry.task and not entry.task.done():
+            entry.task.cancel()
+            self._mark_cancelled(job_id)
+            return True
+        return False
+
+    def _mark_cancelled(self, job_id: str):
+        if job_id in job_store:
+            update_job_status(job_id=job_id, status="CANCELLED", message="사용자 요청으로 작업이 취소되었습니다.")
+
+    async def _worker(self, queue: _JobQueue, worker_index: int):
+        while True:
+            async with queue.condition:
+                while not queue.pending:
+                    await queue.condition.wait()
+                now = time.monotonic()
+                entry = min(queue.pending, key=lambda e: self._rank(queue, e, now))
+                queue.pending.remove(entry)
+                queue.running[entry.job_id] = entry
+                queue.running_by_key[entry.fair_key] += 1
+
+            print(f"[스케줄러] '{queue.name}' 워커 {worker_index}: Job {entry.job_id} 실행 시작 "
+                  f"(대기 {time.monotonic() - entry.enqueued_at:.1f}s, 남은 대기 {len(queue.pending)}건)")
+            if entry.job_id in job_store:
+                job_store[entry.job_id]["status"] = "PROCESSING"
+
+            try:
+                if inspect.iscoroutinefunction(entry.func):
+                    entry.task = asyncio.create_task(entry.func(*entry.args, **entry.kwargs))
+                else:
+                    entry.task = asyncio.create_task(asyncio.to_thread(entry.func, *entry.args, **entry.kwargs))
+                await entry.task
+                # 작업 함수가 스스로 최종 상태를 기록하지 않았다면 완료로 표시
+                if entry.job_id in job_store and job_store[entry.job_id]["status"] == "PROCESSING":
+                    update_job_status(
+                        job_id=entry.job_id,
+                        status="COMPLETED",
+                        result=job_store[entry.job_id].get("result"),
+                        message="작업이 완료되었습니다."
+                    )
+            except asyncio.CancelledError:
+                if not entry.cancelled:
+                    raise
+                print(f"[스케줄러] Job {entry.job_id} 실행 중 취소됨.")
+            except Exception as e:
+                print(f"[스케줄러] Job {entry.job_id} 처리 중 처리되지 않은 오류: {e}")
+                if entry.job_id in job_store and job_store[entry.job_id]["status"] not in ("FAILED", "CANCELLED"):
+                    update_job_status(job_id=entry.job_id, status="FAILED", error=str(e), message=f"작업 실패: {e}")
+            finally:
+                queue.running.pop(entry.job_id, None)
+                queue.running_by_key[entry.fair_key] -= 1
+                if queue.running_by_key[entry.fair_key] <= 0:
+                    queue.running_by_key.pop(entry.fair_key, None)
+                self._entries.pop(entry.job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐별 워커 수, 대기/실행 중인 작업 수를 반환합니다."""
+        return {
+            name: {
+                "workers": queue.workers,
+                "pending": len(queue.pending),
+                "running": len(queue.running),
+                "max_pending": self.max_pending,
+            }
+            for name, queue in self._queues.items()
+        }
+
+
+# 애플리케이션 전역 스케줄러 인스턴스
+job_scheduler = JobScheduler(JOB_QUEUE_WORKERS, JOB_QUEUE_MAX_PENDING, JOB_PRIORITY_POLICY)
+
+if JOB_EXECUTION_MODE == "worker":
+    # 작업 상태를 워커 프로세스와 공유
+    set_job_state_backend(job_queue)
+
+# 작업 핸들러 레지스트리: 핸들러 이름 → payload(dict) 하나를 받아 실행하는 함수
+# API 프로세스(inprocess 모드)와 워커 프로세스(worker 모드)가 같은 핸들러를 사용합니다.
+JOB_HANDLERS: Dict[str, Callable] = {}
+
+def job_handler(name: str):
+    """작업 핸들러를 이름으로 등록하는 데코레이터."""
+    def decorator(func: Callable) -> Callable:
+        JOB_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+async def dispatch_job(
+    job_id: str,
+    queue_name: str,
+    handler_name: str,
+    payload: Dict[str, Any],
+    size_hint: int = 0,
+    project_id: Optional[int] = None,
+    member_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    실행 모드에 따라 작업을 인프로세스 스케줄러 또는 워커용 공유 큐에 등록합니다.
+    worker 모드에서는 payload의 bytes 값을 공유 스풀 디렉토리로 옮기므로 payload는 JSON 직렬화 가능해야 합니다.
+    """
+    if JOB_EXECUTION_MODE != "worker":
+        return await job_scheduler.submit(
+            job_id, queue_name, JOB_HANDLERS[handler_name], payload,
+            size_hint=size_hint, project_id=project_id, member_id=member_id
+        )
+
+    def _enqueue() -> Dict[str, Any]:
+        spooled = spool_payload(job_id, payload)
+        pending = job_queue.enqueue(
+            job_id, queue_name, handler_name, spooled,
+            job_data=job_store.get(job_id, {}),
+            priority_class=job_scheduler._make_priority(size_hint, project_id)[0],
+            size_hint=size_hint,
+            fair_key=project_id if project_id is not None else member_id,
+            max_pending=job_scheduler.max_pending
+        )
+        if pending is None:
+            cleanup_spool(spooled)
+            raise JobQueueFullError(queue_name, job_scheduler.max_pending)
+        # 이후 상태는 공유 저장소에서 읽으므로 로컬 항목은 제거
+        job_store.pop(job_id, None)
+        return {"status": "QUEUED", "queue": queue_name, "queue_position": job_queue.position(job_id)}
+
+    return await asyncio.to_thread(_enqueue)
+
+
+async def cancel_job(job_id: str) -> bool:
+    """실행 모드에 맞게 작업 취소를 요청합니다. 실행 중인 동기 작업이면 JobNotCancellableError를 발생시킵니다."""
+    if JOB_EXECUTION_MODE == "worker":
+        # 워커도 동기 핸들러는 스레드에서 실행하므로 실행 중에는 멈출 수 없음
+        sync_handlers = {name for name, func in JOB_HANDLERS.items() if not inspect.iscoroutinefunction(func)}
+        if await asyncio.to_thread(job_queue.request_cancel, job_id, sync_handlers):
+            return True
+        if await asyncio.to_thread(job_queue.running_handler, job_id) in sync_handlers:
+            raise JobNotCancellableError(job_id)
+        return False
+    return await job_scheduler.cancel(job_id)
+
+
+def get_queue_position(job_id: str) -> Optional[int]:
+    if JOB_EXECUTION_MODE == "worker":
+        return job_queue.position(job_id)
+    return job_scheduler.position(job_id)
+
+
+def get_queue_stats() -> Dict[str, Any]:
+    if JOB_EXECUTION_MODE == "worker":
+        return job_queue.stats()
+    return job_scheduler.stats()
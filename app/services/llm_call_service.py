@@ -1,16 +1,38 @@
 # app/services/llm_call_service.py
+import re
 import json
-import google.generativeai as genai
-from openai import OpenAI
-from typing import Any, Optional, List, Dict
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, List, Dict, Tuple
 
-from app.core.config import LLM_MODEL, OPENAI_API_KEY, GOOGLE_API_KEY, GEMINI_MODEL
+from app.core.config import (
+    LLM_MODEL, OPENAI_API_KEY, GOOGLE_API_KEY, GEMINI_MODEL, ANTHROPIC_API_KEY, ANTHROPIC_LLM_MODEL,
+    LLM_FAILOVER_POLICY, LLM_REQUEST_TIMEOUT_SECONDS, LLM_PROVIDER_MAX_RETRIES, LLM_BREAKER_SLOW_CALL_SECONDS,
+    LLM_AGENT_TIMEOUTS, LLM_HEDGE_ENABLED, LLM_HEDGE_TARGET, LLM_HEDGE_MAX_WORKERS,
+)
+from app.core.lazy import lazy_resource
+from app.services.circuit_breaker_service import STATE_CLOSED, get_circuit_breaker
+from app.services.llm_hedging_service import hedge_stats
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=OPENAI_API_KEY)
+# OpenAI 클라이언트 (첫 호출 또는 워밍업 시 생성, 에이전트들이 연결 풀을 공유)
+@lazy_resource("openai_client")
+def client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
 
-# Google Gemini 초기화
-genai.configure(api_key=GOOGLE_API_KEY)
+# Google Gemini (첫 호출 또는 워밍업 시 import 및 설정)
+@lazy_resource("gemini")
+def genai():
+    import google.generativeai as genai_module
+    genai_module.configure(api_key=GOOGLE_API_KEY)
+    return genai_module
+
+# Anthropic 클라이언트 (call_llm 장애 대응용, 첫 사용 시 생성)
+@lazy_resource("anthropic_client", warm_up=False)
+def anthropic_client():
+    import anthropic
+    return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=LLM_PROVIDER_MAX_RETRIES)
 
 # === 3. LLM 호출 헬퍼 함수 (기존과 동일) ===
 def call_gpt(
@@ -81,3 +103,266 @@ def call_gemini(prompt: str, is_json_output: bool = False) -> Optional[Any]:
     except Exception as e:
         print(f"An error occurred during Gemini API call: {type(e).__name__} - {e}")
         return None
+
+
+# === 제공자 장애 대응 호출 (서킷 브레이커 + 에이전트별 failover 정책) ===
+class LLMUnavailableError(Exception):
+    """정책의 모든 LLM 제공자를 호출할 수 없을 때(오류, 서킷 브레이커 open, API 키 없음) 발생합니다."""
+    def __init__(self, agent: str, errors: Dict[str, str]):
+        self.agent = agent
+        self.errors = errors
+        details = ", ".join(f"{provider}: {error}" for provider, error in errors.items())
+        super().__init__(f"'{agent}' 에이전트가 사용할 수 있는 LLM 제공자가 없습니다. ({details})")
+
+
+def _openai_chat(model: str, system_prompt: str, user_prompt: str, is_json_output: bool, temperature: float, max_tokens: int, timeout: float) -> Optional[str]:
+    request_params = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if is_json_output:
+        request_params["response_format"] = {"type": "json_object"}
+    response = client.with_options(timeout=timeout, max_retries=LLM_PROVIDER_MAX_RETRIES).chat.completions.create(**request_params)
+    return response.choices[0].message.content
+
+
+def _gemini_chat(model: str, system_prompt: str, user_prompt: str, is_json_output: bool, temperature: float, max_tokens: int, timeout: float) -> Optional[str]:
+    model_instance = genai.GenerativeModel(
+        model_name=model,
+        system_instruction=system_prompt,
+        generation_config={
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "response_mime_type": "application/json" if is_json_output else "text/plain",
+        },
+    )
+    response = model_instance.generate_content(user_prompt, request_options={"timeout": timeout})
+    return response.text
+
+
+def _anthropic_chat(model: str, system_prompt: str, user_prompt: str, is_json_output: bool, temperature: float, max_tokens: int, timeout: float) -> Optional[str]:
+    if is_json_output: # JSON 모드가 없으므로 지시문으로 형식을 고정
+        system_prompt = f"{system_prompt}\n\n응답은 설명이나 코드 블록 없이 하나의 유효한 JSON 객체만 출력하십시오."
+    response = anthropic_client.with_options(timeout=timeout).messages.create(
+        model=model,
+        system=system_prompt,
+        messages=[{"role": "user", "content": user_prompt}],
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    return "".join(block.text for block in response.content if getattr(block, "type", "") == "text")
+
+
+# 제공자 이름 → (호출 함수, 기본 모델, API 키)
+LLM_PROVIDERS: Dict[str, Tuple[Callable[..., Optional[str]], str, Optional[str]]] = {
+    "openai": (_openai_chat, LLM_MODEL, OPENAI_API_KEY),
+    "gemini": (_gemini_chat, GEMINI_MODEL, GOOGLE_API_KEY),
+    "anthropic": (_anthropic_chat, ANTHROPIC_LLM_MODEL, ANTHROPIC_API_KEY),
+}
+
+
+def _parse_failover_policy(raw: str) -> Dict[str, List[Tuple[str, str]]]:
+    """'agent=openai,gemini:gemini-2.5-flash;...' 형식을 {에이전트: [(제공자, 모델)]}로 변환합니다."""
+    policies: Dict[str, List[Tuple[str, str]]] = {}
+    for entry in raw.split(";"):
+        agent, _, providers = entry.partition("=")
+        chain = []
+        for item in providers.split(","):
+            provider, _, model = item.strip().partition(":")
+            if provider not in LLM_PROVIDERS:
+                if provider:
+                    print(f"경고: LLM_FAILOVER_POLICY의 알 수 없는 제공자를 무시합니다: {provider}")
+                continue
+            chain.append((provider, model or LLM_PROVIDERS[provider][1]))
+        if agent.strip() and chain:
+            policies[agent.strip()] = chain
+    policies.setdefault("default", [("openai", LLM_MODEL)])
+    return policies
+
+FAILOVER_POLICIES = _parse_failover_policy(LLM_FAILOVER_POLICY)
+
+_JSON_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def _parse_json_output(text: str) -> Any:
+    """제공자마다 다른 JSON 응답(코드 블록, 앞뒤 설명 포함 등)을 같은 형태로 파싱합니다."""
+    cleaned = _JSON_FENCE_PATTERN.sub("", text.strip())
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        start = min((i for i in (cleaned.find("{"), cleaned.find("[")) if i >= 0), default=-1)
+        end = max(cleaned.rfind("}"), cleaned.rfind("]"))
+        if start < 0 or end <= start:
+            raise
+        return json.loads(cleaned[start:end + 1])
+
+
+def _parse_agent_timeouts(raw: str) -> Dict[str, float]:
+    timeouts = {}
+    for item in raw.split(","):
+        agent, _, seconds = item.partition("=")
+        if agent.strip() and seconds.strip():
+            timeouts[agent.strip()] = float(seconds)
+    return timeouts
+
+AGENT_TIMEOUTS = _parse_agent_timeouts(LLM_AGENT_TIMEOUTS)
+
+# 중복 요청만 실행하는 스레드 풀 (기본 요청은 호출마다 전용 스레드에서 바로 시작)
+_hedge_executor = ThreadPoolExecutor(max_workers=LLM_HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+
+# _attempt 결과 종류
+ATTEMPT_OK = "ok"             # 유효한 응답
+ATTEMPT_INVALID = "invalid"   # 응답은 받았지만 비었거나 JSON이 아님
+ATTEMPT_ERROR = "error"       # 호출 오류
+ATTEMPT_SKIPPED = "skipped"   # API 키 없음 / 서킷 브레이커 open
+
+
+def _attempt(agent: str, provider: str, model: str, request: Dict[str, Any]) -> Tuple[str, Any]:
+    """제공자 한 곳을 호출합니다. (종류, 값 또는 오류 메시지)를 반환합니다."""
+    call_provider, _, api_key = LLM_PROVIDERS[provider]
+    if not api_key:
+        return ATTEMPT_SKIPPED, "API 키 없음"
+    breaker = get_circuit_breaker(f"llm:{provider}")
+    if not breaker.allow_request():
+        return ATTEMPT_SKIPPED, "서킷 브레이커 open"
+
+    start = time.monotonic()
+    try:
+        content = call_provider(model, **request)
+    except Exception as e:
+        breaker.record_failure(f"{type(e).__name__}: {e}")
+        print(f"[LLM] {agent}: {provider}({model}) 호출 실패 - {type(e).__name__}: {str(e)[:200]}")
+        return ATTEMPT_ERROR, f"{type(e).__name__}: {str(e)[:200]}"
+    elapsed = time.monotonic() - start
+    if elapsed >= LLM_BREAKER_SLOW_CALL_SECONDS:
+        breaker.record_failure(f"느린 응답 ({elapsed:.1f}s)")
+    else:
+        breaker.record_success()
+
+    if not content:
+        print(f"[LLM] {agent}: {provider}({model}) 응답 내용 없음")
+        return ATTEMPT_INVALID, None
+    if request["is_json_output"]:
+        try:
+            value = _parse_json_output(content)
+        except json.JSONDecodeError as e:
+            print(f"[LLM] {agent}: {provider}({model}) JSON 파싱 오류: {e}. 응답: {content[:300]}...")
+            return ATTEMPT_INVALID, None
+    else:
+        value = content.strip()
+    hedge_stats.record_latency(agent, elapsed)
+    return ATTEMPT_OK, value
+
+
+def _hedge_target(chain: List[Tuple[str, str]]) -> Tuple[str, str]:
+    """중복 요청을 보낼 (제공자, 모델). alternate 모드에서는 키가 있고 브레이커가 닫힌 다음 제공자를 고릅니다."""
+    if LLM_HEDGE_TARGET == "alternate":
+        for provider, model in chain[1:]:
+            if LLM_PROVIDERS[provider][2] and get_circuit_breaker(f"llm:{provider}").state == STATE_CLOSED:
+                return provider, model
+    return chain[0]
+
+
+def _start_primary(agent: str, target: Tuple[str, str], request: Dict[str, Any]) -> Tuple[Future, threading.Event]:
+    """
+    기본 요청을 전용 스레드에서 바로 시작합니다. 공유 풀에서 대기하지 않으므로 동시 호출 수가 풀 크기로 제한되지 않습니다.
+    반환: (결과 Future, 호출 시작 이벤트)
+    """
+    future: Future = Future()
+    started = threading.Event()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        started.set()
+        try:
+            future.set_result(_attempt(agent, *target, request))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"llm-{agent}", daemon=True).start()
+    return future, started
+
+
+def _hedged_attempt(agent: str, chain: List[Tuple[str, str]], request: Dict[str, Any], delay: float) -> List[Tuple[Tuple[str, str], str, Any]]:
+    """
+    첫 제공자를 호출하고, 호출이 시작된 뒤 delay(p95) 안에 끝나지 않으면 예산 안에서 중복 요청을 보냅니다.
+    먼저 유효한 응답이 오면 바로 반환하며, 늦게 끝나는 요청은 결과만 버립니다. (HTTP 요청은 취소할 수 없음)
+    반환: [((제공자, 모델), 종류, 값)] - 유효한 응답을 받으면 그 결과가 마지막 항목입니다.
+    """
+    primary = chain[0]
+    primary_future, started = _start_primary(agent, primary, request)
+    futures = {primary_future: (primary, False)}
+    started.wait()
+    done, _ = wait(futures, timeout=delay)
+    if not done and hedge_stats.try_acquire_hedge(agent):
+        target = _hedge_target(chain)
+        print(f"[LLM] {agent}: {primary[0]} 응답이 {delay:.1f}s(p95)를 넘어 {target[0]}({target[1]})에 중복 요청")
+        futures[_hedge_executor.submit(_attempt, agent, *target, request)] = (target, True)
+
+    outcomes = []
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            target, is_hedge = futures[future]
+            kind, value = future.result()
+            outcomes.append((target, kind, value))
+            if kind == ATTEMPT_OK:
+                if is_hedge:
+                    hedge_stats.record_hedge_win(agent)
+                return outcomes
+    return outcomes
+
+
+def call_llm(
+    system_prompt: str,
+    user_prompt: str,
+    is_json_output: bool = False,
+    agent: str = "default",
+    temperature: float = 0.0,
+    max_tokens: int = 4000,
+) -> Optional[Any]:
+    """
+    에이전트의 failover 정책(LLM_FAILOVER_POLICY) 순서대로 제공자를 호출합니다.
+    - 서킷 브레이커가 열린 제공자나 API 키가 없는 제공자는 건너뜁니다.
+    - 호출 오류(429, 타임아웃, 5xx 등)와 LLM_BREAKER_SLOW_CALL_SECONDS 보다 느린 응답은 브레이커 실패로 집계합니다.
+    - 호출 제한 시간은 에이전트별 LLM_AGENT_TIMEOUTS (없으면 LLM_REQUEST_TIMEOUT_SECONDS) 입니다.
+    - LLM_HEDGE_ENABLED 이면 첫 호출이 에이전트의 p95 지연을 넘길 때 중복 요청을 보내 먼저 온 유효한 응답을 사용합니다.
+    - 응답이 비었거나 JSON 파싱에 실패하면 다음 제공자를 시도하고, 모든 제공자가 그렇다면 None을 반환합니다.
+    - 어떤 제공자도 호출할 수 없으면 빈 결과 대신 LLMUnavailableError를 발생시킵니다. (작업이 실패로 기록되어 재개 가능)
+    """
+    chain = FAILOVER_POLICIES.get(agent) or FAILOVER_POLICIES["default"]
+    request = {
+        "system_prompt": system_prompt,
+        "user_prompt": user_prompt,
+        "is_json_output": is_json_output,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "timeout": AGENT_TIMEOUTS.get(agent, LLM_REQUEST_TIMEOUT_SECONDS),
+    }
+    hedge_stats.record_call(agent)
+
+    outcomes: List[Tuple[Tuple[str, str], str, Any]] = []
+    remaining = list(chain)
+    delay = hedge_stats.hedge_delay(agent) if LLM_HEDGE_ENABLED else None
+    if delay is not None:
+        outcomes = _hedged_attempt(agent, chain, request, delay)
+        if outcomes[-1][1] == ATTEMPT_OK:
+            return outcomes[-1][2]
+        tried = {target for target, _, _ in outcomes}
+        remaining = [target for target in chain if target not in tried]
+
+    for provider, model in remaining:
+        kind, value = _attempt(agent, provider, model, request)
+        if kind == ATTEMPT_OK:
+            return value
+        outcomes.append(((provider, model), kind, value))
+
+    if not any(kind == ATTEMPT_INVALID for _, kind, _ in outcomes):
+        raise LLMUnavailableError(agent, {provider: value for (provider, _), _, value in outcomes})
+    return None
@@ -0,0 +1,109 @@
+# app/services/llm_hedging_service.py
+"""
+LLM 호출의 꼬리 지연(tail latency)을 줄이기 위한 hedged request 지표와 예산을 관리합니다.
+
+- 에이전트별 최근 성공 호출 지연 시간(LLM_HEDGE_WINDOW 개)으로 p95를 계산하고, 호출이 그보다 오래 걸리면
+  call_llm이 같은(또는 대체) 모델에 중복 요청을 보내 먼저 도착한 유효한 응답을 사용합니다.
+- 중복 요청량은 토큰 버킷으로 제한합니다. 기본 호출마다 LLM_HEDGE_BUDGET_RATIO 만큼 토큰이 쌓이고(최대 LLM_HEDGE_BUDGET_BURST),
+  중복 요청 하나가 토큰 하나를 씁니다. 따라서 중복 요청은 장기적으로 전체 호출의 LLM_HEDGE_BUDGET_RATIO 이하입니다.
+- 지표(/ops/llm-latency): 에이전트별 p50/p95, 중복 요청 수, 중복 요청이 이긴 비율(win_rate), 예산 부족으로 건너뛴 수
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import (
+    LLM_HEDGE_WINDOW,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_MIN_DELAY_SECONDS,
+    LLM_HEDGE_BUDGET_RATIO,
+    LLM_HEDGE_BUDGET_BURST,
+)
+
+
+def _percentile(sorted_values, ratio: float) -> float:
+    index = min(int(ratio * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class _AgentLatency:
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_skipped = 0
+
+
+class HedgeStats:
+    def __init__(self, window: int, min_samples: int, min_delay: float, budget_ratio: float, budget_burst: float):
+        self.window = window
+        self.min_samples = max(min_samples, 1)
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self._tokens = budget_burst
+        self._agents: Dict[str, _AgentLatency] = {}
+        self._lock = threading.Lock()
+
+    def _agent(self, agent: str) -> _AgentLatency:
+        stats = self._agents.get(agent)
+        if stats is None:
+            stats = self._agents[agent] = _AgentLatency(self.window)
+        return stats
+
+    def record_call(self, agent: str):
+        """기본(첫) 요청 하나를 집계하고 중복 요청 예산을 적립합니다."""
+        with self._lock:
+            self._agent(agent).calls += 1
+            self._tokens = min(self._tokens + self.budget_ratio, self.budget_burst)
+
+    def record_latency(self, agent: str, seconds: float):
+        """유효한 응답을 받은 호출의 지연 시간을 기록합니다."""
+        with self._lock:
+            self._agent(agent).latencies.append(seconds)
+
+    def hedge_delay(self, agent: str) -> Optional[float]:
+        """중복 요청을 보낼 대기 시간(p95). 표본이 부족하면 None (중복 요청 안 함)."""
+        with self._lock:
+            latencies = self._agent(agent).latencies
+            if len(latencies) < self.min_samples:
+                return None
+            return max(_percentile(sorted(latencies), 0.95), self.min_delay)
+
+    def try_acquire_hedge(self, agent: str) -> bool:
+        with self._lock:
+            stats = self._agent(agent)
+            if self._tokens < 1:
+                stats.budget_skipped += 1
+                return False
+            self._tokens -= 1
+            stats.hedges += 1
+            return True
+
+    def record_hedge_win(self, agent: str):
+        with self._lock:
+            self._agent(agent).hedge_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {}
+            for name, stats in self._agents.items():
+                ordered = sorted(stats.latencies)
+                agents[name] = {
+                    "calls": stats.calls,
+                    "samples": len(ordered),
+                    "p50_seconds": round(_percentile(ordered, 0.5), 2) if ordered else None,
+                    "p95_seconds": round(_percentile(ordered, 0.95), 2) if ordered else None,
+                    "hedges": stats.hedges,
+                    "hedge_wins": stats.hedge_wins,
+                    "win_rate": round(stats.hedge_wins / stats.hedges, 3) if stats.hedges else None,
+                    "budget_skipped": stats.budget_skipped,
+                }
+            return {"budget_tokens": round(self._tokens, 2), "agents": agents}
+
+
+# 애플리케이션 전역 hedged request 지표
+hedge_stats = HedgeStats(
+    LLM_HEDGE_WINDOW, LLM_HEDGE_MIN_SAMPLES, LLM_HEDGE_MIN_DELAY_SECONDS, LLM_HEDGE_BUDGET_RATIO, LLM_HEDGE_BUDGET_BURST
+)
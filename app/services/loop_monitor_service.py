@@ -0,0 +1,208 @@
+# app/services/loop_monitor_service.py
+"""
+이벤트 루프 지연(event loop lag) 모니터입니다.
+
+- 하트비트: 루프 위에서 EVENT_LOOP_MONITOR_INTERVAL_MS 마다 깨어나는 태스크가 예정 시각보다 얼마나 늦게 깨어났는지(lag)를 기록합니다.
+- 감시 스레드: 하트비트가 EVENT_LOOP_LAG_WARN_MS 이상 멈추면 그 순간의 루프 스레드 스택과 처리 중인 요청(메서드, 경로)을 캡처합니다.
+  루프를 막고 있는 코드가 스택에 그대로 남으므로 어느 핸들러가 동기 I/O(LLM 호출, 파일 처리 등)를 루프에서 실행했는지 알 수 있습니다.
+- 지표(/ops/event-loop): lag p50/p99/최대, 지연(stall) 횟수, 최근 지연의 스택/요청, 지연을 일으킨 코드 위치별 횟수
+처리 중인 요청은 main.py의 InFlightRequestMiddleware가 기록합니다.
+"""
+import asyncio
+import itertools
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import (
+    EVENT_LOOP_MONITOR_INTERVAL_MS,
+    EVENT_LOOP_LAG_WARN_MS,
+    EVENT_LOOP_STALL_HISTORY,
+)
+
+_LAG_WINDOW = 1200 # lag 분포 계산에 사용하는 최근 하트비트 수
+_STACK_LIMIT = 30
+
+
+def _percentile(sorted_values, ratio: float) -> float:
+    index = min(int(ratio * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _blocking_site(frames: List[traceback.FrameSummary]) -> str:
+    """스택에서 루프를 막고 있는 애플리케이션 코드 위치(가장 안쪽의 app/ 프레임)를 찾습니다."""
+    for frame in reversed(frames):
+        if "/app/" in frame.filename.replace("\\", "/") and "loop_monitor_service" not in frame.filename:
+            return f"{frame.filename.rsplit('/app/', 1)[-1]}:{frame.lineno} ({frame.name})"
+    return f"{frames[-1].filename}:{frames[-1].lineno} ({frames[-1].name})" if frames else "unknown"
+
+
+class InFlightRequestMiddleware:
+    """처리 중인 HTTP 요청을 기록하는 ASGI 미들웨어. (루프 지연 시 어떤 요청이 처리 중이었는지 확인용)"""
+
+    def __init__(self, app, monitor: "EventLoopMonitor"):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = self.monitor.request_started(scope.get("method", ""), scope.get("path", ""))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.request_finished(request_id)
+
+
+class EventLoopMonitor:
+    def __init__(self, interval_ms: float, warn_ms: float, history: int):
+        self.interval = interval_ms / 1000
+        self.warn = warn_ms / 1000
+        self._lags: Deque[float] = deque(maxlen=_LAG_WINDOW)
+        self._max_lag = 0.0
+        self._stalls: Deque[Dict[str, Any]] = deque(maxlen=max(history, 1))
+        self._stall_count = 0
+        self._blocking_sites: Counter = Counter()
+        self._in_flight: Dict[int, Dict[str, Any]] = {}
+        self._request_ids = itertools.count(1)
+        self._current_stall: Optional[Dict[str, Any]] = None
+        self._last_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """현재 이벤트 루프에서 모니터를 시작합니다. (startup 이벤트에서 호출)"""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        print(f"[루프 모니터] 시작 (하트비트 {self.interval * 1000:.0f}ms, 경고 기준 {self.warn * 1000:.0f}ms)")
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            with self._lock:
+                self._last_beat = now
+                self._lags.append(lag)
+                self._max_lag = max(self._max_lag, lag)
+                stall, self._current_stall = self._current_stall, None
+                if stall is not None:
+                    # 감시 스레드가 캡처한 지연이 끝났으므로 실제 지연 시간을 기록
+                    stall["duration_ms"] = round(lag * 1000, 1)
+            if stall is not None:
+                print(f"[루프 모니터] 이벤트 루프가 {lag * 1000:.0f}ms 동안 막혔습니다. 위치: {stall['blocking_site']}, "
+                      f"처리 중 요청: {[r['method'] + ' ' + r['path'] for r in stall['in_flight']]}")
+
+    def _watch(self):
+        check_interval = min(self.interval, self.warn) / 2
+        while not self._stopping.wait(check_interval):
+            try:
+                self._check_stall()
+            except Exception as e:
+                # 감시 스레드가 종료되면 이후 지연을 감지할 수 없으므로 오류를 기록하고 계속 감시
+                print(f"[루프 모니터] 지연 감시 오류: {e!r}")
+
+    def _check_stall(self):
+        with self._lock:
+            blocked = time.monotonic() - self._last_beat - self.interval
+            if blocked < self.warn or self._current_stall is not None:
+                return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        frames = traceback.extract_stack(frame, limit=_STACK_LIMIT) if frame is not None else []
+        now = time.monotonic()
+        with self._lock:
+            if self._current_stall is not None:
+                return
+            site = _blocking_site(frames)
+            stall = {
+                "detected_at": datetime.now().isoformat(),
+                "duration_ms": None, # 루프가 다시 깨어나면 채워짐
+                "blocking_site": site,
+                "in_flight": [
+                    {"method": r["method"], "path": r["path"], "elapsed_ms": round((now - r["started"]) * 1000, 1)}
+                    for r in self._in_flight.values()
+                ],
+                "stack": traceback.format_list(frames),
+            }
+            self._current_stall = stall
+            self._stalls.append(stall)
+            self._stall_count += 1
+            self._blocking_sites[site] += 1
+
+    def request_started(self, method: str, path: str) -> int:
+        request_id = next(self._request_ids)
+        # 감시 스레드가 지연 기록 시 순회하므로 잠금 안에서 변경
+        with self._lock:
+            self._in_flight[request_id] = {"method": method, "path": path, "started": time.monotonic()}
+        return request_id
+
+    def request_finished(self, request_id: int):
+        with self._lock:
+            self._in_flight.pop(request_id, None)
+
+    def seconds_since_last_stall(self) -> Optional[float]:
+        with self._lock:
+            if not self._stalls:
+                return None
+            detected_at = datetime.fromisoformat(self._stalls[-1]["detected_at"])
+        return (datetime.now() - detected_at).total_seconds()
+
+    def snapshot(self, include_stacks: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._lags)
+            stalls = [dict(stall) for stall in self._stalls]
+            blocking_sites = dict(self._blocking_sites.most_common())
+            stall_count = self._stall_count
+            max_lag = self._max_lag
+            in_flight = len(self._in_flight)
+        if not include_stacks:
+            for stall in stalls:
+                stall.pop("stack", None)
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 1),
+            "warn_ms": round(self.warn * 1000, 1),
+            "lag_ms": {
+                "samples": len(ordered),
+                "p50": round(_percentile(ordered, 0.5) * 1000, 1) if ordered else None,
+                "p99": round(_percentile(ordered, 0.99) * 1000, 1) if ordered else None,
+                "max": round(max_lag * 1000, 1),
+            },
+            "in_flight_requests": in_flight,
+            "stalls": stall_count,
+            "blocking_sites": blocking_sites,
+            "recent_stalls": list(reversed(stalls)),
+        }
+
+
+# 애플리케이션 전역 이벤트 루프 모니터
+loop_monitor = EventLoopMonitor(EVENT_LOOP_MONITOR_INTERVAL_MS, EVENT_LOOP_LAG_WARN_MS, EVENT_LOOP_STALL_HISTORY)
@@ -0,0 +1,140 @@
+# app/services/mockup_cache_service.py
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from typing import Any, Optional
+
+from app.core.config import (
+    MOCKUP_CACHE_ENABLED,
+    MOCKUP_CACHE_DB_PATH,
+    MOCKUP_CACHE_MAX_MB,
+    MOCKUP_CACHE_MAX_ENTRIES,
+)
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    프로세스가 바뀌어도 같은 값을 내는 안정적인 해시입니다. (파이썬 hash()는 실행마다 달라짐)
+    dict/list는 키를 정렬한 JSON으로 직렬화해 순서와 무관하게 같은 값을 만듭니다.
+    """
+    canonical = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SqliteMockupCache:
+    """
+    목업 생성 단계(요구사항 분석, 페이지 기획, 테마 CSS, 페이지 HTML)의 LLM 결과를 보관하는 영구 캐시입니다.
+    - 키는 입력(모델, 시스템 프롬프트, 프롬프트 또는 페이지 기획)의 fingerprint 이므로, 새 revision에서
+      기획이 바뀌지 않은 페이지는 다시 생성하지 않고 바뀐 페이지만 생성됩니다.
+    - 전체 크기(MOCKUP_CACHE_MAX_MB)나 항목 수(MOCKUP_CACHE_MAX_ENTRIES)를 넘으면 가장 오래 사용하지 않은 항목부터 삭제(LRU)합니다.
+    - API/워커 프로세스가 함께 쓸 수 있도록 SQLite(WAL)에 저장합니다.
+    """
+    def __init__(self, db_path: str, max_bytes: int, max_entries: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS mockup_cache (
+                cache_key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_mockup_cache_accessed ON mockup_cache (accessed_at)")
+        self._initialized = True
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        cache_key = f"{namespace}:{key}"
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT value FROM mockup_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE mockup_cache SET accessed_at = ? WHERE cache_key = ?", (time.time(), cache_key))
+                print(f"[목업 캐시] 적중: {namespace} ({key[:12]})")
+                return row[0]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[목업 캐시] 조회 실패 (캐시 없이 진행): {e}")
+            return None
+
+    def put(self, namespace: str, key: str, value: str):
+        if not value:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO mockup_cache (cache_key, namespace, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (f"{namespace}:{key}", namespace, value, len(value.encode("utf-8")), now, now)
+                )
+                self._evict(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[목업 캐시] 저장 실패: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """크기/항목 수 제한을 넘는 만큼 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        total_size, total_count = conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM mockup_cache").fetchone()
+        if total_size <= self.max_bytes and total_count <= self.max_entries:
+            return
+        evicted = []
+        for cache_key, size in conn.execute("SELECT cache_key, size FROM mockup_cache ORDER BY accessed_at ASC"):
+            if total_size <= self.max_bytes and total_count <= self.max_entries:
+                break
+            evicted.append(cache_key)
+            total_size -= size
+            total_count -= 1
+        conn.executemany("DELETE FROM mockup_cache WHERE cache_key = ?", [(k,) for k in evicted])
+        print(f"[목업 캐시] LRU 정리: {len(evicted)}개 항목 삭제")
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            total_size, total_count = conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM mockup_cache").fetchone()
+            by_namespace = dict(conn.execute("SELECT namespace, COUNT(*) FROM mockup_cache GROUP BY namespace").fetchall())
+        finally:
+            conn.close()
+        return {"entries": total_count, "bytes": total_size, "max_bytes": self.max_bytes, "max_entries": self.max_entries, "by_namespace": by_namespace}
+
+
+class _DisabledMockupCache:
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        return None
+
+    def put(self, namespace: str, key: str, value: str):
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False}
+
+
+def _create_mockup_cache():
+    if not MOCKUP_CACHE_ENABLED:
+        return _DisabledMockupCache()
+    os.makedirs(os.path.dirname(MOCKUP_CACHE_DB_PATH) or ".", exist_ok=True)
+    return SqliteMockupCache(MOCKUP_CACHE_DB_PATH, int(MOCKUP_CACHE_MAX_MB * 1024 * 1024), MOCKUP_CACHE_MAX_ENTRIES)
+
+
+# 애플리케이션 전역 목업 캐시
+mockup_cache = _create_mockup_cache()
@@ -0,0 +1,85 @@
+# app/services/mockup_revision_service.py
+"""
+프로젝트별 마지막 목업 revision(요구사항 fingerprint, 페이지 기획, 페이지 결과물)을 저장하고
+새 요구사항 목록과 비교하는 서비스입니다.
+
+MOCKUP_REVISION_DIR/<project_id>.json.gz 에 다음을 보관합니다.
+- requirements       : 요구사항 키 → 내용 fingerprint
+- system_overview    : 시스템 개요 (재사용)
+- main_page_plan / defined_pages : 페이지 기획 (각 페이지에 포함된 요구사항 키 included_requirement_keys 포함)
+- navigation         : 내비게이션 fingerprint (full 모드에서 기존 HTML 재사용 가능 여부 판단)
+- theme_css / page_contents : shell 모드는 테마 CSS와 페이지별 콘텐츠 조각, full 모드는 페이지 HTML
+"""
+import os
+import gzip
+import json
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from app.core.config import MOCKUP_REVISION_DIR
+from app.services.mockup_cache_service import fingerprint
+
+# 요구사항 동일성 판단에서 제외하는 필드 (분류/평가 결과가 바뀌어도 화면 구성은 바뀌지 않음)
+_VOLATILE_FIELDS = ("difficulty",)
+
+
+def requirement_keys(requirements: List[Dict[str, Any]]) -> List[str]:
+    """
+    revision 간 같은 요구사항을 식별하는 키 목록을 반환합니다. (요청에 요구사항 ID가 없으므로 요구사항명 기준)
+    같은 이름이 여러 번 나오면 등장 순서를 붙여 구분합니다.
+    """
+    seen: Dict[str, int] = {}
+    keys = []
+    for req in requirements:
+        name = unicodedata.normalize("NFKC", str(req.get("description_name", ""))).strip().lower()
+        name = " ".join(name.split())
+        seen[name] = seen.get(name, 0) + 1
+        keys.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return keys
+
+
+def requirement_fingerprint(requirement: Dict[str, Any]) -> str:
+    return fingerprint({k: v for k, v in requirement.items() if k not in _VOLATILE_FIELDS})
+
+
+def diff_requirements(previous: Dict[str, str], requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    이전 revision의 {키: fingerprint}와 새 요구사항 목록을 비교합니다.
+    반환값: {"added": [...], "removed": [...], "modified": [...], "unchanged": int, "change_ratio": float}
+    """
+    current = dict(zip(requirement_keys(requirements), (requirement_fingerprint(r) for r in requirements)))
+    added = [key for key in current if key not in previous]
+    removed = [key for key in previous if key not in current]
+    modified = [key for key in current if key in previous and previous[key] != current[key]]
+    changed = len(added) + len(removed) + len(modified)
+    return {
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+        "unchanged": len(current) - len(added) - len(modified),
+        "change_ratio": changed / max(len(current), len(previous), 1),
+    }
+
+
+def _path(project_id: Any) -> str:
+    return os.path.join(MOCKUP_REVISION_DIR, f"{project_id}.json.gz")
+
+
+def load_mockup_revision(project_id: Any) -> Optional[Dict[str, Any]]:
+    try:
+        with gzip.open(_path(project_id), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[목업 revision] 프로젝트 {project_id}의 이전 revision을 읽지 못했습니다: {e}")
+        return None
+
+
+def save_mockup_revision(project_id: Any, revision: Dict[str, Any]):
+    os.makedirs(MOCKUP_REVISION_DIR, exist_ok=True)
+    temp_path = _path(project_id) + ".tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        json.dump(revision, f, ensure_ascii=False, separators=(",", ":"), default=str)
+    os.replace(temp_path, _path(project_id))
+    print(f"[목업 revision] 프로젝트 {project_id} revision {revision.get('revision_count')} 저장 완료")
@@ -1,12 +1,37 @@
 # app/services/mockup_service.py
 import os
 import json
-from typing import List, Tuple, Dict, Any
-from app.core.config import OPENAI_API_KEY, ANTHROPIC_API_KEY
+import time
+import shutil
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Callable, Optional, Awaitable, Union
+from app.core.config import (
+    OPENAI_API_KEY,
+    ANTHROPIC_API_KEY,
+    MOCKUP_INCREMENTAL_ENABLED,
+    MOCKUP_RENDER_MODE,
+    MOCKUP_ZIP_DIR,
+    MOCKUP_ZIP_RETENTION_HOURS,
+    MOCKUP_EXECUTOR_WORKERS,
+)
+from app.services.mockup_revision_service import load_mockup_revision, save_mockup_revision
 
 # 새롭게 리팩토링된 UiMockupAgent를 임포트합니다.
 from app.agents.mockup.mockup_agent import UiMockupAgent
 
+# 목업 파이프라인의 동기 작업(요구사항 분석/페이지 기획 LLM 호출, revision 저장, ZIP 기록) 전용 스레드 풀
+# 기본 스레드 풀(asyncio.to_thread)과 분리해 목업 생성이 다른 작업의 스레드를 차지하지 않도록 합니다.
+_mockup_executor = ThreadPoolExecutor(max_workers=max(1, MOCKUP_EXECUTOR_WORKERS), thread_name_prefix="mockup")
+
+
+async def run_in_mockup_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """동기 함수를 목업 전용 스레드 풀에서 실행하고 결과를 기다립니다. (이벤트 루프를 막지 않음)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_mockup_executor, functools.partial(func, *args, **kwargs))
+
+
 def run_mockup_generation_pipeline(
     input_data: str,
     output_folder_name: str | None = None
@@ -21,7 +46,16 @@ def run_mockup_generation_pipeline(
 
     Returns:
         List[Tuple[str, str]]: (파일 경로, 파일 내용) 튜플의 리스트
+
+    모든 LLM 호출을 동기로 기다리므로 이벤트 루프에서는 호출할 수 없습니다.
+    비동기 코드에서는 arun_mockup_generation_pipeline을 사용하세요.
     """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("run_mockup_generation_pipeline은 이벤트 루프를 막으므로 arun_mockup_generation_pipeline을 사용하세요.")
 
     if not OPENAI_API_KEY or not ANTHROPIC_API_KEY:
         raise ValueError("OpenAI 또는 Anthropic API 키가 설정되지 않았습니다.")
@@ -49,4 +83,89 @@ def run_mockup_generation_pipeline(
     # agent.run() 메서드가 (파일명, HTML 내용) 리스트를 직접 반환합니다.
     generated_files = agent.run(project_name=project_name)
 
-    return generated_files
\ No newline at end of file
+    return generated_files
+
+async def arun_mockup_generation_pipeline(
+    input_data: str,
+    output_folder_name: str | None = None,
+    on_file: Optional[Callable[[str, str], Union[None, Awaitable[None]]]] = None,
+    project_id: Optional[int] = None,
+    revision_count: Optional[int] = None,
+    incremental: Optional[bool] = None
+) -> List[Tuple[str, str]]:
+    """
+    run_mockup_generation_pipeline의 비동기 버전입니다.
+    요구사항 분석/페이지 기획과 revision 로드/저장은 목업 전용 스레드 풀에서 실행하고, HTML 페이지들은 동시에 생성합니다.
+    on_file(파일명, 내용)은 페이지가 준비되는 대로 기획 순서에 맞춰 호출되며, awaitable을 반환하면 기다린 뒤 다음 페이지로 넘어갑니다.
+    (ZIP 기록처럼 오래 걸리는 작업은 run_in_mockup_executor로 넘겨 루프를 막지 않도록 합니다.)
+    project_id가 주어지면 결과를 프로젝트의 마지막 revision으로 저장하고, 증분 모드(incremental, 기본 MOCKUP_INCREMENTAL_ENABLED)에서는
+    이전 revision과 비교해 변경된 요구사항이 속한 페이지만 다시 생성합니다.
+    """
+    if not OPENAI_API_KEY or not ANTHROPIC_API_KEY:
+        raise ValueError("OpenAI 또는 Anthropic API 키가 설정되지 않았습니다.")
+
+    try:
+        requirements_data: List[Dict[str, Any]] = json.loads(input_data)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"입력 데이터 JSON 파싱 실패: {str(e)}")
+
+    incremental = MOCKUP_INCREMENTAL_ENABLED if incremental is None else incremental
+    previous_revision = None
+    if incremental and project_id is not None:
+        previous_revision = await run_in_mockup_executor(load_mockup_revision, project_id)
+        if previous_revision:
+            print(f"[증분 목업] 프로젝트 {project_id}의 이전 revision {previous_revision.get('revision_count')}과 비교합니다.")
+
+    agent = await run_in_mockup_executor(
+        UiMockupAgent,
+        requirements_data=requirements_data,
+        openai_api_key=OPENAI_API_KEY,
+        anthropic_api_key=ANTHROPIC_API_KEY,
+        previous_revision=previous_revision
+    )
+    project_name = output_folder_name or "생성된 목업 프로젝트"
+    generated_files = await agent.arun(project_name=project_name, on_file=on_file)
+
+    if project_id is not None and generated_files:
+        # revision 정리(요구사항 지문 계산 등)도 페이지 수에 비례하므로 스레드 풀에서 실행
+        revision = await run_in_mockup_executor(agent.build_revision, project_name, MOCKUP_RENDER_MODE)
+        revision["revision_count"] = revision_count
+        try:
+            await run_in_mockup_executor(save_mockup_revision, project_id, revision)
+        except Exception as e:
+            print(f"[증분 목업] revision 저장 실패 (다음 요청은 전체 생성): {e}")
+    return generated_files
+
+
+def mockup_zip_path(job_id: str) -> str:
+    return os.path.join(MOCKUP_ZIP_DIR, f"{job_id}.zip")
+
+
+def persist_mockup_zip(zip_file_obj, job_id: str) -> str:
+    """
+    작성이 끝난 ZIP(메모리 또는 임시 파일)을 MOCKUP_ZIP_DIR/<job_id>.zip 으로 저장하고 경로를 반환합니다.
+    콜백 업로드는 이 파일을 스트리밍으로 읽고, 콜백이 실패해도 GET /mockup/{job_id}/zip 으로 내려받을 수 있습니다.
+    """
+    prune_mockup_zips()
+    os.makedirs(MOCKUP_ZIP_DIR, exist_ok=True)
+    path = mockup_zip_path(job_id)
+    temp_path = path + ".part"
+    zip_file_obj.seek(0)
+    with open(temp_path, "wb") as f:
+        shutil.copyfileobj(zip_file_obj, f, 1024 * 1024)
+    os.replace(temp_path, path)
+    return path
+
+
+def prune_mockup_zips():
+    """보관 기간이 지난 목업 ZIP을 삭제합니다."""
+    if not os.path.isdir(MOCKUP_ZIP_DIR):
+        return
+    cutoff = time.time() - MOCKUP_ZIP_RETENTION_HOURS * 3600
+    for name in os.listdir(MOCKUP_ZIP_DIR):
+        path = os.path.join(MOCKUP_ZIP_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
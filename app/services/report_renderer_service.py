@@ -0,0 +1,326 @@
+# app/services/report_renderer_service.py
+"""
+분석 결과를 여러 형식의 파일로 변환하는 보고서 렌더러입니다.
+
+원본은 두 종류입니다.
+- markdown     : As-Is 분석 보고서 Markdown (pdf, docx, html, md)
+- requirements : SRS 요구사항 목록 (csv, xlsx / Markdown으로 변환해 pdf, docx, html, md도 지원)
+
+렌더러는 @report_renderer(형식, 원본 종류, 확장자, MIME)로 등록하며, 결과 파일은 (원본 해시, 형식) 키로
+REPORT_RENDER_CACHE_DIR에 보관하므로 같은 보고서를 다시 내려받으면 LLM 단계나 변환 없이 저장된 파일을 제공합니다.
+캐시가 REPORT_RENDER_CACHE_MAX_MB를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다.
+CSV/XLSX는 요구사항을 한 행씩 파일에 기록하므로 요구사항이 많아도 변환 결과 전체를 메모리에 만들지 않습니다.
+"""
+import os
+import csv
+import html
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import REPORT_RENDER_CACHE_DIR, REPORT_RENDER_CACHE_MAX_MB
+from app.core.lazy import lazy_import
+from app.services.background_asis_services import render_markdown_to_pdf
+from app.services.mockup_cache_service import fingerprint
+
+# 형식별 라이브러리는 해당 형식을 처음 렌더링할 때(또는 워밍업 시) import
+markdown_it = lazy_import("markdown_it")
+docx = lazy_import("docx")
+docx_ns = lazy_import("docx.oxml.ns")
+docx_shared = lazy_import("docx.shared")
+openpyxl = lazy_import("openpyxl")
+
+# 렌더러 출력이 바뀌면 올려서 기존 캐시를 무효화
+RENDERER_VERSION = "1"
+
+# 요구사항 표 형식(csv/xlsx)의 열 (헤더, 요구사항 필드)
+REQUIREMENT_COLUMNS = [
+    ("요구사항 ID", "id"),
+    ("유형(기능/비기능)", "type"),
+    ("요구사항명", "description_name"),
+    ("요구사항 상세설명", "description_content"),
+    ("대상 업무", "target_task"),
+    ("요건처리 상세", "processing_detail"),
+    ("대분류", "category_large"),
+    ("중분류", "category_medium"),
+    ("소분류", "category_small"),
+    ("중요도", "importance"),
+    ("난이도", "difficulty"),
+    ("RFP", "rfp_page"),
+    ("출처문장", "raw_text"),
+]
+
+REPORT_FONT = "Malgun Gothic"
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{title}</title>
+<style>
+body {{ font-family: 'NanumGothic', 'Malgun Gothic', sans-serif; max-width: 960px; margin: 40px auto; padding: 0 24px; line-height: 1.6; color: #1f2937; }}
+table {{ border-collapse: collapse; width: 100%; margin: 16px 0; }}
+th, td {{ border: 1px solid #d1d5db; padding: 6px 10px; text-align: left; vertical-align: top; }}
+th {{ background: #f3f4f6; }}
+pre {{ background: #f8fafc; padding: 12px; overflow-x: auto; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+class ReportRenderer:
+    def __init__(self, format: str, source: str, extension: str, media_type: str, render: Callable[[Any, str], None]):
+        self.format = format
+        self.source = source
+        self.extension = extension
+        self.media_type = media_type
+        self.render = render
+
+
+REPORT_RENDERERS: Dict[str, ReportRenderer] = {}
+
+
+def report_renderer(format: str, source: str, extension: str, media_type: str):
+    """렌더러를 형식 이름으로 등록하는 데코레이터. 렌더 함수는 (원본, 출력 경로)를 받아 파일을 기록합니다."""
+    def decorator(func: Callable[[Any, str], None]) -> Callable[[Any, str], None]:
+        REPORT_RENDERERS[format] = ReportRenderer(format, source, extension, media_type, func)
+        return func
+    return decorator
+
+
+def supported_formats(source: str) -> List[str]:
+    """해당 원본 종류에서 렌더링할 수 있는 형식 목록 (요구사항 목록은 Markdown 형식도 가능)"""
+    sources = (source, "markdown") if source == "requirements" else (source,)
+    return [fmt for fmt, renderer in REPORT_RENDERERS.items() if renderer.source in sources]
+
+
+def _markdown_parser() -> "markdown_it.MarkdownIt":
+    return markdown_it.MarkdownIt("commonmark").enable("table")
+
+
+def requirements_to_markdown(requirements: List[Dict[str, Any]], title: str = "요구사항 명세") -> str:
+    """요구사항 목록을 요구사항별 절로 구성된 Markdown 문서로 변환합니다."""
+    lines = [f"# {title}", ""]
+    for req in requirements:
+        heading = " ".join(str(part) for part in (req.get("id"), req.get("description_name")) if part)
+        lines.append(f"## {heading or '(이름 없음)'}")
+        lines.append("")
+        for header, key in REQUIREMENT_COLUMNS:
+            if key in ("id", "description_name"):
+                continue
+            value = req.get(key)
+            if value not in (None, ""):
+                lines.append(f"- **{header}**: {' '.join(str(value).split())}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _requirement_row(req: Dict[str, Any]) -> List[Any]:
+    return [req.get(key, "") for _, key in REQUIREMENT_COLUMNS]
+
+
+# --- Markdown 원본 렌더러 ---
+
+@report_renderer("pdf", "markdown", "pdf", "application/pdf")
+def _render_pdf(markdown_text: str, output_path: str):
+    render_markdown_to_pdf(markdown_text, Path(output_path))
+
+
+@report_renderer("md", "markdown", "md", "text/markdown; charset=utf-8")
+def _render_markdown(markdown_text: str, output_path: str):
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(markdown_text)
+
+
+@report_renderer("html", "markdown", "html", "text/html; charset=utf-8")
+def _render_html(markdown_text: str, output_path: str):
+    title = next((line.lstrip("#").strip() for line in markdown_text.splitlines() if line.startswith("# ")), "보고서")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(HTML_TEMPLATE.format(title=html.escape(title), body=_markdown_parser().render(markdown_text)))
+
+
+def _add_docx_runs(paragraph, inline_token):
+    """인라인 토큰(굵게/기울임/코드/줄바꿈)을 문단의 run으로 추가합니다."""
+    bold = italic = False
+    for child in inline_token.children or []:
+        if child.type == "strong_open":
+            bold = True
+        elif child.type == "strong_close":
+            bold = False
+        elif child.type == "em_open":
+            italic = True
+        elif child.type == "em_close":
+            italic = False
+        elif child.type == "softbreak":
+            paragraph.add_run(" ")
+        elif child.type == "hardbreak":
+            paragraph.add_run().add_break()
+        elif child.type in ("text", "code_inline", "image"):
+            run = paragraph.add_run(child.content)
+            run.bold, run.italic = bold, italic
+
+
+def _inline_text(inline_token) -> str:
+    return "".join(child.content for child in inline_token.children or [] if child.type in ("text", "code_inline", "softbreak"))
+
+
+@report_renderer("docx", "markdown", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+def _render_docx(markdown_text: str, output_path: str):
+    document = docx.Document()
+    normal_style = document.styles["Normal"]
+    normal_style.font.name = REPORT_FONT
+    normal_style.font.size = docx_shared.Pt(10.5)
+    normal_style.element.rPr.rFonts.set(docx_ns.qn("w:eastAsia"), REPORT_FONT)
+
+    heading_level: Optional[int] = None
+    list_styles: List[str] = []
+    table_rows: Optional[List[List[str]]] = None
+    for token in _markdown_parser().parse(markdown_text):
+        if token.type == "heading_open":
+            heading_level = min(int(token.tag[1:]), 9)
+        elif token.type == "heading_close":
+            heading_level = None
+        elif token.type in ("bullet_list_open", "ordered_list_open"):
+            base = "List Bullet" if token.type == "bullet_list_open" else "List Number"
+            depth = len(list_styles) + 1
+            list_styles.append(base if depth == 1 else f"{base} {min(depth, 3)}")
+        elif token.type in ("bullet_list_close", "ordered_list_close"):
+            list_styles.pop()
+        elif token.type == "table_open":
+            table_rows = []
+        elif token.type == "tr_open" and table_rows is not None:
+            table_rows.append([])
+        elif token.type == "table_close" and table_rows:
+            columns = max(len(row) for row in table_rows)
+            table = document.add_table(rows=len(table_rows), cols=columns, style="Table Grid")
+            for row_index, row in enumerate(table_rows):
+                for col_index, text in enumerate(row):
+                    table.cell(row_index, col_index).text = text
+            table_rows = None
+        elif token.type == "inline":
+            if table_rows is not None:
+                table_rows[-1].append(_inline_text(token))
+            elif heading_level is not None:
+                _add_docx_runs(document.add_heading(level=heading_level), token)
+            else:
+                _add_docx_runs(document.add_paragraph(style=list_styles[-1] if list_styles else None), token)
+        elif token.type in ("fence", "code_block"):
+            run = document.add_paragraph().add_run(token.content.rstrip("\n"))
+            run.font.name = "Consolas"
+    document.save(output_path)
+
+
+# --- 요구사항 원본 렌더러 ---
+
+@report_renderer("csv", "requirements", "csv", "text/csv; charset=utf-8")
+def _render_csv(requirements: List[Dict[str, Any]], output_path: str):
+    with open(output_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in REQUIREMENT_COLUMNS])
+        for req in requirements:
+            if isinstance(req, dict):
+                writer.writerow(_requirement_row(req))
+
+
+@report_renderer("xlsx", "requirements", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+def _render_xlsx(requirements: List[Dict[str, Any]], output_path: str):
+    workbook = openpyxl.Workbook(write_only=True) # 행을 바로 파일용 버퍼로 기록 (셀 객체를 메모리에 유지하지 않음)
+    sheet = workbook.create_sheet("요구사항")
+    sheet.append([header for header, _ in REQUIREMENT_COLUMNS])
+    for req in requirements:
+        if isinstance(req, dict):
+            sheet.append([value if isinstance(value, (int, float)) else str(value or "") for value in _requirement_row(req)])
+    workbook.save(output_path)
+
+
+# --- 렌더링 + 캐시 ---
+
+def _prune_cache(keep_path: Optional[str] = None):
+    """
+    캐시 전체 크기가 한도를 넘으면 마지막 사용 시각이 오래된 파일부터 삭제합니다.
+    keep_path(방금 렌더링해 내려보낼 파일)는 한도보다 크더라도 삭제하지 않습니다.
+    """
+    max_bytes = REPORT_RENDER_CACHE_MAX_MB * 1024 * 1024
+    entries = []
+    with os.scandir(REPORT_RENDER_CACHE_DIR) as it:
+        for entry in it:
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep_path:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    if removed:
+        print(f"[보고서 렌더러] 캐시 정리: {removed}개 파일 삭제")
+
+
+def render_report(
+    format: str,
+    markdown: Optional[str] = None,
+    requirements: Optional[List[Dict[str, Any]]] = None,
+    source_hash: Optional[str] = None,
+    load_requirements: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """
+    As-Is 보고서 Markdown(markdown) 또는 요구사항 목록(requirements)을 지정한 형식으로 렌더링합니다.
+    source_hash를 주면 원본 해시 계산을 건너뜁니다. (예: 원본 파일의 sha256)
+    load_requirements와 source_hash를 함께 주면 캐시에 없을 때만 요구사항 목록을 불러옵니다.
+    반환값: {"path", "size", "etag", "media_type", "extension", "cached"}
+    """
+    renderer = REPORT_RENDERERS.get(format)
+    source_kind = "requirements" if requirements is not None or load_requirements is not None else "markdown"
+    if renderer is None or format not in supported_formats(source_kind):
+        raise ValueError(f"지원하지 않는 형식입니다: {format} (가능한 형식: {', '.join(supported_formats(source_kind))})")
+
+    source = requirements if source_kind == "requirements" else (markdown or "")
+    cache_key = fingerprint(RENDERER_VERSION, format, source_kind, source_hash or source)
+    path = os.path.join(REPORT_RENDER_CACHE_DIR, f"{cache_key}.{renderer.extension}")
+    result = {"path": path, "etag": cache_key, "media_type": renderer.media_type, "extension": renderer.extension}
+    if os.path.exists(path):
+        os.utime(path) # LRU 정리를 위한 마지막 사용 시각 갱신
+        print(f"[보고서 렌더러] 캐시 적중: {format} ({cache_key[:12]})")
+        return {**result, "size": os.path.getsize(path), "cached": True}
+
+    if source is None:
+        source = load_requirements()
+    if source_kind == "requirements" and renderer.source == "markdown":
+        source = requirements_to_markdown(source)
+    os.makedirs(REPORT_RENDER_CACHE_DIR, exist_ok=True)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        renderer.render(source, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    size = os.path.getsize(path)
+    print(f"[보고서 렌더러] 렌더링 완료: {format} ({cache_key[:12]})")
+    _prune_cache(keep_path=path)
+    return {**result, "size": size, "cached": False}
+
+
+def report_file_response(path: str, media_type: str, filename: str, etag: Optional[str], if_none_match: Optional[str]) -> Response:
+    """
+    보고서 파일을 FileResponse로 내려보냅니다. (Range 요청 지원)
+    etag가 있으면 ETag 헤더로 제공하고, If-None-Match가 일치하면 본문 없이 304를 반환합니다.
+    """
+    quoted_etag = f'"{etag}"' if etag else None
+    if quoted_etag and if_none_match == quoted_etag:
+        return Response(status_code=304, headers={"ETag": quoted_etag})
+    return FileResponse(path, media_type=media_type, filename=filename, headers={"ETag": quoted_etag} if quoted_etag else None)
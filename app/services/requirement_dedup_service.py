@@ -0,0 +1,213 @@
+# app/services/requirement_dedup_service.py
+"""
+청크별로 추출된 요구사항 문장의 중복을 제거하는 서비스입니다.
+
+청크 경계의 중복 구간이나 RFP 내 여러 섹션에서 같은 요구사항이 반복되면, 중복 문장마다
+상세화/평가/ID 생성 LLM 호출과 DB 저장이 반복되므로 분류 단계 전에 묶어 줍니다.
+1. 완전 일치 / 정규화(공백·기호·번호 제거) 해시
+2. MinHash + LSH 밴딩으로 거의 같은 문장 후보를 찾고 실제 문자 3-gram 자카드 유사도로 확인
+3. (선택) embedding_service 임베딩의 코사인 유사도
+숫자(기간, 시간, 수량 등)가 다른 문장은 어느 단계에서도 묶지 않습니다. ("1년간 보관" ≠ "5년간 보관")
+묶인 문장은 내용이 가장 긴 문장을 대표로 남기고, 모든 페이지와 원문 문장을 출처(sources)로 보존합니다.
+모든 단계가 문장 수에 대해 선형(임베딩 단계는 근사 최근접 이웃 검색)으로 동작합니다.
+"""
+import re
+import hashlib
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.core.config import (
+    REQUIREMENT_DEDUP_MINHASH_THRESHOLD,
+    REQUIREMENT_DEDUP_EMBEDDING,
+    REQUIREMENT_DEDUP_EMBEDDING_THRESHOLD,
+)
+from app.core.lazy import lazy_import, lazy_resource
+
+np = lazy_import("numpy") # 중복 제거를 처음 실행할 때(또는 워밍업 시) import
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16 # 밴드당 4행 → 유사도 약 0.5 이상인 쌍이 후보가 됨
+HASH_PRIME = (1 << 32) - 5 # crc32 값 범위의 소수. (a*h + b)가 uint64 안에서 넘치지 않음
+EMBEDDING_NEIGHBORS = 10
+EMBEDDING_EXACT_SEARCH_LIMIT = 5000 # 이보다 많으면 HNSW 근사 검색 사용
+
+@lazy_resource("minhash_permutations")
+def _minhash_permutations():
+    # h → (a*h + b) mod p, a ∈ [1, p), b ∈ [0, p) 인 독립적인 해시 함수들
+    rng = np.random.RandomState(20240601)
+    perm_a = rng.randint(1, HASH_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.int64).astype(np.uint64)
+    perm_b = rng.randint(0, HASH_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.int64).astype(np.uint64)
+    return perm_a, perm_b
+
+LEADING_MARKER_PATTERN = re.compile(r"^\s*([□■◆◇○●▶※\-–•·*]|\(?\d+(\.\d+)*[.)]|[가-하][.)]|[①-⑳])\s*")
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        self.parent[max(root_a, root_b)] = min(root_a, root_b)
+        return True
+
+
+def normalize_sentence(sentence: str) -> str:
+    """비교용 정규화: 유니코드 정규화, 글머리 기호/번호 제거, 소문자화, 공백·문장부호 제거"""
+    text = unicodedata.normalize("NFKC", sentence or "")
+    text = LEADING_MARKER_PATTERN.sub("", text)
+    text = text.lower()
+    return re.sub(r"[\W_]+", "", text)
+
+
+def numeric_tokens(sentence: str) -> tuple:
+    """문장의 숫자 토큰(글머리 번호 제외)을 정렬해 반환합니다. 이 값이 다른 문장끼리는 중복으로 보지 않습니다."""
+    text = LEADING_MARKER_PATTERN.sub("", unicodedata.normalize("NFKC", sentence or ""))
+    return tuple(sorted(NUMBER_PATTERN.findall(text)))
+
+
+def _shingles(normalized: str) -> set:
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _minhash_signature(shingles: set) -> "np.ndarray":
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) % HASH_PRIME for s in shingles), dtype=np.uint64, count=len(shingles))
+    perm_a, perm_b = _minhash_permutations.get()
+    permuted = (np.outer(hashes, perm_a) + perm_b) % HASH_PRIME
+    return permuted.min(axis=0)
+
+
+def _merge_by_key(keys: List[Any], uf: _UnionFind) -> int:
+    first_index: Dict[Any, int] = {}
+    merged = 0
+    for index, key in enumerate(keys):
+        if not key:
+            continue
+        if key in first_index:
+            merged += uf.union(first_index[key], index)
+        else:
+            first_index[key] = index
+    return merged
+
+
+def _merge_by_minhash(normalized: List[str], numbers: List[tuple], uf: _UnionFind) -> int:
+    shingle_sets = [_shingles(text) for text in normalized]
+    signatures = np.vstack([_minhash_signature(shingles) for shingles in shingle_sets])
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    merged = 0
+    for band in range(LSH_BANDS):
+        buckets: Dict[bytes, List[int]] = defaultdict(list)
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for index in range(len(normalized)):
+            buckets[band_values[index].tobytes()].append(index)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            for other in members[1:]:
+                if uf.find(head) == uf.find(other) or numbers[head] != numbers[other]:
+                    continue
+                # LSH 후보는 실제 자카드 유사도로 다시 확인 (MinHash 추정 오차로 다른 문장이 묶이지 않도록)
+                if _jaccard(shingle_sets[head], shingle_sets[other]) >= REQUIREMENT_DEDUP_MINHASH_THRESHOLD:
+                    merged += uf.union(head, other)
+    return merged
+
+
+def _merge_by_embedding(sentences: List[str], numbers: List[tuple], uf: _UnionFind) -> int:
+    from app.services.embedding_service import get_embeddings_for_texts
+    import faiss
+
+    embeddings = get_embeddings_for_texts(sentences)
+    valid = [i for i, emb in enumerate(embeddings) if emb is not None]
+    if len(valid) < 2:
+        return 0
+    vectors = np.array([embeddings[i] for i in valid], dtype="float32")
+    faiss.normalize_L2(vectors)
+
+    dimension = vectors.shape[1]
+    if len(valid) > EMBEDDING_EXACT_SEARCH_LIMIT:
+        index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+    else:
+        index = faiss.IndexFlatIP(dimension)
+    index.add(vectors)
+    scores, neighbors = index.search(vectors, min(EMBEDDING_NEIGHBORS, len(valid)))
+
+    merged = 0
+    for row, (row_scores, row_neighbors) in enumerate(zip(scores, neighbors)):
+        for score, neighbor in zip(row_scores, row_neighbors):
+            if neighbor < 0 or neighbor == row or score < REQUIREMENT_DEDUP_EMBEDDING_THRESHOLD:
+                continue
+            if numbers[valid[row]] != numbers[valid[int(neighbor)]]:
+                continue
+            merged += uf.union(valid[row], valid[int(neighbor)])
+    return merged
+
+
+def deduplicate_requirement_sentences(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    candidates: [{"sentence": str, "page_number": int, "chunk_index": int, ...}, ...]
+    중복을 묶어 대표 문장 목록을 반환합니다. 각 대표 항목에는 다음이 추가됩니다.
+      - "sources": [{"page_number": int, "raw_text": str}, ...] (중복 제거된 출처 목록, 페이지 순)
+      - "duplicate_count": 묶인 문장 수
+    """
+    if not candidates:
+        return []
+
+    sentences = [c["sentence"] for c in candidates]
+    normalized = [normalize_sentence(s) for s in sentences]
+    numbers = [numeric_tokens(s) for s in sentences]
+    uf = _UnionFind(len(candidates))
+
+    exact = _merge_by_key([hashlib.sha1(s.strip().encode("utf-8")).hexdigest() for s in sentences], uf)
+    # 정규화는 소수점/구분 기호를 지우므로 ("1.5" → "15") 숫자 토큰까지 같아야 묶음
+    normal = _merge_by_key([(text, number) if text else None for text, number in zip(normalized, numbers)], uf)
+    near = _merge_by_minhash(normalized, numbers, uf)
+    semantic = 0
+    if REQUIREMENT_DEDUP_EMBEDDING:
+        try:
+            semantic = _merge_by_embedding(sentences, numbers, uf)
+        except Exception as e:
+            print(f"경고: 임베딩 기반 중복 제거를 건너뜁니다: {e}")
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(candidates)):
+        groups[uf.find(index)].append(index)
+
+    deduplicated = []
+    for root in sorted(groups):
+        members = groups[root]
+        representative = max(members, key=lambda i: (len(normalized[i]), -i))
+        sources, seen = [], set()
+        for i in sorted(members, key=lambda i: (candidates[i].get("page_number") or 0, i)):
+            key = (candidates[i].get("page_number"), sentences[i].strip())
+            if key not in seen:
+                seen.add(key)
+                sources.append({"page_number": key[0], "raw_text": key[1]})
+        item = dict(candidates[representative])
+        item["sources"] = sources
+        item["duplicate_count"] = len(members)
+        deduplicated.append(item)
+
+    print(
+        f"요구사항 문장 중복 제거: {len(candidates)}개 → {len(deduplicated)}개 "
+        f"(완전 일치 {exact}, 정규화 {normal}, MinHash {near}, 임베딩 {semantic})"
+    )
+    return deduplicated
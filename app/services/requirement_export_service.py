@@ -0,0 +1,168 @@
+# app/services/requirement_export_service.py
+"""
+DB에 저장된 요구사항(td_requirements)과 출처(td_source)를 NDJSON/CSV로 스트리밍 내보내기 합니다.
+
+- 요구사항과 출처를 req_pk 순으로 LEFT JOIN 한 하나의 쿼리를 서버 측 커서(AsyncSession.stream, yield_per)로 읽고,
+  같은 req_pk의 연속된 행을 묶어 요구사항 단위로 내보냅니다.
+- ORM 엔티티 대신 컬럼만 조회하므로 세션 identity map에 객체가 쌓이지 않아, 내보내는 요구사항 수와 관계없이
+  메모리 사용량이 일정합니다.
+- 출력은 EXPORT_STREAM_CHUNK_KB 크기로 모아 내보내며, gzip 옵션은 같은 청크를 점진적으로 압축합니다.
+"""
+import io
+import csv
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import EXPORT_STREAM_BATCH_SIZE, EXPORT_STREAM_CHUNK_KB
+from app.models.requirement import Requirement
+from app.models.source import Source
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+# CSV 열 (헤더, 요구사항 필드). 출처는 페이지/문장을 " | "로 이어 한 칸에 넣습니다.
+EXPORT_CSV_COLUMNS = [
+    ("요구사항 ID", "req_id_code"),
+    ("버전", "revision_count"),
+    ("유형", "type"),
+    ("대분류", "level_1"),
+    ("중분류", "level_2"),
+    ("소분류", "level_3"),
+    ("요구사항명", "name"),
+    ("요구사항 상세설명", "description"),
+    ("중요도", "priority"),
+    ("난이도", "difficulty"),
+    ("생성일시", "created_date"),
+    ("삭제 여부", "is_deleted"),
+    ("출처 문서", "source_documents"),
+    ("출처 페이지", "source_pages"),
+    ("출처 문장", "source_sentences"),
+]
+
+_REQUIREMENT_COLUMNS = (
+    Requirement.req_pk, Requirement.req_id_code, Requirement.revision_count, Requirement.type,
+    Requirement.level_1, Requirement.level_2, Requirement.level_3, Requirement.name, Requirement.description,
+    Requirement.priority, Requirement.difficulty, Requirement.created_date, Requirement.is_deleted,
+)
+_SOURCE_COLUMNS = (Source.source_id, Source.doc_id, Source.page_num, Source.rel_sentence)
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+async def iter_requirements(
+    db: AsyncSession,
+    project_id: int,
+    include_deleted: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """프로젝트의 요구사항을 출처 목록과 함께 하나씩 반환합니다. (서버 측 커서 사용)"""
+    query = (
+        select(*_REQUIREMENT_COLUMNS, *_SOURCE_COLUMNS)
+        .outerjoin(Source, Source.req_pk == Requirement.req_pk)
+        .where(Requirement.project_id == project_id)
+        .order_by(Requirement.req_pk, Source.source_id)
+        .execution_options(yield_per=EXPORT_STREAM_BATCH_SIZE)
+    )
+    if not include_deleted:
+        query = query.where(Requirement.is_deleted.is_(False))
+
+    result = await db.stream(query)
+    current: Optional[Dict[str, Any]] = None
+    try:
+        async for row in result:
+            if current is None or current["req_pk"] != row.req_pk:
+                if current is not None:
+                    yield current
+                current = {
+                    "req_pk": row.req_pk,
+                    "req_id_code": row.req_id_code,
+                    "revision_count": row.revision_count,
+                    "type": _enum_value(row.type),
+                    "level_1": row.level_1,
+                    "level_2": row.level_2,
+                    "level_3": row.level_3,
+                    "name": row.name,
+                    "description": row.description,
+                    "priority": _enum_value(row.priority),
+                    "difficulty": _enum_value(row.difficulty),
+                    "created_date": row.created_date.isoformat() if row.created_date else None,
+                    "is_deleted": bool(row.is_deleted),
+                    "sources": [],
+                }
+            if row.source_id is not None:
+                current["sources"].append({"doc_id": row.doc_id, "page_num": row.page_num, "rel_sentence": row.rel_sentence})
+        if current is not None:
+            yield current
+    finally:
+        await result.close()
+
+
+def _csv_row(requirement: Dict[str, Any]) -> List[Any]:
+    sources = requirement["sources"]
+    values = {
+        **requirement,
+        "source_documents": " | ".join(dict.fromkeys(str(s["doc_id"]) for s in sources)),
+        "source_pages": " | ".join(str(s["page_num"]) for s in sources),
+        "source_sentences": " | ".join(" ".join(str(s["rel_sentence"]).split()) for s in sources),
+    }
+    return ["" if values.get(key) is None else values.get(key) for _, key in EXPORT_CSV_COLUMNS]
+
+
+async def _iter_text(requirements: AsyncIterator[Dict[str, Any]], format: str) -> AsyncIterator[str]:
+    if format == "ndjson":
+        async for requirement in requirements:
+            yield json.dumps(requirement, ensure_ascii=False, separators=(",", ":")) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    yield "\ufeff" # Excel에서 UTF-8로 인식하도록 BOM
+    writer.writerow([header for header, _ in EXPORT_CSV_COLUMNS])
+    async for requirement in requirements:
+        writer.writerow(_csv_row(requirement))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+async def stream_requirement_export(
+    db: AsyncSession,
+    project_id: int,
+    format: str = "ndjson",
+    compress: bool = False,
+    include_deleted: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    요구사항 내보내기 본문을 바이트 청크로 반환합니다. (StreamingResponse 본문으로 사용)
+    compress=True 이면 gzip 스트림으로 압축합니다.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {format} (가능한 형식: {', '.join(EXPORT_FORMATS)})")
+    chunk_size = EXPORT_STREAM_CHUNK_KB * 1024
+    compressor = zlib.compressobj(wbits=31) if compress else None # wbits=31: gzip 헤더/트레일러 포함
+    pending = bytearray()
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor is not None else data
+
+    async for text in _iter_text(iter_requirements(db, project_id, include_deleted), format):
+        pending += text.encode("utf-8")
+        if len(pending) >= chunk_size:
+            out = emit(bytes(pending))
+            pending.clear()
+            if out:
+                yield out
+    tail = emit(bytes(pending))
+    if compressor is not None:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+    print(f"[요구사항 내보내기] 프로젝트 {project_id}: {format}{' (gzip)' if compress else ''} 내보내기 완료")
@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import insert
 from app.models.requirement import Requirement, RequirementType, Priority, Difficulty
 from app.models.source import Source
 from app.core.mysql_config import get_mysql_db
@@ -10,16 +11,13 @@ class RequirementService:
     async def initialize(self, db):
         self.db = db
 
-    async def create_requirement(self, requirement_data, member, project, document):
-        if not self.db:
-            raise ValueError("Database session not initialized")
-
+    def _build_requirement(self, requirement_data, project_id: int, member_id: int) -> Requirement:
         description = f"[요구사항]\n{requirement_data['description_content']}\n" \
                      f"[대상업무]\n{requirement_data['target_task']}\n" \
                      f"[요건 처리 상세]\n{requirement_data['processing_detail']}"
         
         # 요구사항 엔티티 생성
-        requirement = Requirement(
+        return Requirement(
             req_id_code=requirement_data["id"],
             revision_count=1,
             type=RequirementType.from_korean(requirement_data["type"]),
@@ -33,25 +31,49 @@ class RequirementService:
             created_date=datetime.now(),
             is_deleted=False,
             deleted_revision=0,
-            project_id=project.project_id,
-            member_id=member.member_id,
+            project_id=project_id,
+            member_id=member_id,
             mod_reason=""
         )
-        self.db.add(requirement)
-        await self.db.flush()
 
-        # 소스 엔티티 생성
-        source = Source()
-        source.create_source(
-            requirement=requirement,
-            document=document,
-            page_num=requirement_data.get("rfp_page", 1),
-            rel_sentence=requirement_data["raw_text"],
-            req_id_code=requirement.req_id_code
-        )
-        self.db.add(source)
+    def _source_rows(self, requirement_data, requirement: Requirement, doc_id: str):
+        # 소스 레코드 (중복 제거로 병합된 요구사항은 출처마다 하나씩)
+        # 관계 객체 대신 FK 컬럼(req_pk, doc_id)만 지정하므로 관계 lazy load가 일어나지 않음
+        sources = requirement_data.get("sources") or [
+            {"page_number": requirement_data.get("rfp_page", 1), "raw_text": requirement_data["raw_text"]}
+        ]
+        for source_data in sources:
+            yield {
+                "req_pk": requirement.req_pk,
+                "doc_id": doc_id,
+                "page_num": source_data.get("page_number") or requirement_data.get("rfp_page", 1),
+                "rel_sentence": source_data["raw_text"],
+                "req_id_code": requirement.req_id_code,
+            }
+
+    async def create_requirement(self, requirement_data, member, project, document):
+        return (await self.create_requirements([requirement_data], member, project, document))[0]
+
+    async def create_requirements(self, requirements_data, member, project, document):
+        """
+        요구사항 여러 개를 한 트랜잭션으로 저장합니다.
+        요구사항을 모두 추가한 뒤 한 번 flush해 req_pk를 받고, 출처는 FK 컬럼 값으로 한 번의 일괄 INSERT로 저장합니다.
+        """
+        if not self.db:
+            raise ValueError("Database session not initialized")
+
+        requirements = [self._build_requirement(data, project.project_id, member.member_id) for data in requirements_data]
+        self.db.add_all(requirements)
         await self.db.flush()
 
+        source_rows = [
+            row
+            for data, requirement in zip(requirements_data, requirements)
+            for row in self._source_rows(data, requirement, document.doc_id)
+        ]
+        if source_rows:
+            await self.db.execute(insert(Source), source_rows)
+
         await self.db.commit()
 
-        return requirement
\ No newline at end of file
+        return requirements
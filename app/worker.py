@@ -0,0 +1,207 @@
+# app/worker.py
+"""
+무거운 작업(SRS/As-Is/목업/FAISS/회의록 분석)을 API 프로세스와 분리된 프로세스에서 실행하는 워커입니다.
+
+실행: python -m app.worker
+- API를 JOB_EXECUTION_MODE=worker 로 띄우면 작업이 공유 SQLite 큐(JOB_QUEUE_DB_PATH)에 등록되고,
+  이 워커가 큐에서 작업을 가져와 실행합니다. 작업 상태/결과는 같은 DB를 통해 API와 공유됩니다.
+- SQLite 파일을 공유하므로 워커는 API와 같은 노드(k8s에서는 같은 파드의 컨테이너)에서 실행해야 합니다.
+- 하트비트는 별도 스레드에서 보내므로 핸들러가 이벤트 루프를 오래 막아도 작업이 다른 워커로 넘어가지 않습니다.
+  그래도 작업을 잃은 경우(재점유) 이 워커는 최종 상태를 기록하지 않습니다.
+- SIGTERM/SIGINT를 받으면 새 작업을 가져오지 않고, 실행 중인 작업을 WORKER_DRAIN_TIMEOUT 동안 기다린 뒤
+  끝나지 않은 작업은 다른 워커가 이어받도록 큐로 되돌립니다.
+  동기 핸들러 작업은 스레드를 중단할 수 없어 되돌리지 않고 하트비트를 유지하며 끝까지 기다립니다.
+  (강제 종료되면 하트비트가 만료된 뒤 다른 워커가 다시 실행)
+"""
+import os
+import signal
+import socket
+import asyncio
+import inspect
+import threading
+from typing import Any, Dict
+
+from app.core.config import (
+    JOB_QUEUE_WORKERS,
+    WORKER_QUEUES,
+    WORKER_POLL_INTERVAL,
+    WORKER_HEARTBEAT_TIMEOUT,
+    WORKER_DRAIN_TIMEOUT,
+    EVENT_LOOP_MONITOR_ENABLED,
+)
+from app.api.v2.jobs import job_store, update_job_status, set_job_state_backend
+from app.services.job_queue_service import job_queue, load_payload, cleanup_spool
+from app.services.job_scheduler_service import JOB_HANDLERS
+from app.services.loop_monitor_service import loop_monitor
+
+# 작업 핸들러 등록을 위해 각 라우터 모듈을 임포트합니다.
+import app.api.v3.srs_db  # noqa: F401
+import app.api.v3.asis_db  # noqa: F401
+import app.api.v1.mockup  # noqa: F401
+import app.api.v1.faiss  # noqa: F401
+import app.api.v1.request  # noqa: F401
+
+
+class JobWorker:
+    def __init__(self, queue_names, concurrency: Dict[str, int]):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.queue_names = queue_names
+        self.concurrency = concurrency
+        self.running: Dict[str, Dict[str, Any]] = {}
+        self._stopping = asyncio.Event()
+        self._released = set()
+        # 하트비트 스레드와 공유하는 실행 중 작업 ID (이벤트 루프와 다른 스레드이므로 잠금 사용)
+        self._heartbeat_ids = set()
+        self._heartbeat_lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        self._cancel_requested = set()
+
+    def request_stop(self):
+        if not self._stopping.is_set():
+            print(f"[워커 {self.worker_id}] 종료 신호 수신. 새 작업 수신을 중단하고 실행 중인 작업 {len(self.running)}건을 정리합니다.")
+            self._stopping.set()
+
+    def _running_in(self, queue_name: str) -> int:
+        return sum(1 for item in self.running.values() if item["queue_name"] == queue_name)
+
+    def _heartbeat_loop(self, loop: asyncio.AbstractEventLoop):
+        """실행 중인 작업의 하트비트를 이벤트 루프와 독립된 스레드에서 WORKER_POLL_INTERVAL 마다 갱신합니다."""
+        while not self._heartbeat_stop.wait(WORKER_POLL_INTERVAL):
+            with self._heartbeat_lock:
+                job_ids = list(self._heartbeat_ids)
+            try:
+                cancel_ids = job_queue.heartbeat(self.worker_id, job_ids)
+            except Exception as e:
+                print(f"[워커 {self.worker_id}] 하트비트 갱신 실패: {e}")
+                continue
+            for job_id in cancel_ids:
+                loop.call_soon_threadsafe(self._cancel_job, job_id)
+
+    def _cancel_job(self, job_id: str):
+        item = self.running.get(job_id)
+        if item and not item["task"].done() and job_id not in self._cancel_requested:
+            self._cancel_requested.add(job_id)
+            print(f"[워커 {self.worker_id}] Job {job_id} 취소 요청 처리")
+            item["task"].cancel()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.request_stop)
+
+        print(f"[워커 {self.worker_id}] 시작. 대상 큐: {self.queue_names}")
+        heartbeat_thread = threading.Thread(target=self._heartbeat_loop, args=(loop,), name="worker-heartbeat", daemon=True)
+        heartbeat_thread.start()
+        polls = 0
+        while not self._stopping.is_set():
+            # 비정상 종료된 워커가 잡고 있던 작업을 주기적으로 회수
+            if polls % 30 == 0:
+                requeued = await asyncio.to_thread(job_queue.requeue_stale, WORKER_HEARTBEAT_TIMEOUT)
+                if requeued:
+                    print(f"[워커 {self.worker_id}] 하트비트가 끊긴 작업 {requeued}건을 큐로 되돌렸습니다.")
+            polls += 1
+
+            for queue_name in self.queue_names:
+                while self._running_in(queue_name) < self.concurrency.get(queue_name, 1):
+                    job = await asyncio.to_thread(job_queue.claim, self.worker_id, queue_name)
+                    if job is None:
+                        break
+                    self._start(job)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=WORKER_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+        await self._drain()
+        self._heartbeat_stop.set()
+        heartbeat_thread.join(timeout=WORKER_POLL_INTERVAL * 2)
+        print(f"[워커 {self.worker_id}] 종료.")
+
+    def _start(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        handler = JOB_HANDLERS.get(job["handler"])
+        print(f"[워커 {self.worker_id}] Job {job_id} ({job['queue_name']}/{job['handler']}) 실행 시작")
+        # 핸들러가 job_store를 그대로 사용할 수 있도록 공유 저장소의 작업 정보를 로컬에 적재
+        job_store[job_id] = job["job_data"]
+        with self._heartbeat_lock:
+            self._heartbeat_ids.add(job_id)
+        task = asyncio.create_task(self._execute(job_id, handler, job["payload"]))
+        self.running[job_id] = {"task": task, "queue_name": job["queue_name"], "sync": handler is not None and not inspect.iscoroutinefunction(handler)}
+
+    async def _still_owned(self, job_id: str) -> bool:
+        if await asyncio.to_thread(job_queue.owns, job_id, self.worker_id):
+            return True
+        print(f"[워커 {self.worker_id}] Job {job_id}: 다른 워커에 재할당된 작업이므로 결과를 기록하지 않습니다.")
+        return False
+
+    async def _execute(self, job_id: str, handler, raw_payload: Dict[str, Any]):
+        try:
+            if handler is None:
+                raise ValueError("등록되지 않은 작업 핸들러입니다.")
+            payload = await asyncio.to_thread(load_payload, raw_payload)
+            if inspect.iscoroutinefunction(handler):
+                await handler(payload)
+            else:
+                await asyncio.to_thread(handler, payload)
+            if job_store[job_id]["status"] == "PROCESSING" and await self._still_owned(job_id):
+                update_job_status(job_id=job_id, status="COMPLETED", result=job_store[job_id].get("result"), message="작업이 완료되었습니다.")
+        except asyncio.CancelledError:
+            if job_id in self._released:
+                print(f"[워커 {self.worker_id}] Job {job_id}: 종료 대기 시간 초과로 다른 워커에 넘깁니다.")
+            elif await self._still_owned(job_id):
+                update_job_status(job_id=job_id, status="CANCELLED", message="사용자 요청으로 작업이 취소되었습니다.")
+        except Exception as e:
+            print(f"[워커 {self.worker_id}] Job {job_id} 처리 중 오류: {e}")
+            if job_store[job_id]["status"] not in ("FAILED", "CANCELLED") and await self._still_owned(job_id):
+                update_job_status(job_id=job_id, status="FAILED", error=str(e), message=f"작업 실패: {e}")
+        finally:
+            with self._heartbeat_lock:
+                self._heartbeat_ids.discard(job_id)
+            self._cancel_requested.discard(job_id)
+            self.running.pop(job_id, None)
+            job_store.pop(job_id, None)
+            if job_id not in self._released:
+                cleanup_spool(raw_payload)
+
+    async def _drain(self):
+        if not self.running:
+            return
+        tasks = [item["task"] for item in self.running.values()]
+        print(f"[워커 {self.worker_id}] 실행 중인 작업 {len(tasks)}건 완료 대기 (최대 {WORKER_DRAIN_TIMEOUT:.0f}s)...")
+        _, pending = await asyncio.wait(tasks, timeout=WORKER_DRAIN_TIMEOUT)
+        released, running_sync = [], []
+        for job_id, item in list(self.running.items()):
+            if item["task"] not in pending:
+                continue
+            if item["sync"]:
+                # 스레드에서 실행 중인 동기 핸들러는 취소해도 멈추지 않으므로, 다른 워커에 넘기면 같은 작업이 두 번 실행됨
+                running_sync.append(item["task"])
+                continue
+            self._released.add(job_id)
+            await asyncio.to_thread(job_queue.release, job_id)
+            item["task"].cancel()
+            released.append(item["task"])
+        if released:
+            await asyncio.wait(released, timeout=10)
+        if running_sync:
+            print(f"[워커 {self.worker_id}] 동기 핸들러 작업 {len(running_sync)}건은 중단할 수 없어 끝날 때까지 기다립니다.")
+            await asyncio.wait(running_sync)
+
+
+async def main():
+    set_job_state_backend(job_queue)
+    if EVENT_LOOP_MONITOR_ENABLED:
+        # 루프가 막히면 작업 점유/취소 처리가 늦어지므로 워커에서도 지연을 기록
+        loop_monitor.start()
+    worker = JobWorker(WORKER_QUEUES, JOB_QUEUE_WORKERS)
+    # 이 워커가 점유하지 않은(재할당된) 작업의 상태는 공유 저장소에 기록하지 않음
+    job_queue.owner_worker_id = worker.worker_id
+    try:
+        await worker.run()
+    finally:
+        await loop_monitor.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+# benchmarks/startup_importtime.py
+"""
+`import main`의 import 시간을 `python -X importtime`으로 측정해 요약합니다. (서버 시작/readiness 시간의 대부분)
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/startup_importtime.py                       # 전체 시간과 누적 시간 상위 모듈 출력
+    python benchmarks/startup_importtime.py --save                # 결과를 기준선 파일에 저장
+    python benchmarks/startup_importtime.py --compare             # 기준선 파일과 비교 (BUDGET_RATIO 초과 시 종료 코드 1)
+
+지연 초기화(app/core/lazy.py)된 모듈은 첫 사용 또는 워밍업 때 import 되므로 여기에 나타나지 않아야 합니다.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "startup_importtime_baseline.txt"
+BUDGET_RATIO = 1.5 # 기준선 대비 이 배수를 넘으면 회귀로 판단
+TOP_N = 25
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(target: str = "main") -> Tuple[float, List[Tuple[str, float, int]]]:
+    """(전체 ms, [(모듈, 누적 ms, 깊이)])를 반환합니다. import가 실패하면 예외를 발생시킵니다."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("OPENAI_API_KEY", "importtime-benchmark") # config.py가 키를 요구하므로 측정용 값
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"`import {target}` 실패:\n{proc.stderr[-2000:]}")
+
+    modules = []
+    total_ms = 0.0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = (len(match.group(3)) - 1) // 2
+        modules.append((match.group(4), cumulative_ms, depth))
+        if depth == 0:
+            total_ms += cumulative_ms
+    return total_ms, modules
+
+
+def format_report(total_ms: float, modules: List[Tuple[str, float, int]], top_n: int = TOP_N) -> str:
+    # 최상위 패키지별 누적 시간 (가장 먼저 import 한 모듈 기준)
+    packages: Dict[str, float] = {}
+    for name, cumulative_ms, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), cumulative_ms)
+
+    lines = [f"total_ms: {total_ms:.1f}", "", f"# 누적 import 시간 상위 {top_n}개 패키지 (ms)"]
+    for package, cumulative_ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top_n]:
+        lines.append(f"{cumulative_ms:10.1f}  {package}")
+    return "\n".join(lines) + "\n"
+
+
+def read_baseline_total(path: Path = BASELINE_PATH) -> float:
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("total_ms:"):
+            return float(line.split(":", 1)[1])
+    raise ValueError(f"{path}에 total_ms 항목이 없습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="애플리케이션 import 시간 측정")
+    parser.add_argument("--target", default="main", help="측정할 모듈 (기본: main)")
+    parser.add_argument("--save", action="store_true", help="결과를 기준선 파일에 저장")
+    parser.add_argument("--compare", action="store_true", help="기준선과 비교")
+    args = parser.parse_args()
+
+    total_ms, modules = measure(args.target)
+    report = format_report(total_ms, modules)
+    print(report)
+
+    if args.save:
+        header = f"# `python -X importtime -c \"import {args.target}\"` 기준선 (benchmarks/startup_importtime.py --save)\n"
+        BASELINE_PATH.write_text(header + report, encoding="utf-8")
+        print(f"기준선 저장: {BASELINE_PATH}")
+
+    if args.compare:
+        baseline_ms = read_baseline_total()
+        ratio = total_ms / baseline_ms if baseline_ms else float("inf")
+        print(f"기준선 {baseline_ms:.1f}ms 대비 {ratio:.2f}배")
+        if ratio > BUDGET_RATIO:
+            print(f"import 시간이 기준선의 {BUDGET_RATIO}배를 넘었습니다. 새로 추가된 모듈 수준 import를 확인하세요.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
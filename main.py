@@ -9,6 +9,15 @@ from app.api.v3 import asis_job as asis_job_router
 from app.api.v3 import srs_job as srs_job_router
 from app.api.v3 import srs_db as srs_router # process.py에서 정의한 라우터 임포트
 from app.api.v3 import asis_db as asis_router
+from app.api.v3 import jobs as jobs_router
+from app.api.v3 import requirement_export as requirement_export_router
+from app.api.v3 import ops as ops_router
+from app.api.v3 import health as health_router
+from app.services.http_client_service import close_http_client
+from app.core.mysql_config import async_engine
+from app.core.config import STARTUP_WARMUP_ENABLED, EVENT_LOOP_MONITOR_ENABLED
+from app.core.lazy import start_background_warm_up
+from app.services.loop_monitor_service import InFlightRequestMiddleware, loop_monitor
 
 app = FastAPI(
     title="RFP Analysis Service",
@@ -17,22 +26,49 @@ app = FastAPI(
     root_path='/ai/api/v1/decase'
 )
 
+# 이벤트 루프 지연 시 처리 중이던 요청을 함께 기록 (/ops/event-loop)
+if EVENT_LOOP_MONITOR_ENABLED:
+    app.add_middleware(InFlightRequestMiddleware, monitor=loop_monitor)
+
 # /ai/api/v1 접두사와 함께 process 라우터 포함
 app.include_router(srs_router.router, prefix="/ai/api/v1/requirements", tags=["SRS"])
 app.include_router(refine_router.router, prefix="/ai/api/v1/requirements", tags=["SRS"]) 
 app.include_router(asis_router.router, prefix="/ai/api/v1/requirements", tags=["As-Is"]) 
+app.include_router(requirement_export_router.router, prefix="/ai/api/v1/requirements", tags=["SRS"]) # 요구사항 스트리밍 내보내기
 # app.include_router(description_router.router, prefix="/api/v1", tags=["Requirement Description Generation"]) # 신규 라우터 추가
 app.include_router(mockup_router.router, prefix="/ai/api/v1/mockup", tags=["Mockup"]) # 추가
 app.include_router(faiss_router.router, prefix="/ai/api/v1/faiss", tags=["FAISS-Indexing"]) # 새 라우터 추가
 app.include_router(request_router.router, prefix="/ai/api/v1/request", tags=["Update Request"]) # 새 라우터 추가
 app.include_router(asis_job_router.router, prefix="/ai/api/v1/jobs", tags=["As-Is"])  # AS-IS 분석 작업 상태 확인 라우터
 app.include_router(srs_job_router.router, prefix="/ai/api/v1/jobs", tags=["SRS"])  # SRS 분석 작업 상태 확인 라우터
+app.include_router(jobs_router.router, prefix="/ai/api/v1/jobs", tags=["Jobs"])  # 작업 취소 및 큐 상태 라우터
+app.include_router(ops_router.router, prefix="/ai/api/v1/ops", tags=["Ops"])  # 운영 지표 (DB 커넥션 풀 등)
+app.include_router(health_router.router, tags=["Health"])  # readiness(/ready) / liveness(/live) 프로브
+
+@app.on_event("startup")
+async def start_lazy_warm_up():
+    """무거운 의존성을 백그라운드에서 미리 초기화합니다. (시작/헬스 체크를 막지 않음)"""
+    if STARTUP_WARMUP_ENABLED:
+        start_background_warm_up()
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """이벤트 루프를 막는 핸들러를 찾기 위한 지연 모니터를 시작합니다."""
+    if EVENT_LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """루프 모니터를 멈추고 공용 콜백 HTTP 클라이언트와 DB 커넥션 풀을 정리합니다."""
+    await loop_monitor.stop()
+    await close_http_client()
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
     return {"message": "RFP Analysis Service에 오신 것을 환영합니다!"}
 
-# 애플리케이션 상태 확인용 엔드포인트 (선택 사항)
+# 애플리케이션 상태 확인용 엔드포인트 (선택 사항, k8s 프로브는 /ready, /live 사용)
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
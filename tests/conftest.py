@@ -0,0 +1,5 @@
+import os
+
+# app.core.config가 키를 요구하므로 테스트용 값 (실제 LLM 호출은 하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("REQUIREMENT_DEDUP_EMBEDDING", "false")
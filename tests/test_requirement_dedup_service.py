@@ -0,0 +1,53 @@
+import random
+
+from app.services.requirement_dedup_service import (
+    MINHASH_PERMUTATIONS,
+    _jaccard,
+    _minhash_signature,
+    _shingles,
+    deduplicate_requirement_sentences,
+    normalize_sentence,
+)
+
+
+def _candidates(*sentences):
+    return [{"sentence": s, "page_number": i + 1, "chunk_index": i} for i, s in enumerate(sentences)]
+
+
+def test_sentences_with_different_numbers_are_not_merged():
+    result = deduplicate_requirement_sentences(_candidates(
+        "시스템은 로그인 이력을 1년간 보관해야 한다.",
+        "시스템은 로그인 이력을 5년간 보관해야 한다.",
+    ))
+    assert len(result) == 2
+
+
+def test_normalized_numbers_are_not_merged():
+    result = deduplicate_requirement_sentences(_candidates("응답시간은 1.5초 이내여야 한다.", "응답시간은 15초 이내여야 한다."))
+    assert len(result) == 2
+
+
+def test_near_duplicates_are_merged_with_sources():
+    result = deduplicate_requirement_sentences(_candidates(
+        "1. 관리자는 사용자 계정을 등록, 수정, 삭제할 수 있어야 한다.",
+        "관리자는 사용자 계정을 등록·수정·삭제 할 수 있어야 한다",
+        "관리자는 사용자의 계정을 등록, 수정, 삭제할 수 있어야 한다.",
+    ))
+    assert len(result) == 1
+    assert result[0]["duplicate_count"] == 3
+    assert [source["page_number"] for source in result[0]["sources"]] == [1, 2, 3]
+
+
+def test_minhash_estimates_jaccard():
+    rng = random.Random(7)
+    words = ["시스템", "사용자", "관리자", "등록", "삭제", "조회", "보관", "로그", "이력", "권한", "화면", "데이터"]
+    errors = []
+    for _ in range(300):
+        base = [rng.choice(words) for _ in range(8)]
+        other = [w if rng.random() < 0.7 else rng.choice(words) for w in base]
+        a, b = _shingles(normalize_sentence("".join(base))), _shingles(normalize_sentence("".join(other)))
+        estimate = float((_minhash_signature(a) == _minhash_signature(b)).mean())
+        errors.append(abs(estimate - _jaccard(a, b)))
+    # 64개 해시 함수의 표준 오차는 약 0.06 이하
+    assert sum(errors) / len(errors) < 0.08
+    assert MINHASH_PERMUTATIONS == 64